@@ -0,0 +1,313 @@
+#apps/api/app/bgg/cache.py
+"""
+Persistent on-disk cache for BGG XML responses
+
+Layout under the cache root (default: $API_DATA_DIR/bgg-cache):
+- index.sqlite: one row per cached response (url, validators, sizes, timestamps)
+- ab/abcdef...: the response bodies, optionally zstd/gzip compressed
+
+Entries are keyed by a normalized URL (lowercased scheme/host, sorted query
+parameters), so `?own=1&username=x` and `?username=x&own=1` share an entry
+
+Freshness is a per-endpoint TTL. Stale entries are not thrown away: their
+ETag / Last-Modified are sent as conditional headers, and a 304 makes them
+fresh again without re-downloading
+
+The total size of stored bodies is capped; the least recently used entries
+are evicted first
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+# Seconds an entry is served without revalidation, by URL path
+DEFAULT_TTLS = {
+    "/xmlapi2/collection": 60 * 60,
+    "/xmlapi2/thing": 7 * 24 * 60 * 60,
+}
+
+_SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    evictions: int = 0
+    bytes_served: int = 0  # uncompressed bytes returned from the cache
+    bytes_stored: int = 0  # bytes written to disk (after compression)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    key: str
+    path: str
+    encoding: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    ttl: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def normalize_url(url: str, params: dict | None = None) -> str:
+    parts = urlsplit(url)
+    query = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+def _resolve_compression(requested: str) -> str:
+    if requested == "zstd" and zstandard is None:
+        return "gzip"
+    if requested not in _SUFFIXES:
+        raise ValueError(f"unknown cache compression: {requested!r}")
+    return requested
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression: str = "gzip",
+        ttls: dict[str, float] | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compression = _resolve_compression(compression)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False, isolation_level=None)
+        self._index.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._index.close()
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(urlsplit(url).path, 0)
+
+    # -- reads ---------------------------------------------------------------
+
+    def lookup(self, url: str, params: dict | None = None) -> CacheEntry | None:
+        """Find an entry (fresh or stale); counts a miss when there is none"""
+        key = self._key(url, params)
+        with self._lock:
+            row = self._index.execute(
+                "SELECT path, encoding, etag, last_modified, stored_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None or not (self.root / row[0]).exists():
+            self.stats.misses += 1
+            return None
+        return CacheEntry(key, *row, ttl=self.ttl_for(url))
+
+    def open(self, entry: CacheEntry) -> BinaryIO | None:
+        """
+        Open an entry's (decompressed) body and count it as a hit
+
+        None, counted as a miss, when the entry was evicted since its lookup
+        """
+        path = self.root / entry.path
+        try:
+            if entry.encoding == "gzip":
+                body = gzip.open(path, "rb")
+            elif entry.encoding == "zstd":
+                if zstandard is None:
+                    raise RuntimeError("cache entry is zstd-compressed but zstandard is not installed")
+                body = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+            else:
+                body = open(path, "rb")
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+
+        with self._lock:
+            self._index.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), entry.key))
+            row = self._index.execute("SELECT raw_size FROM entries WHERE key = ?", (entry.key,)).fetchone()
+        self.stats.hits += 1
+        self.stats.bytes_served += row[0] if row else 0
+        return body
+
+    # -- writes --------------------------------------------------------------
+
+    def revalidated(self, entry: CacheEntry) -> CacheEntry:
+        """The server answered 304: the entry is fresh again"""
+        now = time.time()
+        with self._lock:
+            self._index.execute("UPDATE entries SET stored_at = ? WHERE key = ?", (now, entry.key))
+        self.stats.revalidated += 1
+        return CacheEntry(entry.key, entry.path, entry.encoding, entry.etag, entry.last_modified, now, entry.ttl)
+
+    def store(
+        self,
+        url: str,
+        params: dict | None,
+        body: BinaryIO,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """
+        Copy `body` (read from its current position) into the cache
+
+        The caller's file position is left at the end; rewind it to reuse it
+        """
+        key = self._key(url, params)
+        rel = f"{key[:2]}/{key}{_SUFFIXES[self.compression]}"
+        dest = self.root / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+        raw_size = 0
+        with open(tmp, "wb") as out:
+            if self.compression == "gzip":
+                sink = gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6)
+            elif self.compression == "zstd":
+                sink = zstandard.ZstdCompressor(level=6).stream_writer(out, closefd=False)
+            else:
+                sink = out
+            while chunk := body.read(64 * 1024):
+                sink.write(chunk)
+                raw_size += len(chunk)
+            if sink is not out:
+                sink.close()
+        os.replace(tmp, dest)
+        size = dest.stat().st_size
+
+        now = time.time()
+        with self._lock:
+            self._index.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, path, encoding, etag, last_modified, stored_at, accessed_at, size, raw_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url, params), rel, self.compression, etag, last_modified, now, now, size, raw_size),
+            )
+        self.stats.bytes_stored += size
+        self._evict()
+        return CacheEntry(key, rel, self.compression, etag, last_modified, now, self.ttl_for(url))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.execute("DELETE FROM entries")
+            for child in self.root.iterdir():
+                if child.is_dir():
+                    shutil.rmtree(child, ignore_errors=True)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._index.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    # -- internals -----------------------------------------------------------
+
+    def _key(self, url: str, params: dict | None) -> str:
+        return hashlib.sha256(normalize_url(url, params).encode()).hexdigest()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until we are under `max_bytes`"""
+        with self._lock:
+            total = self._index.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, path, size in self._index.execute(
+                "SELECT key, path, size FROM entries ORDER BY accessed_at ASC"
+            ):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key, path))
+                total -= size
+            self._index.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+        for _, path in victims:
+            (self.root / path).unlink(missing_ok=True)
+        self.stats.evictions += len(victims)
+
+
+_shared: ResponseCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> ResponseCache | None:
+    """
+    The process-wide response cache, or None when disabled
+
+    Configured from the environment on first use:
+    - BGG_CACHE_ENABLED (default 1)
+    - BGG_CACHE_MAX_MB (default 256)
+    - BGG_CACHE_COMPRESSION: zstd | gzip | none (default gzip; zstd needs `zstandard`)
+    - BGG_CACHE_TTL_COLLECTION / BGG_CACHE_TTL_THING, in seconds
+    """
+    global _shared
+    if os.getenv("BGG_CACHE_ENABLED", "1") in ("0", "false", "no"):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            ttls = {}
+            if os.getenv("BGG_CACHE_TTL_COLLECTION"):
+                ttls["/xmlapi2/collection"] = float(os.environ["BGG_CACHE_TTL_COLLECTION"])
+            if os.getenv("BGG_CACHE_TTL_THING"):
+                ttls["/xmlapi2/thing"] = float(os.environ["BGG_CACHE_TTL_THING"])
+            _shared = ResponseCache(
+                Path(os.getenv("API_DATA_DIR", "./data")) / "bgg-cache",
+                max_bytes=int(float(os.getenv("BGG_CACHE_MAX_MB", "256")) * 1024 * 1024),
+                compression=os.getenv("BGG_CACHE_COMPRESSION", "gzip"),
+                ttls=ttls,
+            )
+        return _shared
+
+
+def opened_shared_cache() -> ResponseCache | None:
+    """The process-wide cache if something already opened it (this never does)"""
+    return _shared
@@ -1,16 +1,59 @@
 from __future__ import annotations
 
 """
-BGG integration placeholder.
+BGG XML API2 client
 
 BGG provides the "XML API2" endpoints (collection, thing, etc.). In mid/late 2025,
 BGG began requiring registered "Application Tokens" sent as an Authorization: Bearer <token> header.
 
-For now we keep this module as a stub so the app can ship with sample data first.
+Quirks handled here (and nowhere else):
+- /collection answers 202 while BGG builds the export; we poll with exponential backoff
+- BGG throttles hard, so every request goes through one shared token bucket
+- Errors come back as 200 + <errors> documents as often as real HTTP errors
+- Big collections are tens of MB of XML, so bodies are parsed incrementally
+- /thing accepts at most 20 ids, so enrichment is split into concurrent batches
+- Responses are cached on disk (see cache.py); fresh entries never hit the network
+
+The client is async (one pooled httpx session per sync run). `fetch_collection`
+is a blocking wrapper for callers that live in sync code (FastAPI threadpool)
 """
 
-from dataclasses import dataclass
-from typing import Iterable
+import asyncio
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator
+
+import httpx
+
+from .cache import ResponseCache, get_shared_cache
+from .ratelimit import TokenBucket, get_shared_limiter
+
+
+DEFAULT_BASE_URL = "https://boardgamegeek.com"
+
+# HTTP statuses that mean "ask again later" rather than "failed"
+_RETRY_STATUSES = {202, 429, 503}
+
+# Response bodies larger than this are spooled to disk instead of held in memory
+SPOOL_MAX_BYTES = 1024 * 1024
+
+# BGG rejects /thing requests for more than 20 ids
+THING_BATCH_SIZE = 20
+
+# Default for BggClient(cache=...): use the process-wide cache
+_SHARED_CACHE = object()
+
+
+class BggApiError(RuntimeError):
+    """BGG returned an error (HTTP or <errors> document) or could not be reached"""
+
+
+class BggQueueTimeout(BggApiError):
+    """BGG kept answering 202/429 for longer than we are willing to poll"""
 
 
 @dataclass(frozen=True)
@@ -22,17 +65,372 @@ class BggCollectionItem:
     image_url: str | None
 
 
-def fetch_collection(*, username: str, token: str) -> list[BggCollectionItem]:
+@dataclass
+class FetchStats:
+    """
+    Where the time went during a fetch
+
+    - queued_seconds: sleeping between polls while BGG answered 202/429
+    - limiter_seconds: waiting on the shared token bucket
+    - transfer_seconds: from sending a request until its body was fully read
+    - thing_retries / failed_thing_ids: /thing batches retried, and the ids
+      of batches that still failed after their last retry
+    - cache_hits / cache_revalidated: documents served from the response
+      cache without a download (revalidated = after a 304)
+    """
+
+    requests: int = 0
+    queued_seconds: float = 0.0
+    limiter_seconds: float = 0.0
+    transfer_seconds: float = 0.0
+    bytes_received: int = 0
+    thing_retries: int = 0
+    failed_thing_ids: list[int] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_revalidated: int = 0
+
+    def as_dict(self) -> dict:
+        return {k: round(v, 4) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+def _int_or_none(text: str | None) -> int | None:
+    try:
+        return int(text) if text else None
+    except ValueError:
+        return None
+
+
+def _text_or_none(el: ET.Element | None) -> str | None:
+    if el is None or el.text is None:
+        return None
+    return el.text.strip() or None
+
+
+def _start_document(source: BinaryIO | str) -> tuple[Iterator, ET.Element]:
+    """
+    Begin an incremental parse and fail fast on BGG error documents
+
+    BGG reports e.g. unknown usernames as 200 + <errors><error><message>...,
+    which we want raised by the caller, not halfway through a DB upsert
+    """
+    events = ET.iterparse(source, events=("start", "end"))
+    try:
+        _, root = next(events)
+        if root.tag in ("errors", "error"):
+            for _ in events:  # error documents are tiny; read to the end
+                pass
+            messages = [m.text.strip() for m in root.iter("message") if m.text]
+            raise BggApiError("; ".join(messages) or "BGG returned an error document")
+    except ET.ParseError as exc:
+        raise BggApiError(f"BGG returned malformed XML: {exc}") from exc
+    return events, root
+
+
+def _iter_item_elements(events: Iterator, root: ET.Element) -> Iterator[ET.Element]:
+    """Yield each complete top-level <item>, then drop it so memory stays flat"""
+    try:
+        for event, el in events:
+            if event == "end" and el.tag == "item":
+                yield el
+                # Processed items are detached from root so they can be freed
+                root.clear()
+    except ET.ParseError as exc:
+        raise BggApiError(f"BGG returned malformed XML: {exc}") from exc
+
+
+def iter_collection_items(source: BinaryIO | str) -> Iterator[BggCollectionItem]:
+    """
+    Stream a /xmlapi2/collection document into collection items
+
+    `source` is a binary file object or path. Error documents raise
+    BggApiError immediately; items are parsed lazily as the caller iterates
+    """
+    events, root = _start_document(source)
+    return _collection_items(events, root)
+
+
+def _collection_items(events: Iterator, root: ET.Element) -> Iterator[BggCollectionItem]:
+    for el in _iter_item_elements(events, root):
+        bgg_id = _int_or_none(el.get("objectid"))
+        name = _text_or_none(el.find("name"))
+        if bgg_id is None or not name:
+            continue
+        yield BggCollectionItem(
+            bgg_id=bgg_id,
+            name=name,
+            year_published=_int_or_none(_text_or_none(el.find("yearpublished"))),
+            thumbnail_url=_text_or_none(el.find("thumbnail")),
+            image_url=_text_or_none(el.find("image")),
+        )
+
+
+def iter_thing_items(source: BinaryIO | str) -> Iterator[BggCollectionItem]:
+    """
+    Stream a /xmlapi2/thing document into items
+
+    Thing documents carry names and years as `value` attributes and list
+    alternate names; only the primary name is used
+    """
+    events, root = _start_document(source)
+    return _thing_items(events, root)
+
+
+def _thing_items(events: Iterator, root: ET.Element) -> Iterator[BggCollectionItem]:
+    for el in _iter_item_elements(events, root):
+        bgg_id = _int_or_none(el.get("id"))
+        name = next(
+            (n.get("value") for n in el.iter("name") if n.get("type") == "primary"),
+            None,
+        )
+        if bgg_id is None or not name:
+            continue
+        year = el.find("yearpublished")
+        yield BggCollectionItem(
+            bgg_id=bgg_id,
+            name=name,
+            year_published=_int_or_none(year.get("value") if year is not None else None),
+            thumbnail_url=_text_or_none(el.find("thumbnail")),
+            image_url=_text_or_none(el.find("image")),
+        )
+
+
+def _closing(items: Iterator[BggCollectionItem], body: BinaryIO) -> Iterator[BggCollectionItem]:
+    try:
+        yield from items
+    finally:
+        body.close()
+
+
+class BggClient:
     """
-    TODO:
-      - Call /xmlapi2/collection?username=...&own=1
-      - Handle HTTP 202 "queued" responses by retrying with backoff
-      - Throttle requests and cache responses
-      - Optionally enrich with /xmlapi2/thing?id=... (max 20 IDs per request)
+    Async BGG client over a pooled httpx session
+
+    Use as an async context manager so the session (and its keep-alive
+    connections) is closed when the sync run ends
     """
-    raise NotImplementedError("BGG sync is not wired up yet (seed/sample data only).")
 
+    def __init__(
+        self,
+        *,
+        token: str,
+        base_url: str | None = None,
+        limiter: TokenBucket | None = None,
+        http: httpx.AsyncClient | None = None,
+        stats: FetchStats | None = None,
+        cache: ResponseCache | None = _SHARED_CACHE,  # type: ignore[assignment]
+        max_poll_attempts: int | None = None,
+        initial_backoff: float = 2.0,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+        thing_concurrency: int | None = None,
+        thing_retries: int = 3,
+    ) -> None:
+        self.base_url = (base_url or os.getenv("BGG_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.limiter = limiter or get_shared_limiter()
+        self.stats = stats if stats is not None else FetchStats()
+        self.cache = get_shared_cache() if cache is _SHARED_CACHE else cache
+        self.max_poll_attempts = max_poll_attempts or int(os.getenv("BGG_MAX_POLL_ATTEMPTS", "10"))
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.thing_concurrency = thing_concurrency or int(os.getenv("BGG_THING_CONCURRENCY", "4"))
+        self.thing_retries = thing_retries
+
+        self._owns_http = http is None
+        self._http = http or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        )
+        self._headers = {"Authorization": f"Bearer {token}"}
+
+    async def __aenter__(self) -> "BggClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def get_document(self, path: str, params: dict) -> BinaryIO:
+        """
+        GET an XML API2 document, polling while BGG says "queued"
+
+        Fresh cache entries are returned without touching the network; stale
+        ones are revalidated with conditional headers. Downloaded bodies are
+        streamed into a spooled temp file (in memory while small, on disk
+        beyond SPOOL_MAX_BYTES) and returned rewound; the caller owns closing it
+
+        Backoff doubles from `initial_backoff` up to `max_backoff`; a numeric
+        Retry-After header overrides it for that attempt
+        """
+        url = f"{self.base_url}{path}"
+        backoff = self.initial_backoff
+
+        entry = self.cache.lookup(url, params) if self.cache else None
+        if entry is not None and entry.is_fresh:
+            cached = self.cache.open(entry)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                return cached
+            entry = None  # evicted since the lookup
+        headers = {**self._headers, **(entry.conditional_headers() if entry else {})}
+
+        for _ in range(self.max_poll_attempts):
+            self.stats.limiter_seconds += await self.limiter.acquire()
+
+            started = time.perf_counter()
+            body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            try:
+                async with self._http.stream("GET", url, params=params, headers=headers) as response:
+                    status = response.status_code
+                    delay = _retry_after(response)
+                    validators = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                    if status < 300:
+                        async for chunk in response.aiter_bytes():
+                            body.write(chunk)
+                            self.stats.bytes_received += len(chunk)
+            except httpx.HTTPError as exc:
+                body.close()
+                raise BggApiError(f"BGG request failed: {exc}") from exc
+            self.stats.transfer_seconds += time.perf_counter() - started
+            self.stats.requests += 1
+
+            if status == 304 and entry is not None:
+                body.close()
+                cached = self.cache.open(self.cache.revalidated(entry))
+                if cached is not None:
+                    self.stats.cache_revalidated += 1
+                    return cached
+                # Evicted since the lookup: ask again, unconditionally
+                entry, headers = None, self._headers
+                continue
+
+            if status in _RETRY_STATUSES:
+                body.close()
+                delay = delay or backoff
+                self.stats.queued_seconds += delay
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            if status >= 300:
+                body.close()
+                raise BggApiError(f"BGG returned HTTP {status} for {path}")
+
+            if self.cache is not None:
+                body.seek(0)
+                self.cache.store(url, params, body, **validators)
+            body.seek(0)
+            return body
+
+        raise BggQueueTimeout(
+            f"BGG still queued {path} after {self.max_poll_attempts} attempts"
+        )
+
+    async def fetch_collection(
+        self,
+        username: str,
+        *,
+        modified_since: datetime | None = None,
+    ) -> Iterator[BggCollectionItem]:
+        """
+        Fetch the user's owned collection
+
+        With `modified_since`, BGG only returns items changed after that time
+        (so removals cannot be seen in that mode)
+
+        Returns a lazy iterator: items are parsed from the downloaded body as
+        the caller consumes them, and the body is released once exhausted
+        """
+        params: dict = {"username": username, "own": 1}
+        if modified_since is not None:
+            params["modifiedsince"] = modified_since.strftime("%y-%m-%d %H:%M:%S")
+        body = await self.get_document("/xmlapi2/collection", params)
+        try:
+            return _closing(iter_collection_items(body), body)
+        except BaseException:
+            body.close()
+            raise
+
+    async def fetch_thing_details(self, ids: Iterable[int]) -> dict[int, BggCollectionItem]:
+        """
+        Fetch /xmlapi2/thing details for `ids`, 20 per request
+
+        Batches run concurrently (at most `thing_concurrency` in flight, all
+        still under the shared limiter). A failing batch is retried on its
+        own with backoff; if it keeps failing its ids are recorded in
+        `stats.failed_thing_ids` and the rest of the run carries on
+        """
+        unique = list(dict.fromkeys(ids))
+        batches = [unique[i : i + THING_BATCH_SIZE] for i in range(0, len(unique), THING_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(self.thing_concurrency)
+        details: dict[int, BggCollectionItem] = {}
+
+        async def run(batch: list[int]) -> None:
+            async with semaphore:
+                for attempt in range(self.thing_retries + 1):
+                    try:
+                        body = await self.get_document("/xmlapi2/thing", {"id": ",".join(map(str, batch))})
+                        with body:
+                            found = {item.bgg_id: item for item in iter_thing_items(body)}
+                    except BggApiError:
+                        if attempt == self.thing_retries:
+                            self.stats.failed_thing_ids.extend(batch)
+                            return
+                        self.stats.thing_retries += 1
+                        await asyncio.sleep(min(self.initial_backoff * 2**attempt, self.max_backoff))
+                        continue
+                    details.update(found)
+                    return
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+        return details
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def fetch_collection(
+    *,
+    username: str,
+    token: str,
+    stats: FetchStats | None = None,
+    modified_since: datetime | None = None,
+) -> Iterator[BggCollectionItem]:
+    """
+    Blocking wrapper around `BggClient.fetch_collection`
+
+    Runs its own event loop, so it must be called from sync code (e.g. a
+    FastAPI `def` route, which executes in the threadpool). The download
+    finishes before this returns; parsing stays lazy
+    """
+
+    async def run() -> Iterator[BggCollectionItem]:
+        async with BggClient(token=token, stats=stats) as client:
+            return await client.fetch_collection(username, modified_since=modified_since)
+
+    return asyncio.run(run())
+
+
+def fetch_thing_details(
+    *,
+    ids: Iterable[int],
+    token: str,
+    stats: FetchStats | None = None,
+) -> dict[int, BggCollectionItem]:
+    """Blocking wrapper around `BggClient.fetch_thing_details` (see `fetch_collection`)"""
+
+    async def run() -> dict[int, BggCollectionItem]:
+        async with BggClient(token=token, stats=stats) as client:
+            return await client.fetch_thing_details(ids)
 
-def fetch_thing_details(*, ids: Iterable[int], token: str) -> dict[int, BggCollectionItem]:
-    """Placeholder for future enrichment step."""
-    raise NotImplementedError
+    return asyncio.run(run())
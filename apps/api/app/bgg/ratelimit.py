@@ -0,0 +1,84 @@
+#apps/api/app/bgg/ratelimit.py
+"""
+Token-bucket rate limiting for outbound BGG requests
+
+BGG throttles aggressively (429s, or long 202 queues), so every request the
+client makes takes a token from one process-wide bucket first
+
+The bucket hands out *reservations*: taking a token never blocks while holding
+a lock, it only tells the caller how long to sleep. That keeps it safe to share
+between threads and between event loops (each sync runs its own loop)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`
+
+    Tokens may go negative; a negative balance is a queue of callers that have
+    already been promised a future slot
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait for it"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time spent waiting"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_shared: TokenBucket | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> TokenBucket:
+    """
+    The process-wide BGG limiter
+
+    Configured from the environment on first use:
+    - BGG_REQUESTS_PER_SECOND (default 0.5, i.e. one request every 2s)
+    - BGG_BURST (default 1)
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TokenBucket(
+                rate=float(os.getenv("BGG_REQUESTS_PER_SECOND", "0.5")),
+                capacity=float(os.getenv("BGG_BURST", "1")),
+            )
+        return _shared
@@ -3,26 +3,172 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Generator
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from dotenv import load_dotenv, find_dotenv
 
+from app.services.read_model import ReadModel, read_model_for
+from app.services.users import NO_USER_ID, normalize_username, user_ids
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 load_dotenv(find_dotenv())  # loads repo-root .env if present
 
 
-def _db_url() -> str:
+# -----------------------------------------------------------------------------
+# Engine profiles
+# -----------------------------------------------------------------------------
+# "wal" (default): WAL journaling so readers never block on the writer (and
+#   vice versa), a busy timeout instead of instant "database is locked", and
+#   a bigger page cache / mmap window for the read-heavy grid + search paths
+# "default": SQLite's stock settings (rollback journal), for comparison or
+#   for filesystems where WAL is unsupported (some network mounts)
+#
+# Every pragma can be overridden individually through the environment.
+# Profiles are SQLite-only: with API_DATABASE_URL=postgresql://... (several
+# API replicas sharing one database) only the pool settings apply
+
+_PROFILES: dict[str, dict[str, str]] = {
+    "wal": {
+        "journal_mode": "WAL",
+        # Safe with WAL: a power loss can drop the last commits, never corrupt
+        "synchronous": "NORMAL",
+        "busy_timeout": "5000",
+        "mmap_size": str(256 * 1024 * 1024),
+        "cache_size": str(-64 * 1024),  # negative = KiB, i.e. 64 MiB
+        "temp_store": "MEMORY",
+    },
+    "default": {},
+}
+
+_PRAGMA_ENV = {
+    "journal_mode": "SQLITE_JOURNAL_MODE",
+    "synchronous": "SQLITE_SYNCHRONOUS",
+    "busy_timeout": "SQLITE_BUSY_TIMEOUT_MS",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "cache_size": "SQLITE_CACHE_SIZE",
+    "temp_store": "SQLITE_TEMP_STORE",
+}
+
+
+def sqlite_pragmas(profile: str | None = None) -> dict[str, str]:
+    """Pragmas for `profile` (default: $API_DB_PROFILE or "wal"), with env overrides"""
+    profile = profile or os.getenv("API_DB_PROFILE", "wal")
+    if profile not in _PROFILES:
+        raise ValueError(f"unknown API_DB_PROFILE {profile!r}; expected one of {sorted(_PROFILES)}")
+    pragmas = dict(_PROFILES[profile])
+    for name, env in _PRAGMA_ENV.items():
+        if os.getenv(env):
+            pragmas[name] = os.environ[env]
+    return pragmas
+
+
+def _pool_options(profile: str, *, server: bool) -> dict:
+    if not server and profile != "wal":
+        return {}
+    # WAL allows many concurrent readers next to one writer, so give reads
+    # room to run in parallel; writers queue on busy_timeout, not the pool.
+    # A database server takes the same sizing, per API process
+    options = {
+        "pool_size": int(os.getenv("API_DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("API_DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("API_DB_POOL_TIMEOUT", "30")),
+    }
+    if server:
+        # Server connections go away (restarts, failovers, idle timeouts in
+        # proxies like PgBouncer): replace them before that, and test each
+        # one on checkout
+        options["pool_recycle"] = int(os.getenv("API_DB_POOL_RECYCLE", "1800"))
+        options["pool_pre_ping"] = os.getenv("API_DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+    return options
+
+
+def _install_pragmas(eng: Engine, pragmas: dict[str, str]) -> None:
+    @event.listens_for(eng, "connect")
+    def _apply_pragmas(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def make_engine(url: str, *, profile: str | None = None) -> Engine:
+    """
+    Create an engine for a SQLite or PostgreSQL URL
+
+    SQLite gets the profile's pragmas and pool settings; PostgreSQL gets the
+    pool settings plus recycling and pre-ping
+    """
+    if not is_sqlite(url):
+        return create_engine(url, **_pool_options("", server=True))
+
+    profile = profile or os.getenv("API_DB_PROFILE", "wal")
+    eng = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        **_pool_options(profile, server=False),
+    )
+    _install_pragmas(eng, sqlite_pragmas(profile))
+    return eng
+
+
+def make_async_engine(url: str, *, profile: str | None = None) -> AsyncEngine:
+    """
+    `make_engine`, on an asyncio driver: same pragmas and pool settings
+
+    `url` may be a plain sqlite:// URL; the aiosqlite driver is swapped in.
+    PostgreSQL URLs use psycopg, which serves both
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    if not is_sqlite(url):
+        return create_async_engine(url, **_pool_options("", server=True))
+
+    profile = profile or os.getenv("API_DB_PROFILE", "wal")
+    if url.startswith("sqlite://"):
+        url = "sqlite+aiosqlite://" + url.removeprefix("sqlite://")
+
+    options = _pool_options(profile, server=False)
+    if options:
+        # aiosqlite defaults to NullPool, which ignores pool sizing
+        options["poolclass"] = AsyncAdaptedQueuePool
+    eng = create_async_engine(url, **options)
+    _install_pragmas(eng.sync_engine, sqlite_pragmas(profile))
+    return eng
+
+
+def normalize_url(url: str) -> str:
+    """Point postgres:// and postgresql:// URLs at the psycopg driver"""
+    for scheme in ("postgres://", "postgresql://"):
+        if url.startswith(scheme):
+            return "postgresql+psycopg://" + url.removeprefix(scheme)
+    return url
+
+
+def database_url() -> str:
+    """API_DATABASE_URL, or by default the SQLite file API_DATA_DIR/app.db"""
+    url = os.getenv("API_DATABASE_URL")
+    if url:
+        return normalize_url(url)
     data_dir = os.getenv("API_DATA_DIR", "./data")
     Path(data_dir).mkdir(parents=True, exist_ok=True)
     return f"sqlite:///{Path(data_dir) / 'app.db'}"
 
 
-engine = create_engine(
-    _db_url(),
-    connect_args={"check_same_thread": False},
-)
+engine = make_engine(database_url())
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -33,3 +179,78 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def get_sessionmaker() -> sessionmaker:
+    """
+    Session factory for work that outlives a request (e.g. background sync jobs)
+
+    A dependency so tests can point background work at their own database
+    """
+    return SessionLocal
+
+
+def get_read_model(session_factory: sessionmaker = Depends(get_sessionmaker)) -> ReadModel | None:
+    """The in-memory read model (API_READ_MODEL=1, see services/read_model.py), or None"""
+    return read_model_for(session_factory)
+
+
+# -----------------------------------------------------------------------------
+# Optional async stack
+# -----------------------------------------------------------------------------
+# API_ASYNC_DB=1 serves the API from `async def` handlers on an aiosqlite
+# engine (see routes/aio.py) instead of sync handlers on Starlette's
+# threadpool. Background sync jobs keep using the sync engine either way.
+# Created lazily, so aiosqlite is only needed when enabled
+
+def async_db_enabled() -> bool:
+    return os.getenv("API_ASYNC_DB", "0").lower() in ("1", "true", "yes")
+
+
+_async_sessionmaker: async_sessionmaker | None = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Async counterpart of `get_sessionmaker` (e.g. for streamed responses)"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_sessionmaker = async_sessionmaker(
+            bind=make_async_engine(database_url()), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# -----------------------------------------------------------------------------
+# Current user
+# -----------------------------------------------------------------------------
+# The X-User header names the user a request acts for (see services/users.py)
+
+def request_username(x_user: str | None) -> str:
+    try:
+        return normalize_username(x_user)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def get_user_id(
+    x_user: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> int:
+    """The acting user; NO_USER_ID (owns nothing) if they do not exist yet"""
+    user_id = user_ids.lookup(db, request_username(x_user))
+    return NO_USER_ID if user_id is None else user_id
+
+
+def get_or_create_user_id(
+    x_user: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> int:
+    """The acting user, created if new; only for requests that create something"""
+    return user_ids.resolve(db, request_username(x_user))
@@ -6,7 +6,7 @@ Application entry point for the BGG Shelf Mapper API
 
 This module is responsible for:
 - Creating the FastAPI app
-- Wiring middleware (CORS)
+- Wiring middleware (CORS, request metrics)
 - Initializing database tables
 - Seeding sample data for local/dev usage
 - Registering all API routers
@@ -20,15 +20,22 @@ It intentionally does NOT:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .db import engine, SessionLocal
+from .db import async_db_enabled, engine, SessionLocal
+from .migrations import migration_lock, upgrade_schema
 from .models import Base
 from .seed import seed_if_empty
+from .services.image_cache import shutdown_image_cache
+from .services.metrics import MetricsMiddleware
+from .services.read_model import reset_read_model
+from .services.sync_jobs import shutdown_job_manager
 
 # Route modules (explicit imports make wiring obvious)
 from .routes.games import router as games_router
 from .routes.fixtures import router as fixtures_router
 from .routes.placements import router as placements_router
 from .routes.sync import router as sync_router
+from .routes.metrics import router as metrics_router
+from .routes import aio
 
 
 # -----------------------------------------------------------------------------
@@ -57,8 +64,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Per-route latency, SQL statement count and time, response bytes (GET
+# /api/metrics); added last so it is outermost and times everything above
+app.add_middleware(MetricsMiddleware)
+
 
 # -----------------------------------------------------------------------------
 # Application lifecycle
@@ -71,16 +83,35 @@ def on_startup() -> None:
 
     Responsibilities:
     - Create database tables if they do not exist
+    - Bring databases created by older versions up to date (columns, indexes, search index)
     - Seed sample data (fixtures, games, placements) ONLY if DB is empty
+    - All of it under a lock, so replicas sharing a PostgreSQL database
+      don't race each other
 
     Notes:
     - This runs in normal app startup (Docker, uvicorn)
     - Tests override the DB dependency and do NOT rely on this hook
     """
-    Base.metadata.create_all(bind=engine)
+    with migration_lock(engine):
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+
+        with SessionLocal() as db:
+            seed_if_empty(db)
 
-    with SessionLocal() as db:
-        seed_if_empty(db)
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    """
+    Application shutdown hook
+
+    Stops the background sync workers; queued jobs are dropped (they are
+    in-memory only) and running ones finish on their own threads. Queued
+    image downloads are dropped the same way, and the read model is let go
+    """
+    shutdown_job_manager()
+    shutdown_image_cache()
+    reset_read_model()
 
 
 # -----------------------------------------------------------------------------
@@ -104,8 +135,17 @@ def health() -> dict:
 # -----------------------------------------------------------------------------
 # Each router owns a specific domain and URL space
 # Explicit includes avoid "why is this 404?" debugging
-
-app.include_router(games_router)
-app.include_router(fixtures_router)
-app.include_router(placements_router)
-app.include_router(sync_router)
+# API_ASYNC_DB=1 swaps in the async variants (same URLs; see routes/aio.py)
+
+if async_db_enabled():
+    app.include_router(aio.games_router)
+    app.include_router(aio.fixtures_router)
+    app.include_router(aio.placements_router)
+    app.include_router(aio.sync_router)
+else:
+    app.include_router(games_router)
+    app.include_router(fixtures_router)
+    app.include_router(placements_router)
+    app.include_router(sync_router)
+
+app.include_router(metrics_router)
@@ -0,0 +1,224 @@
+#apps/api/app/migrations.py
+"""
+In-place schema upgrades for existing databases
+
+`Base.metadata.create_all` only creates missing *tables*; a database created
+by an older version keeps its old tables as they were. The steps here add
+what create_all cannot, and are safe to run on every startup
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, Mapping
+
+from sqlalchemy import Table, delete, insert, inspect, literal, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from app.models import Base, Collection, CollectionGame, Fixture, Game, Placement, SyncCursor, SyncItemHash, User
+from app.services.game_search import ensure_search_index
+from app.services.slots import ensure_bounds_triggers
+from app.services.users import DEFAULT_USERNAME, LOCAL_COLLECTION, ensure_owned_games
+
+# "r12c3" -> 12, 3 in SQLite SQL, for copying placements from before integer
+# cells. Slots were validated ("r<digits>c<digits>", in bounds) on the way in
+_CELL_FILL = {
+    "row": "CAST(substr(slot, 2, instr(slot, 'c') - 2) AS INTEGER)",
+    "col": "CAST(substr(slot, instr(slot, 'c') + 1) AS INTEGER)",
+}
+
+
+def ensure_columns(engine: Engine) -> None:
+    """
+    Add columns declared on the models but missing from existing tables
+
+    Only for additive columns: nullable, or NOT NULL with a server default
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+
+def ensure_indexes(engine: Engine) -> None:
+    """Create any index declared on the models but missing from the database"""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def rebuild_table(conn: Connection, table: Table, fill: Mapping[str, str]) -> None:
+    """
+    Recreate `table` from its model definition and copy its rows over
+
+    For changes SQLite's ALTER TABLE cannot make: NOT NULL columns without
+    a default, new or changed constraints. `fill` maps columns the old table
+    lacks to SQL expressions for their value; missing columns not in `fill`
+    get their defaults. Indexes are left to `ensure_indexes`. Relies on
+    foreign key enforcement being off, SQLite's default
+    """
+    old = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    tmp = f"_new_{table.name}"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.exec_driver_sql(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {tmp} ", 1))
+
+    columns = [c.name for c in table.columns if c.name in old or c.name in fill]
+    values = [name if name in old else fill[name] for name in columns]
+    conn.exec_driver_sql(
+        f"INSERT INTO {tmp} ({', '.join(columns)}) SELECT {', '.join(values)} FROM {table.name}"
+    )
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {tmp} RENAME TO {table.name}")
+
+
+def ensure_owners(engine: Engine) -> None:
+    """
+    Hand a database from before users existed to the default user
+
+    - Each BGG account synced so far becomes one of their collections (its
+      sync cursor and hashes move to the collection's key), owning the games
+      its hashes list
+    - Every other game goes into their "local" collection
+    - fixtures and placements are rebuilt with user_id (and placements with
+      the per-user uq_game_one_location)
+    """
+    if engine.dialect.name != "sqlite":
+        # PostgreSQL support arrived after users did; nothing to hand over
+        return
+    inspector = inspect(engine)
+    if not inspector.has_table(Fixture.__tablename__):
+        return
+    if "user_id" in {c["name"] for c in inspector.get_columns(Fixture.__tablename__)}:
+        return
+
+    with engine.begin() as conn:
+        user_id = conn.scalar(select(User.id).where(User.username == DEFAULT_USERNAME))
+        if user_id is None:
+            user_id = conn.scalar(insert(User).values(username=DEFAULT_USERNAME).returning(User.id))
+
+        legacy = conn.scalars(select(SyncCursor.username).where(~SyncCursor.username.contains(":"))).all()
+        for name in legacy:
+            collection_id = conn.scalar(
+                insert(Collection).values(user_id=user_id, name=name).returning(Collection.id)
+            )
+            key = f"{user_id}:{name}"
+            conn.execute(
+                insert(SyncCursor).from_select(
+                    ["username", "last_synced_at", "last_full_sync_at"],
+                    select(literal(key), SyncCursor.last_synced_at, SyncCursor.last_full_sync_at).where(
+                        SyncCursor.username == name
+                    ),
+                )
+            )
+            conn.execute(update(SyncItemHash).where(SyncItemHash.username == name).values(username=key))
+            conn.execute(delete(SyncCursor).where(SyncCursor.username == name))
+            conn.execute(
+                insert(CollectionGame).from_select(
+                    ["collection_id", "game_id"],
+                    select(literal(collection_id), Game.id)
+                    .join(SyncItemHash, SyncItemHash.bgg_id == Game.bgg_id)
+                    .where(SyncItemHash.username == key),
+                )
+            )
+
+        local_id = conn.scalar(
+            insert(Collection).values(user_id=user_id, name=LOCAL_COLLECTION).returning(Collection.id)
+        )
+        conn.execute(
+            insert(CollectionGame).from_select(
+                ["collection_id", "game_id"],
+                select(literal(local_id), Game.id).where(Game.id.not_in(select(CollectionGame.game_id))),
+            )
+        )
+
+        rebuild_table(conn, Fixture.__table__, {"user_id": str(user_id)})
+        rebuild_table(conn, Placement.__table__, {"user_id": str(user_id), **_CELL_FILL})
+
+
+def ensure_cells(engine: Engine) -> None:
+    """
+    Move placements from "r0c0" slot strings to integer (row, col) cells
+
+    The slot column, its uq_fixture_slot and its index go; uq_fixture_cell
+    and the bounds check come in. SQLite rebuilds the table; PostgreSQL
+    alters it in place
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(Placement.__tablename__):
+        return
+    if "slot" not in {c["name"] for c in inspector.get_columns(Placement.__tablename__)}:
+        return
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            rebuild_table(conn, Placement.__table__, _CELL_FILL)
+            return
+        conn.exec_driver_sql('ALTER TABLE placements ADD COLUMN "row" INTEGER, ADD COLUMN col INTEGER')
+        conn.exec_driver_sql(
+            "UPDATE placements SET"
+            " \"row\" = split_part(substr(slot, 2), 'c', 1)::integer,"
+            " col = split_part(slot, 'c', 2)::integer"
+        )
+        conn.exec_driver_sql(
+            "ALTER TABLE placements"
+            ' ALTER COLUMN "row" SET NOT NULL,'
+            " ALTER COLUMN col SET NOT NULL,"
+            " DROP COLUMN slot,"
+            ' ADD CONSTRAINT uq_fixture_cell UNIQUE (fixture_id, "row", col),'
+            ' ADD CONSTRAINT ck_placement_cell_nonnegative CHECK ("row" >= 0 AND col >= 0)'
+        )
+
+
+def ensure_owned(engine: Engine) -> None:
+    """The owned_games triggers, and its rows for collections from before it existed"""
+    with engine.begin() as conn:
+        ensure_owned_games(conn)
+
+
+def ensure_cell_bounds(engine: Engine) -> None:
+    """The placement bounds triggers; a SQLite table rebuild drops them"""
+    with engine.begin() as conn:
+        ensure_bounds_triggers(conn)
+
+
+# Arbitrary, fixed key for pg_advisory_lock
+_MIGRATION_LOCK_KEY = 0x5E1F
+
+
+@contextmanager
+def migration_lock(engine: Engine) -> Iterator[None]:
+    """
+    Serialize schema setup across API processes starting together
+
+    On PostgreSQL, replicas behind a load balancer would otherwise race on
+    create_all and the upgrades; SQLite's own file lock already serializes
+    them
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"SELECT pg_advisory_lock({_MIGRATION_LOCK_KEY})")
+        try:
+            yield
+        finally:
+            conn.exec_driver_sql(f"SELECT pg_advisory_unlock({_MIGRATION_LOCK_KEY})")
+            conn.commit()
+
+
+def upgrade_schema(engine: Engine) -> None:
+    ensure_owners(engine)
+    ensure_cells(engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    ensure_cell_bounds(engine)
+    ensure_owned(engine)
+    ensure_search_index(engine)
@@ -1,8 +1,10 @@
 #apps/api/app/models.py
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, UniqueConstraint
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, ForeignKey, Index, String, UniqueConstraint, cast, literal
+from sqlalchemy.orm import DeclarativeBase, Mapped, column_property, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
@@ -11,6 +13,10 @@ class Base(DeclarativeBase):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        # Keyset pagination / name ordering for GET /api/games
+        Index("ix_games_name_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     bgg_id: Mapped[int] = mapped_column(unique=True, index=True)
@@ -22,13 +28,110 @@ class Game(Base):
     placements: Mapped[list["Placement"]] = relationship(back_populates="game")
 
 
+class User(Base):
+    # Identified by the X-User header (see services/users.py); stored lowercased
+    __tablename__ = "users"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    username: Mapped[str] = mapped_column(unique=True)
+
+    collections: Mapped[list["Collection"]] = relationship(back_populates="user")
+
+
+class Collection(Base):
+    # A set of owned games: one per BGG account a user syncs, plus "local"
+    __tablename__ = "collections"
+    __table_args__ = (
+        # Also the index behind "every collection of user X"
+        UniqueConstraint("user_id", "name", name="uq_user_collection"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    name: Mapped[str]  # BGG username (lowercased), or "local"
+
+    user: Mapped["User"] = relationship(back_populates="collections")
+
+    @property
+    def sync_key(self) -> str:
+        """SyncCursor / SyncItemHash key for this collection's BGG syncs"""
+        return f"{self.user_id}:{self.name}"
+
+
+class CollectionGame(Base):
+    # Ownership: games are shared rows, collections point at them
+    __tablename__ = "collection_games"
+    __table_args__ = (Index("ix_collection_games_game_id", "game_id"),)
+
+    collection_id: Mapped[int] = mapped_column(
+        ForeignKey("collections.id", ondelete="CASCADE"), primary_key=True
+    )
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+
+
+class OwnedGame(Base):
+    # Derived from collection_games by triggers (services/users.py): each game
+    # a user owns, once, with its name copied so a listing page walks one
+    # per-user index in name order
+    __tablename__ = "owned_games"
+    __table_args__ = (
+        Index("ix_owned_games_user_id_name", "user_id", "name", "game_id"),
+        Index("ix_owned_games_game_id", "game_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    name: Mapped[str]
+
+
+class GameDetails(Base):
+    # Cache of /xmlapi2/thing results; lets re-syncs skip fresh details
+    __tablename__ = "bgg_thing_details"
+
+    bgg_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    name: Mapped[str]
+    year_published: Mapped[int | None]
+    thumbnail_url: Mapped[str | None]
+    image_url: Mapped[str | None]
+    fetched_at: Mapped[datetime] = mapped_column(index=True)
+
+
+class SyncCursor(Base):
+    # Per-collection sync bookkeeping, keyed by Collection.sync_key
+    # ("<user id>:<bgg username>"); the column name predates collections
+    __tablename__ = "sync_cursors"
+
+    username: Mapped[str] = mapped_column(primary_key=True)
+    last_synced_at: Mapped[datetime | None]
+    last_full_sync_at: Mapped[datetime | None]
+
+
+class SyncItemHash(Base):
+    # Content hash of each collection item as last synced, per collection
+    __tablename__ = "sync_item_hashes"
+
+    username: Mapped[str] = mapped_column(
+        ForeignKey("sync_cursors.username", ondelete="CASCADE"), primary_key=True
+    )
+    bgg_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    content_hash: Mapped[str]
+
+
 class Fixture(Base):
     __tablename__ = "fixtures"
+    __table_args__ = (
+        # GET /api/fixtures lists one user's fixtures in id order
+        Index("ix_fixtures_user_id_id", "user_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     name: Mapped[str]
     rows: Mapped[int]
     cols: Mapped[int]
+    # Bumped by every write to this fixture's placements (and by syncs that
+    # change game metadata); the grid's ETag and cache key
+    version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     placements: Mapped[list["Placement"]] = relationship(back_populates="fixture")
 
@@ -36,14 +139,28 @@ class Fixture(Base):
 class Placement(Base):
     __tablename__ = "placements"
     __table_args__ = (
-        UniqueConstraint("fixture_id", "slot", name="uq_fixture_slot"),
-        UniqueConstraint("game_id", name="uq_game_one_location"),
+        # One game per cell; also the index behind per-fixture, per-row and
+        # per-region reads (services/slots.py::cells_in)
+        UniqueConstraint("fixture_id", "row", "col", name="uq_fixture_cell"),
+        # One location per game per user; also the index behind the
+        # placement column of a user's game listing
+        UniqueConstraint("user_id", "game_id", name="uq_game_one_location"),
+        # Upper bounds depend on the fixture; triggers check those (services/slots.py)
+        CheckConstraint('"row" >= 0 AND col >= 0', name="ck_placement_cell_nonnegative"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    fixture_id: Mapped[int] = mapped_column(ForeignKey("fixtures.id", ondelete="CASCADE"), index=True)
-    slot: Mapped[str] = mapped_column(index=True)  # e.g. "r0c0"
+    # The fixture's owner, copied here so the constraint above can see it
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    fixture_id: Mapped[int] = mapped_column(ForeignKey("fixtures.id", ondelete="CASCADE"))
+    row: Mapped[int] = mapped_column()
+    col: Mapped[int] = mapped_column()
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), index=True)
 
+    # The API's "r{row}c{col}" form, computed in SQL (read-only)
+    slot: Mapped[str] = column_property(
+        literal("r") + cast(row, String) + literal("c") + cast(col, String)
+    )
+
     fixture: Mapped["Fixture"] = relationship(back_populates="placements")
     game: Mapped["Game"] = relationship(back_populates="placements")
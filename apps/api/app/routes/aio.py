@@ -0,0 +1,330 @@
+#apps/api/app/routes/aio.py
+"""
+Async variants of the API routes (enabled with API_ASYNC_DB=1)
+
+Same URLs, parameters and responses as the sync routers, but served by
+`async def` handlers on an AsyncSession (aiosqlite, or psycopg on
+PostgreSQL), so requests wait on the event loop instead of queueing for a
+threadpool thread
+
+- Hot reads (fixture list, grid, game pages) are written natively async
+- Writes, and grid renders on a cache miss, run the sync implementations
+  through `AsyncSession.run_sync`, so there is one copy of the placement
+  rules, version checks and event publishing
+- Sync jobs still run on their worker threads with the sync engine
+- With API_READ_MODEL=1 the same reads are answered by the read model, on
+  the threadpool (a read may first refresh it from the database); writes
+  already keep it current through the sync implementations
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from ..db import get_async_db, get_async_sessionmaker, get_read_model, get_sessionmaker, request_username
+from ..schemas import (
+    FixtureCreate,
+    FixtureGridOut,
+    FixtureOut,
+    GameWithPlacementOut,
+    PlacementBatch,
+    PlacementBatchOut,
+    PlacementOut,
+    PlacementUpsert,
+    SyncRequest,
+)
+from ..services.fast_json import FastJSONResponse
+from ..services.fixture_grid import get_grid_json
+from ..services.fixture_versions import etag, etag_matches
+from ..services.game_listing import (
+    MAX_PAGE_SIZE,
+    astream_all,
+    decode_cursor,
+    iter_json,
+    listing_query,
+    next_cursor,
+    parse_fields,
+)
+from ..services.game_search import fts_supported
+from ..services.image_cache import DEFAULT_SIZE, ImageCache, get_image_cache
+from ..services.read_model import ReadModel
+from ..services.users import NO_USER_ID, user_ids
+from . import fixtures, games, placements, sync
+
+games_router = APIRouter(tags=["games"])
+fixtures_router = APIRouter(tags=["fixtures"])
+placements_router = APIRouter(prefix="/api", tags=["placements"])
+sync_router = APIRouter(tags=["sync"])
+
+routers = (games_router, fixtures_router, placements_router, sync_router)
+
+
+def _docs_from(route: Callable) -> Callable:
+    """Document a handler with its sync twin's docstring, so both OpenAPI schemas read the same"""
+
+    def decorate(handler: Callable) -> Callable:
+        handler.__doc__ = route.__doc__
+        return handler
+
+    return decorate
+
+
+async def get_async_user_id(
+    x_user: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    """See db.py::get_user_id; once a user is known, this runs no query"""
+    username = request_username(x_user)
+    user_id = user_ids.cached(username)
+    if user_id is None:
+        user_id = await db.run_sync(user_ids.lookup, username)
+    return NO_USER_ID if user_id is None else user_id
+
+
+async def get_async_or_create_user_id(
+    x_user: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    """See db.py::get_or_create_user_id"""
+    username = request_username(x_user)
+    user_id = user_ids.cached(username)
+    if user_id is None:
+        user_id = await db.run_sync(user_ids.resolve, username)
+    return user_id
+
+
+# -----------------------------------------------------------------------------
+# Games
+# -----------------------------------------------------------------------------
+
+@games_router.get("/api/games", response_model=list[GameWithPlacementOut])
+@_docs_from(games.list_games)
+async def list_games(
+    q: games.SearchParam = None,
+    limit: games.PageSizeParam = None,
+    cursor: games.CursorParam = None,
+    fields: games.FieldsParam = None,
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker),
+    model: ReadModel | None = Depends(get_read_model),
+) -> StreamingResponse:
+    page_size = limit if limit is not None or cursor is None else MAX_PAGE_SIZE
+    try:
+        selected = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+        if model is not None and not q:
+            rows = await run_in_threadpool(model.games_page, user_id, selected, after=after, limit=page_size)
+        else:
+            rows = None
+            stmt = listing_query(
+                selected, user_id=user_id, q=q, use_fts=fts_supported(db.bind), after=after, limit=page_size
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if page_size is None:
+        if rows is not None:
+            return StreamingResponse(iter_json(rows, selected), media_type="application/json")
+        return StreamingResponse(astream_all(session_factory, stmt, selected), media_type="application/json")
+
+    if rows is None:
+        rows = (await db.execute(stmt)).all()
+    headers = {}
+    cursor_out = next_cursor(rows, selected, page_size)
+    if cursor_out:
+        headers["X-Next-Cursor"] = cursor_out
+    return StreamingResponse(
+        iter_json(rows[:page_size], selected),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@games_router.get("/api/games/{game_id}/image")
+@_docs_from(games.get_game_image)
+async def get_game_image(
+    game_id: int,
+    size: games.ImageSizeParam = DEFAULT_SIZE,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    urls = (await db.execute(games.game_image_urls_stmt(game_id))).first()
+    # Disk reads, downloads and resizes block; keep them off the event loop
+    return await run_in_threadpool(games.image_response, images, urls, size, if_none_match)
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+
+@fixtures_router.get("/api/fixtures", response_model=list[FixtureOut])
+@_docs_from(fixtures.list_fixtures)
+async def list_fixtures(
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> FastJSONResponse:
+    if model is not None:
+        return fixtures.fixtures_json(await run_in_threadpool(model.fixtures_of, user_id))
+    return fixtures.fixtures_json(await db.execute(fixtures.list_fixtures_stmt(user_id)))
+
+
+@fixtures_router.post("/api/fixtures", response_model=FixtureOut)
+@_docs_from(fixtures.create_fixture)
+async def create_fixture(
+    payload: FixtureCreate,
+    user_id: int = Depends(get_async_or_create_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> FixtureOut:
+    return await db.run_sync(lambda s: fixtures.create_fixture(payload, user_id, s))
+
+
+async def _fixture_version(
+    fixture_id: int,
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> int:
+    if model is not None:
+        version = await run_in_threadpool(model.fixture_version, fixture_id, user_id)
+    else:
+        version = await db.scalar(fixtures.fixture_version_stmt(fixture_id, user_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    return version
+
+
+@fixtures_router.get("/api/fixtures/{fixture_id}/grid", response_model=FixtureGridOut)
+@_docs_from(fixtures.get_fixture_grid)
+async def get_fixture_grid(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    user_id: int = Depends(get_async_user_id),
+    version: int = Depends(_fixture_version),
+    db: AsyncSession = Depends(get_async_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> Response:
+    headers = {"ETag": etag(version), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, version):
+        return Response(status_code=304, headers=headers)
+
+    # A cache hit runs no query; a miss renders with the shared sync code
+    if model is not None:
+        rendered = await run_in_threadpool(model.grid_json, fixture_id, user_id)
+    else:
+        rendered = await db.run_sync(get_grid_json, fixture_id, version)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    body, version = rendered
+    headers["ETag"] = etag(version)
+    return FastJSONResponse(body, headers=headers)
+
+
+@fixtures_router.get("/api/fixtures/{fixture_id}/grid/sprite")
+@_docs_from(fixtures.get_grid_sprite)
+async def get_grid_sprite(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    version: int = Depends(_fixture_version),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    return await run_in_threadpool(
+        fixtures.sprite_response, session_factory, images, fixture_id, version, if_none_match, offsets=False
+    )
+
+
+@fixtures_router.get("/api/fixtures/{fixture_id}/grid/sprite.json")
+@_docs_from(fixtures.get_grid_sprite_offsets)
+async def get_grid_sprite_offsets(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    version: int = Depends(_fixture_version),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    return await run_in_threadpool(
+        fixtures.sprite_response, session_factory, images, fixture_id, version, if_none_match, offsets=True
+    )
+
+
+@fixtures_router.get("/api/fixtures/{fixture_id}/events")
+@_docs_from(fixtures.fixture_events_stream)
+async def fixture_events_stream(
+    fixture_id: int,
+    version: int = Depends(_fixture_version),
+) -> StreamingResponse:
+    return fixtures.event_stream(fixture_id, version)
+
+
+# -----------------------------------------------------------------------------
+# Placements
+# -----------------------------------------------------------------------------
+
+@placements_router.put("/placements", response_model=PlacementOut)
+@_docs_from(placements.upsert_placement)
+async def upsert_placement(
+    payload: PlacementUpsert,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> PlacementOut:
+    return await db.run_sync(lambda s: placements.upsert_placement(payload, response, if_match, user_id, s))
+
+
+@placements_router.delete("/placements/{fixture_id}/{slot}")
+@_docs_from(placements.clear_slot)
+async def clear_slot(
+    fixture_id: int,
+    slot: str,
+    response: Response,
+    expected_version: int | None = Query(default=None),
+    if_match: str | None = Header(default=None),
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    return await db.run_sync(
+        lambda s: placements.clear_slot(fixture_id, slot, response, expected_version, if_match, user_id, s)
+    )
+
+
+@placements_router.post("/placements/batch", response_model=PlacementBatchOut)
+@_docs_from(placements.batch_placements)
+async def batch_placements(
+    payload: PlacementBatch,
+    user_id: int = Depends(get_async_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> PlacementBatchOut:
+    return await db.run_sync(lambda s: placements.batch_placements(payload, user_id, s))
+
+
+# -----------------------------------------------------------------------------
+# Sync
+# -----------------------------------------------------------------------------
+# Submitting and polling jobs never touch the database, so the sync handlers
+# are reused as-is; the jobs themselves run on worker threads
+
+@sync_router.post("/api/sync/bgg", status_code=202)
+@_docs_from(sync.sync_bgg)
+async def sync_bgg(
+    payload: SyncRequest,
+    response: Response,
+    user_id: int = Depends(get_async_or_create_user_id),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+) -> dict:
+    return sync.sync_bgg(payload, response, user_id, session_factory)
+
+
+@sync_router.get("/api/sync/jobs/{job_id}")
+@_docs_from(sync.get_sync_job)
+async def get_sync_job(job_id: str, user_id: int = Depends(get_async_user_id)) -> dict:
+    return sync.get_sync_job(job_id, user_id)
@@ -1,69 +1,225 @@
 from __future__ import annotations
 
-import re
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..db import get_db, get_or_create_user_id, get_read_model, get_sessionmaker, get_user_id
+from ..models import Fixture
+from ..schemas import FixtureCreate, FixtureOut, FixtureGridOut
+from ..services.fast_json import FastJSONResponse, rows_to_json
+from ..services.fixture_events import RESET, fixture_events, sse
+from ..services.fixture_grid import get_grid_json
+from ..services.fixture_versions import etag, etag_matches
+from ..services.grid_sprite import grid_sprites, sprites_available
+from ..services.image_cache import ImageCache, get_image_cache
+from ..services.read_model import ReadModel, current_read_model
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+router = APIRouter(tags=["fixtures"])
 
-from ..db import get_db
-from ..models import Fixture, Placement, Game
-from ..schemas import FixtureCreate, FixtureOut, FixtureGridOut, GridCell, GameOut
+# Comment lines keep idle event streams open through proxies
+_KEEPALIVE_SECONDS = float(os.getenv("API_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+# How long a sprite request waits for a build before answering 503
+_SPRITE_WAIT_SECONDS = float(os.getenv("API_SPRITE_WAIT_SECONDS", "30"))
+
+_FIXTURE_COLUMNS = (Fixture.id, Fixture.name, Fixture.rows, Fixture.cols, Fixture.version)
+_FIXTURE_KEYS = ("id", "name", "rows", "cols", "version")
 
-router = APIRouter(tags=["fixtures"])
 
-_SLOT_RE = re.compile(r"^r(\d+)c(\d+)$")
+def list_fixtures_stmt(user_id: int):
+    return select(*_FIXTURE_COLUMNS).where(Fixture.user_id == user_id).order_by(Fixture.id.asc())
 
 
-def _parse_slot(slot: str) -> tuple[int, int]:
-    m = _SLOT_RE.match(slot)
-    if not m:
-        raise ValueError("slot must look like r0c0")
-    return int(m.group(1)), int(m.group(2))
+def fixture_version_stmt(fixture_id: int, user_id: int):
+    # Other users' fixtures look exactly like missing ones
+    return select(Fixture.version).where(Fixture.id == fixture_id, Fixture.user_id == user_id)
+
+
+def fixtures_json(rows) -> FastJSONResponse:
+    # Core rows straight to JSON; same shape as list[FixtureOut]
+    return FastJSONResponse(rows_to_json(rows, _FIXTURE_KEYS))
 
 
 @router.get("/api/fixtures", response_model=list[FixtureOut])
-def list_fixtures(db: Session = Depends(get_db)) -> list[FixtureOut]:
-    return [FixtureOut.model_validate(f) for f in db.query(Fixture).order_by(Fixture.id.asc()).all()]
+def list_fixtures(
+    user_id: int = Depends(get_user_id),
+    db: Session = Depends(get_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> FastJSONResponse:
+    if model is not None:
+        return fixtures_json(model.fixtures_of(user_id))
+    return fixtures_json(db.execute(list_fixtures_stmt(user_id)))
 
 
 @router.post("/api/fixtures", response_model=FixtureOut)
-def create_fixture(payload: FixtureCreate, db: Session = Depends(get_db)) -> FixtureOut:
-    fixture = Fixture(name=payload.name, rows=payload.rows, cols=payload.cols)
+def create_fixture(
+    payload: FixtureCreate,
+    user_id: int = Depends(get_or_create_user_id),
+    db: Session = Depends(get_db),
+) -> FixtureOut:
+    fixture = Fixture(user_id=user_id, name=payload.name, rows=payload.rows, cols=payload.cols)
     db.add(fixture)
     db.commit()
     db.refresh(fixture)
+    model = current_read_model()
+    if model is not None:
+        model.fixture_created(fixture)
     return FixtureOut.model_validate(fixture)
 
 
 @router.get("/api/fixtures/{fixture_id}/grid", response_model=FixtureGridOut)
-def get_fixture_grid(fixture_id: int, db: Session = Depends(get_db)) -> FixtureGridOut:
-    fixture = db.get(Fixture, fixture_id)
-    if not fixture:
+def get_fixture_grid(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    user_id: int = Depends(get_user_id),
+    db: Session = Depends(get_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> Response:
+    """
+    The fixture's slots and the game in each
+
+    The ETag is the fixture version; clients revalidate with If-None-Match
+    and get an empty 304 while nothing changed
+    """
+    if model is not None:
+        version = model.fixture_version(fixture_id, user_id)
+    else:
+        version = db.scalar(fixture_version_stmt(fixture_id, user_id))
+    if version is None:
         raise HTTPException(status_code=404, detail="Fixture not found")
-
-    placements = db.query(Placement).filter(Placement.fixture_id == fixture.id).all()
-    game_ids = [p.game_id for p in placements]
-    games = db.query(Game).filter(Game.id.in_(game_ids)).all() if game_ids else []
-    game_by_id = {g.id: g for g in games}
-    placement_by_slot = {p.slot: p for p in placements}
-
-    cells: list[GridCell] = []
-    for r in range(fixture.rows):
-        for c in range(fixture.cols):
-            slot = f"r{r}c{c}"
-            p = placement_by_slot.get(slot)
-            if p:
-                g = game_by_id.get(p.game_id)
-                cells.append(
-                    GridCell(
-                        slot=slot,
-                        game=GameOut.model_validate(g) if g else None,
-                    )
-                )
-            else:
-                cells.append(GridCell(slot=slot, game=None))
-
-    return FixtureGridOut(
-        fixture=FixtureOut.model_validate(fixture),
-        cells=cells,
+    headers = {"ETag": etag(version), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, version):
+        return Response(status_code=304, headers=headers)
+
+    # Pre-serialized and cached; see services/fixture_grid.py
+    if model is not None:
+        rendered = model.grid_json(fixture_id, user_id)
+    else:
+        rendered = get_grid_json(db, fixture_id, version)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    body, version = rendered
+    headers["ETag"] = etag(version)
+    return FastJSONResponse(body, headers=headers)
+
+
+def _fixture_version(
+    fixture_id: int,
+    user_id: int = Depends(get_user_id),
+    db: Session = Depends(get_db),
+    model: ReadModel | None = Depends(get_read_model),
+) -> int:
+    # A sync dependency, so the lookup runs on the threadpool, not the event loop
+    if model is not None:
+        version = model.fixture_version(fixture_id, user_id)
+    else:
+        version = db.scalar(fixture_version_stmt(fixture_id, user_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    return version
+
+
+def sprite_response(
+    session_factory: sessionmaker,
+    images: ImageCache,
+    fixture_id: int,
+    version: int,
+    if_none_match: str | None,
+    *,
+    offsets: bool,
+) -> Response:
+    """
+    The sprite image (or, with `offsets`, its slot map) at `version` or newer
+
+    Blocks while a missing sprite is built, so async callers run it on a thread
+
+    A build that outlasts the wait answers 503; it finishes in the background
+    """
+    if not sprites_available():
+        raise HTTPException(status_code=501, detail="Grid sprites need Pillow installed")
+    headers = {"ETag": etag(version), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, version):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        entry = grid_sprites.get(session_factory, images, fixture_id, version, timeout=_SPRITE_WAIT_SECONDS)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503, detail="Grid sprite is still being built", headers={"Retry-After": "5"}
+        ) from None
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    headers["ETag"] = etag(entry.version)
+    if offsets:
+        return FastJSONResponse(entry.offsets, headers=headers)
+    return Response(entry.image, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/api/fixtures/{fixture_id}/grid/sprite")
+def get_grid_sprite(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    version: int = Depends(_fixture_version),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    """
+    Every placed game's thumbnail packed into one JPEG
+
+    Pair it with `grid/sprite.json` (where each slot's tile is); both carry
+    the fixture version as their ETag, so check they match
+    """
+    return sprite_response(session_factory, images, fixture_id, version, if_none_match, offsets=False)
+
+
+@router.get("/api/fixtures/{fixture_id}/grid/sprite.json")
+def get_grid_sprite_offsets(
+    fixture_id: int,
+    if_none_match: str | None = Header(default=None),
+    version: int = Depends(_fixture_version),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    """Slot -> [x, y, w, h] of its tile in the sprite; see services/grid_sprite.py"""
+    return sprite_response(session_factory, images, fixture_id, version, if_none_match, offsets=True)
+
+
+def event_stream(fixture_id: int, version: int) -> StreamingResponse:
+    """The SSE response for a fixture whose current version is `version`"""
+
+    async def stream():
+        with fixture_events.subscribe(fixture_id) as sub:
+            yield sse("hello", {"fixture_id": fixture_id, "version": version}, event_id=version)
+            while True:
+                message = await sub.get(timeout=_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield b": keepalive\n\n"
+                    continue
+                yield message
+                if message is RESET:
+                    return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+
+
+@router.get("/api/fixtures/{fixture_id}/events")
+async def fixture_events_stream(
+    fixture_id: int,
+    version: int = Depends(_fixture_version),
+) -> StreamingResponse:
+    """
+    Server-sent events: placement diffs for this fixture as they commit
+
+    Starts with `hello` (the current version), then one `placements` event
+    per committed write: {fixture_id, version, changes: [{slot, game_id}]}.
+    On `reset`, or a gap between versions, re-fetch the grid
+    """
+    return event_stream(fixture_id, version)
@@ -1,37 +1,158 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+import os
+from typing import Annotated
 
-from ..db import get_db
-from ..models import Game, Placement
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..db import get_db, get_read_model, get_sessionmaker, get_user_id
+from ..models import Game
 from ..schemas import GameWithPlacementOut
+from ..services.game_listing import (
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    iter_json,
+    listing_query,
+    next_cursor,
+    parse_fields,
+    stream_all,
+)
+from ..services.game_search import fts_supported
+from ..services.image_cache import (
+    DEFAULT_SIZE,
+    SIZES,
+    ImageCache,
+    ImageFetchError,
+    get_image_cache,
+    source_url,
+)
+from ..services.read_model import ReadModel
 
 router = APIRouter(tags=["games"])
 
+# Browsers reuse a stored image this long before revalidating it
+_IMAGE_MAX_AGE = int(os.getenv("API_IMAGE_MAX_AGE", str(7 * 24 * 60 * 60)))
+
+_SIZE_DESCRIPTION = "One of: " + ", ".join(f"{name} ({edge or 'as on BGG'})" for name, edge in SIZES.items())
+
+# Query parameters, shared with the async routes (routes/aio.py) so both document them alike
+SearchParam = Annotated[
+    str | None,
+    Query(description="Name search: words are ANDed, `word*` matches a word prefix; name prefix matches first"),
+]
+PageSizeParam = Annotated[
+    int | None,
+    Query(ge=1, le=MAX_PAGE_SIZE, description="Page size; the next page's cursor is in the X-Next-Cursor header"),
+]
+CursorParam = Annotated[str | None, Query(description="X-Next-Cursor from the previous page")]
+FieldsParam = Annotated[
+    str | None,
+    Query(description="Comma-separated subset of fields to return, e.g. `name,slot` (id is always included)"),
+]
+ImageSizeParam = Annotated[str, Query(description=_SIZE_DESCRIPTION)]
+
 
 @router.get("/api/games", response_model=list[GameWithPlacementOut])
 def list_games(
-    q: str | None = Query(default=None, description="Case-insensitive name search"),
+    q: SearchParam = None,
+    limit: PageSizeParam = None,
+    cursor: CursorParam = None,
+    fields: FieldsParam = None,
+    user_id: int = Depends(get_user_id),
     db: Session = Depends(get_db),
-) -> list[GameWithPlacementOut]:
-    qry = db.query(Game, Placement).outerjoin(Placement, Placement.game_id == Game.id)
-    if q:
-        qry = qry.filter(Game.name.ilike(f"%{q}%"))
-    rows = qry.order_by(Game.name.asc()).all()
-
-    results: list[GameWithPlacementOut] = []
-    for game, placement in rows:
-        results.append(
-            GameWithPlacementOut(
-                id=game.id,
-                bgg_id=game.bgg_id,
-                name=game.name,
-                year_published=game.year_published,
-                thumbnail_url=game.thumbnail_url,
-                image_url=game.image_url,
-                fixture_id=placement.fixture_id if placement else None,
-                slot=placement.slot if placement else None,
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+    model: ReadModel | None = Depends(get_read_model),
+) -> StreamingResponse:
+    """
+    List the user's games with their placement, streamed as a JSON array
+
+    Without `limit` every match is returned (the original behavior). With
+    it, pages are keyset-paginated and the X-Next-Cursor header is set while
+    more pages follow. A cursor is only valid for the same `q`
+    """
+    # A cursor without a limit keeps paging at the maximum page size
+    page_size = limit if limit is not None or cursor is None else MAX_PAGE_SIZE
+    try:
+        selected = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+        if model is not None and not q:
+            rows = model.games_page(user_id, selected, after=after, limit=page_size)
+        else:
+            rows = None
+            stmt = listing_query(
+                selected, user_id=user_id, q=q, use_fts=fts_supported(db.get_bind()), after=after, limit=page_size
             )
-        )
-    return results
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if page_size is None:
+        if rows is not None:
+            return StreamingResponse(iter_json(rows, selected), media_type="application/json")
+        return StreamingResponse(stream_all(session_factory, stmt, selected), media_type="application/json")
+
+    if rows is None:
+        rows = db.execute(stmt).all()
+    headers = {}
+    cursor_out = next_cursor(rows, selected, page_size)
+    if cursor_out:
+        headers["X-Next-Cursor"] = cursor_out
+    return StreamingResponse(
+        iter_json(rows[:page_size], selected),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def game_image_urls_stmt(game_id: int):
+    return select(Game.thumbnail_url, Game.image_url).where(Game.id == game_id)
+
+
+def image_response(images: ImageCache, urls, size: str, if_none_match: str | None) -> Response:
+    """
+    The image response for a game whose (thumbnail_url, image_url) are `urls`
+
+    Blocks while a missing variant is downloaded/resized, so async callers
+    run it on a thread
+    """
+    if size not in SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of: {', '.join(SIZES)}")
+    if urls is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    url = source_url(size, *urls)
+    if url is None:
+        raise HTTPException(status_code=404, detail="Game has no image")
+    try:
+        entry = images.get(url, size)
+    except ImageFetchError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+    except TimeoutError:
+        # The download/resize keeps going; a retry finds it stored
+        raise HTTPException(
+            status_code=503, detail="Image is still being fetched", headers={"Retry-After": "5"}
+        ) from None
+
+    # The ETag is the content hash, so a new image on BGG gets a new one
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={_IMAGE_MAX_AGE}"}
+    if entry.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(images.read(entry), media_type=entry.content_type, headers=headers)
+
+
+@router.get("/api/games/{game_id}/image")
+def get_game_image(
+    game_id: int,
+    size: ImageSizeParam = DEFAULT_SIZE,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    images: ImageCache = Depends(get_image_cache),
+) -> Response:
+    """
+    The game's box art, resized to fit `size` and served from local disk
+
+    Not scoped to the user: games are a shared catalog, and `<img>` tags
+    cannot send X-User. The first request for a size downloads/resizes it
+    """
+    return image_response(images, db.execute(game_image_urls_stmt(game_id)).first(), size, if_none_match)
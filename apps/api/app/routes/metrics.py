@@ -0,0 +1,37 @@
+"""
+Metrics endpoints (see services/metrics.py)
+
+Served in both the sync and async stacks; nothing here touches the database
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..bgg.cache import opened_shared_cache
+from ..services.metrics import metrics, profiler, render_bgg_cache
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/api/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """Per-route latency, SQL and response size totals and BGG cache use, in Prometheus text format"""
+    body = metrics.render() + render_bgg_cache(opened_shared_cache())
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/api/metrics/profiles")
+def list_profiles() -> list[dict]:
+    """Recent requests slower than API_PROFILE_SLOW_MS, newest last"""
+    return [p.summary() for p in profiler.profiles()]
+
+
+@router.get("/api/metrics/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: int) -> PlainTextResponse:
+    """A slow request's sampled stacks, folded (`flamegraph.pl` / speedscope input)"""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.folded())
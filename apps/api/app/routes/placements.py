@@ -5,21 +5,28 @@ Placement (location) API
 Owns physical location state:
 - Which game is in which fixture slot
 - Slot validation and bounds checking
-- Enforces one-game-per-slot and one-slot-per-game
+- Enforces one-game-per-slot and one-slot-per-game (per user)
+- Only touches the requesting user's fixtures, and games they own
+- Bumps fixture versions; writes may be made conditional on them
+  (If-Match / expected_version -> 409 on conflict)
 
 This data is intentionally local-only and never synced to BGG
 """
 
 from __future__ import annotations
 
-import re
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_user_id
 from ..models import Fixture, Game, Placement
-from ..schemas import PlacementUpsert, PlacementOut
+from ..schemas import PlacementBatch, PlacementBatchOut, PlacementUpsert, PlacementOut, SlotRef
+from ..services.fixture_events import fixture_events
+from ..services.fixture_versions import VersionConflict, bump_versions, etag, parse_if_match
+from ..services.placement_batch import apply_placement_batch
+from ..services.slots import format_slot, parse_slot
+from ..services.users import owns_game
 
 
 router = APIRouter(
@@ -27,32 +34,55 @@ router = APIRouter(
     tags=["placements"],
 )
 
-_SLOT_RE = re.compile(r"^r(\d+)c(\d+)$")
+def _expected_version(if_match: str | None, expected_version: int | None) -> int | None:
+    """If-Match wins over the body/query field"""
+    try:
+        parsed = parse_if_match(if_match)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return parsed if parsed is not None else expected_version
 
 
-def _parse_slot(slot: str) -> tuple[int, int]:
-    """Parse a slot string into row/column integers"""
-    match = _SLOT_RE.match(slot)
-    if not match:
-        raise ValueError("slot must look like r0c0")
-    return int(match.group(1)), int(match.group(2))
+def _own_fixture(db: Session, fixture_id: int, user_id: int) -> Fixture:
+    fixture = db.get(Fixture, fixture_id)
+    if fixture is None or fixture.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    return fixture
+
+
+def _conflict(db: Session, exc: VersionConflict) -> HTTPException:
+    db.rollback()
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "Fixture was changed by someone else; re-fetch the grid and retry",
+            "fixture_id": exc.fixture_id,
+            "expected_version": exc.expected,
+            "current_version": exc.current,
+        },
+        headers={"ETag": etag(exc.current)} if exc.current is not None else None,
+    )
 
 
 @router.put("/placements", response_model=PlacementOut)
 def upsert_placement(
     payload: PlacementUpsert,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    user_id: int = Depends(get_user_id),
     db: Session = Depends(get_db),
 ) -> PlacementOut:
-    fixture = db.get(Fixture, payload.fixture_id)
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
+    fixture = _own_fixture(db, payload.fixture_id, user_id)
 
-    game = db.get(Game, payload.game_id)
-    if not game:
+    # Users can only shelve games from their own collections
+    game_id = db.scalar(
+        select(Game.id).where(Game.id == payload.game_id, owns_game(user_id, Game.id))
+    )
+    if game_id is None:
         raise HTTPException(status_code=404, detail="Game not found")
 
     try:
-        row, col = _parse_slot(payload.slot)
+        row, col = parse_slot(payload.slot)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -62,43 +92,131 @@ def upsert_placement(
             detail="slot is out of bounds for this fixture",
         )
 
-    # Enforce uniqueness
-    db.query(Placement).filter(
-        Placement.game_id == game.id
-    ).delete(synchronize_session=False)
+    expected = _expected_version(if_match, payload.expected_version)
+    try:
+        # First, so a stale write fails before touching any placement
+        versions = bump_versions(
+            db, [fixture.id], expected={fixture.id: expected} if expected is not None else None
+        )
+    except VersionConflict as exc:
+        raise _conflict(db, exc)
+
+    # Enforce uniqueness (remembering where the game was, for versions and events)
+    moved_from = db.execute(
+        delete(Placement)
+        .where(Placement.user_id == user_id, Placement.game_id == game_id)
+        .returning(Placement.fixture_id, Placement.row, Placement.col)
+    ).tuples().all()
 
     db.query(Placement).filter(
         Placement.fixture_id == fixture.id,
-        Placement.slot == payload.slot,
+        Placement.row == row,
+        Placement.col == col,
     ).delete(synchronize_session=False)
 
     placement = Placement(
+        user_id=user_id,
         fixture_id=fixture.id,
-        slot=payload.slot,
-        game_id=game.id,
+        row=row,
+        col=col,
+        game_id=game_id,
     )
 
     db.add(placement)
+    versions.update(bump_versions(db, {fid for fid, _, _ in moved_from} - {fixture.id}))
+    db.flush()
+    # Built before the commit expires the ORM objects, so answering costs no re-select
+    out = PlacementOut(
+        id=placement.id,
+        fixture_id=fixture.id,
+        slot=format_slot(row, col),  # canonical form, e.g. for "r01c0"
+        game_id=game_id,
+    )
     db.commit()
-    db.refresh(placement)
 
-    return PlacementOut.model_validate(placement)
+    changes: dict[int, list] = {out.fixture_id: [(out.slot, game_id)]}
+    for fid, old_row, old_col in moved_from:
+        if (fid, old_row, old_col) != (out.fixture_id, row, col):
+            changes.setdefault(fid, []).append((format_slot(old_row, old_col), None))
+    for fid, diff in changes.items():
+        fixture_events.publish(fid, versions[fid], diff)
+
+    response.headers["ETag"] = etag(versions[out.fixture_id])
+    return out
 
 
 @router.delete("/placements/{fixture_id}/{slot}")
 def clear_slot(
     fixture_id: int,
     slot: str,
+    response: Response,
+    expected_version: int | None = Query(default=None),
+    if_match: str | None = Header(default=None),
+    user_id: int = Depends(get_user_id),
     db: Session = Depends(get_db),
 ) -> dict:
-    fixture = db.get(Fixture, fixture_id)
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
+    fixture = _own_fixture(db, fixture_id, user_id)
+    expected = _expected_version(if_match, expected_version)
+    version = fixture.version
+    try:
+        row, col = parse_slot(slot)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
     deleted = db.query(Placement).filter(
         Placement.fixture_id == fixture.id,
-        Placement.slot == slot,
+        Placement.row == row,
+        Placement.col == col,
     ).delete(synchronize_session=False)
 
+    try:
+        # Clearing an empty slot changes nothing; it only checks the version
+        versions = bump_versions(
+            db,
+            [fixture.id] if deleted else [],
+            expected={fixture.id: expected} if expected is not None else None,
+        )
+    except VersionConflict as exc:
+        raise _conflict(db, exc)
     db.commit()
-    return {"deleted": deleted}
+    if deleted:
+        fixture_events.publish(fixture_id, versions[fixture_id], [(format_slot(row, col), None)])
+
+    version = versions.get(fixture_id, version)
+    response.headers["ETag"] = etag(version)
+    return {"deleted": deleted, "version": version}
+
+
+@router.post("/placements/batch", response_model=PlacementBatchOut)
+def batch_placements(
+    payload: PlacementBatch,
+    user_id: int = Depends(get_user_id),
+    db: Session = Depends(get_db),
+) -> PlacementBatchOut:
+    """
+    Apply a list of moves, swaps and clears in one transaction
+
+    Ops apply in order and all-or-nothing: any unknown fixture/game (404),
+    bad slot (400) or fixture past its `expected_versions` entry (409)
+    rejects the whole batch. The response holds the final state of every
+    slot the batch touched, including slots games moved out of, and the new
+    version of each changed fixture
+    """
+    try:
+        result = apply_placement_batch(
+            db, payload.ops, user_id=user_id, expected_versions=payload.expected_versions
+        )
+    except VersionConflict as exc:
+        raise _conflict(db, exc)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    for fid, diff in result.changes.items():
+        fixture_events.publish(fid, result.versions[fid], diff)
+    return PlacementBatchOut(
+        placements=result.placements,
+        cleared=[SlotRef(fixture_id=fid, slot=slot) for fid, slot in result.cleared],
+        versions=result.versions,
+    )
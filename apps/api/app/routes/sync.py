@@ -1,13 +1,13 @@
 #apps/api/app/routes/sync.py
 """
-BGG sync HTTP endpoint
+BGG sync HTTP endpoints
 
-This route:
-- validates configuration
-- delegates fetching to the BGG client
-- delegates persistence to the sync service
+These routes:
+- validate configuration
+- hand the sync to a background job (see services/sync_jobs.py)
+- report job progress
 
-It intentionally does NOT:
+They intentionally do NOT:
 - parse XML
 - contain DB upsert logic
 - know anything about BGG API quirks
@@ -17,30 +17,38 @@ from __future__ import annotations
 
 import os
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import sessionmaker
 
-from app.bgg.client import fetch_collection
-from app.services.bgg_sync import upsert_games_from_bgg
-from ..db import get_db
+from app.services.sync_jobs import get_job_manager
+from ..db import get_or_create_user_id, get_sessionmaker, get_user_id
 from ..schemas import SyncRequest
 
 router = APIRouter(tags=["sync"])
 
-@router.post("/api/sync/bgg")
-def sync_bgg(payload: SyncRequest, db: Session = Depends(get_db)) -> dict:
+@router.post("/api/sync/bgg", status_code=202)
+def sync_bgg(
+    payload: SyncRequest,
+    response: Response,
+    user_id: int = Depends(get_or_create_user_id),
+    session_factory: sessionmaker = Depends(get_sessionmaker),
+) -> dict:
     """
-    Sync the user's owned BGG collection into the local database
+    Start syncing a BGG user's owned collection into the local database
+
+    Games are shared between users; ownership is recorded in the requesting
+    user's collection named after the BGG username
 
     Current behavior:
     - Requires a BGG application token
-    - Uses mocked BGG client in tests
-    - Returns count of processed games
-
-    Future behavior:
-    - Retry on 202 (queued)
-    - Throttle requests
-    - Enrich with thing/details data
+    - Returns 202 with a job id right away; the fetch -> parse -> enrich ->
+      upsert pipeline runs on a background worker
+    - A second request by the same user for a username whose sync is still
+      queued/running joins that job instead of starting another (`merged: true`)
+    - Syncs are incremental after the first one; `full: true` forces a
+      full sync (which also detects removed items)
+    - Progress, the final counts and the delta (added / changed /
+      unchanged / removed) are at GET /api/sync/jobs/{id}
     """
     # Token can be supplied per-request or via environment
     token = payload.token or os.getenv("BGG_APP_TOKEN")
@@ -51,15 +59,27 @@ def sync_bgg(payload: SyncRequest, db: Session = Depends(get_db)) -> dict:
             detail="BGG sync is not configured yet.",
         )
 
-    # Fetch external data (mocked in tests)
-    try:
-        items = fetch_collection(username=payload.username, token=token)
-    except NotImplementedError:
-        raise HTTPException(
-            status_code=501,
-            detail="BGG sync is not wired up yet.",
-        )
+    job, created = get_job_manager().submit(
+        username=payload.username,
+        user_id=user_id,
+        token=token,
+        session_factory=session_factory,
+        full=payload.full,
+    )
+    response.headers["Location"] = f"/api/sync/jobs/{job.id}"
+    return {"job_id": job.id, "merged": not created, **job.as_dict()}
 
-    # Persist data locally without touching placements
-    processed = upsert_games_from_bgg(db=db, items=list(items))
-    return {"status": "ok", "processed": processed}
+
+@router.get("/api/sync/jobs/{job_id}")
+def get_sync_job(job_id: str, user_id: int = Depends(get_user_id)) -> dict:
+    """
+    Report a sync job's progress
+
+    `stage` is one of queued / fetching / enriching / upserting / done, and
+    `status` ends as succeeded (with `result` counts) or failed (with `error`).
+    Only the user who started the job can see it; to anyone else it is 404
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job.as_dict()
@@ -1,6 +1,8 @@
 #apps/api/app/schemas.py
 from __future__ import annotations
 
+from typing import Annotated, Literal, Union
+
 from pydantic import BaseModel, Field
 
 
@@ -32,6 +34,7 @@ class FixtureOut(BaseModel):
     name: str
     rows: int
     cols: int
+    version: int = 0
 
     class Config:
         from_attributes = True
@@ -41,6 +44,8 @@ class PlacementUpsert(BaseModel):
     fixture_id: int
     slot: str  # r{row}c{col}
     game_id: int
+    # Optimistic concurrency: reject (409) unless the fixture is at this version
+    expected_version: int | None = None
 
 
 class PlacementOut(BaseModel):
@@ -53,6 +58,50 @@ class PlacementOut(BaseModel):
         from_attributes = True
 
 
+class SlotRef(BaseModel):
+    fixture_id: int
+    slot: str
+
+
+class BatchMove(BaseModel):
+    # Put a game in a slot (evicting whatever was there), like PUT /api/placements
+    op: Literal["move"]
+    game_id: int
+    fixture_id: int
+    slot: str
+
+
+class BatchSwap(BaseModel):
+    # Exchange the contents of two slots (either may be empty)
+    op: Literal["swap"]
+    a: SlotRef
+    b: SlotRef
+
+
+class BatchClear(BaseModel):
+    op: Literal["clear"]
+    fixture_id: int
+    slot: str
+
+
+BatchOp = Annotated[Union[BatchMove, BatchSwap, BatchClear], Field(discriminator="op")]
+
+
+class PlacementBatch(BaseModel):
+    # Applied in order, all-or-nothing
+    ops: list[BatchOp] = Field(min_length=1, max_length=1000)
+    # fixture_id -> version the client last saw; any mismatch rejects the batch (409)
+    expected_versions: dict[int, int] = Field(default_factory=dict)
+
+
+class PlacementBatchOut(BaseModel):
+    # Final state of every slot the batch touched
+    placements: list[PlacementOut]
+    cleared: list[SlotRef]
+    # New version of every fixture the batch changed
+    versions: dict[int, int]
+
+
 class GridCell(BaseModel):
     slot: str
     game: GameOut | None = None
@@ -68,3 +117,5 @@ class SyncRequest(BaseModel):
     username: str
     # Not required for now; we keep it to make wiring easy later.
     token: str | None = None
+    # Force a full (non-incremental) sync, e.g. to pick up removals now
+    full: bool = False
@@ -1,9 +1,11 @@
 #apps/api/app/seed.py
 from __future__ import annotations
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from .models import Game, Fixture, Placement
+from .services.users import DEFAULT_USERNAME, LOCAL_COLLECTION, add_to_collection, ensure_collection, user_ids
 
 
 SAMPLE_GAMES = [
@@ -18,9 +20,12 @@ SAMPLE_GAMES = [
 
 
 def seed_if_empty(db: Session) -> None:
+    # Everything seeded belongs to the default user
+    user_id = user_ids.resolve(db, DEFAULT_USERNAME)
+
     # Create fixture if none exist
     if db.query(Fixture).count() == 0:
-        fixture = Fixture(name="Office Cubes (2x5)", rows=2, cols=5)
+        fixture = Fixture(user_id=user_id, name="Office Cubes (2x5)", rows=2, cols=5)
         db.add(fixture)
         db.commit()
     else:
@@ -30,6 +35,9 @@ def seed_if_empty(db: Session) -> None:
     if db.query(Game).count() == 0:
         for g in SAMPLE_GAMES:
             db.add(Game(**g, thumbnail_url=None, image_url=None))
+        db.flush()
+        local = ensure_collection(db, user_id, LOCAL_COLLECTION)
+        add_to_collection(db, local.id, db.scalars(select(Game.id)))
         db.commit()
 
     # Add a couple sample placements if empty
@@ -37,8 +45,8 @@ def seed_if_empty(db: Session) -> None:
         games = db.query(Game).order_by(Game.id.asc()).all()
         # Place first 5 across top row
         for i, game in enumerate(games[:5]):
-            db.add(Placement(fixture_id=fixture.id, slot=f"r0c{i}", game_id=game.id))
+            db.add(Placement(user_id=fixture.user_id, fixture_id=fixture.id, row=0, col=i, game_id=game.id))
         # Place 6th in bottom-left if present
         if len(games) > 5:
-            db.add(Placement(fixture_id=fixture.id, slot="r1c0", game_id=games[5].id))
+            db.add(Placement(user_id=fixture.user_id, fixture_id=fixture.id, row=1, col=0, game_id=games[5].id))
         db.commit()
@@ -10,50 +10,366 @@ This module is intentionally minimal:
 Its only job is to translate BGG collection items into local database state
 """
 
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.bgg.client import BggCollectionItem
-from app.models import Game
+from app.models import CollectionGame, Game, GameDetails, SyncCursor, SyncItemHash
+
+# Bounded by SQLite's host parameter limit (the IN (...) prefetch uses one per id)
+UPSERT_CHUNK_SIZE = 500
+
+# Columns owned by BGG; everything else on Game is local-only
+_METADATA_FIELDS = ("name", "year_published", "thumbnail_url", "image_url")
+
+# BGG's modifiedsince is coarse and not in UTC; ask for a day of overlap, from
+# midnight, so every sync on the same day sends the same (cacheable) request
+_MODIFIED_SINCE_MARGIN = timedelta(days=1)
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    updated_ids: list[int] = field(default_factory=list)  # Game.id of each updated game
+
+    @property
+    def processed(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _upsert_insert(db: Session, model):
+    """INSERT supporting ON CONFLICT, for the session's backend (SQLite or PostgreSQL)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"no upsert support for {dialect}")
+
+
+def _utcnow() -> datetime:
+    # Stored naive (SQLite has no tz-aware DATETIME, so neither do the models); always UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def details_max_age() -> timedelta:
+    """How long cached /thing details stay fresh (BGG_DETAILS_MAX_AGE_DAYS, default 30)"""
+    return timedelta(days=float(os.getenv("BGG_DETAILS_MAX_AGE_DAYS", "30")))
+
+
+def _chunks(items: Iterable[BggCollectionItem], size: int) -> Iterator[list[BggCollectionItem]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
 
+def _row_for(item: BggCollectionItem) -> dict:
+    return {"bgg_id": item.bgg_id, **{f: getattr(item, f) for f in _METADATA_FIELDS}}
 
-def upsert_games_from_bgg(db: Session, items: list[BggCollectionItem]) -> int:
+
+def upsert_games_from_bgg(
+    db: Session,
+    items: Iterable[BggCollectionItem],
+    *,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+    on_chunk: Callable[[UpsertResult], None] | None = None,
+) -> UpsertResult:
     """
     Insert or update games based on BGG collection data
 
     Rules:
     - `bgg_id` is the natural unique key
-    - Existing games are updated in-place
+    - Existing games are updated in-place, but only when metadata changed
     - New games are inserted
     - No placements are touched (location data is local-only)
 
+    Items are consumed lazily in chunks: each chunk costs one `IN (...)` prefetch
+    plus at most one executemany `INSERT ... ON CONFLICT(bgg_id) DO UPDATE`.
+    `on_chunk`, if given, is called with the running totals after each chunk.
+
     Returns:
-        int: number of games processed
+        UpsertResult: inserted / updated / unchanged counts, and the ids of
+        the updated games
     """
-    processed = 0
-
-    for item in items:
-        # Look up by BGG ID (stable external identifier)
-        game = db.query(Game).filter(Game.bgg_id == item.bgg_id).one_or_none()
-
-        if game is None:
-            # New game discovered via BGG
-            game = Game(
-                bgg_id=item.bgg_id,
-                name=item.name,
-                year_published=item.year_published,
-                thumbnail_url=item.thumbnail_url,
-                image_url=item.image_url,
+    result = UpsertResult()
+    stmt = _upsert_insert(db, Game)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Game.bgg_id],
+        set_={f: stmt.excluded[f] for f in _METADATA_FIELDS},
+    )
+
+    for chunk in _chunks(items, chunk_size):
+        # Later duplicates win, matching the old row-by-row behavior
+        incoming = {item.bgg_id: _row_for(item) for item in chunk}
+
+        existing = {
+            row.bgg_id: (row.id, tuple(row[2:]))
+            for row in db.execute(
+                select(Game.bgg_id, Game.id, *(getattr(Game, f) for f in _METADATA_FIELDS))
+                .where(Game.bgg_id.in_(incoming.keys()))
             )
-            db.add(game)
-        else:
-            # Existing game: update metadata only
-            game.name = item.name
-            game.year_published = item.year_published
-            game.thumbnail_url = item.thumbnail_url
-            game.image_url = item.image_url
+        }
 
-        processed += 1
+        pending: list[dict] = []
+        for bgg_id, row in incoming.items():
+            game_id, current = existing.get(bgg_id, (None, None))
+            if current is None:
+                result.inserted += 1
+            elif current != tuple(row[f] for f in _METADATA_FIELDS):
+                result.updated += 1
+                result.updated_ids.append(game_id)
+            else:
+                result.unchanged += 1
+                continue
+            pending.append(row)
+
+        if pending:
+            db.execute(stmt, pending)
+        if on_chunk is not None:
+            on_chunk(result)
 
     # One commit at the end keeps behavior predictable
     db.commit()
-    return processed
+    return result
+
+
+def _merge(item: BggCollectionItem, details: BggCollectionItem | None) -> BggCollectionItem:
+    # Thing data is canonical (primary name etc.), but never blanks a field
+    if details is None:
+        return item
+    changes = {f: getattr(details, f) for f in _METADATA_FIELDS if getattr(details, f) is not None}
+    return dataclasses.replace(item, **changes)
+
+
+def enrich_with_details(
+    db: Session,
+    items: Iterable[BggCollectionItem],
+    *,
+    fetch: Callable[[list[int]], dict[int, BggCollectionItem]],
+    max_age: timedelta | None = None,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> Iterator[BggCollectionItem]:
+    """
+    Merge cached or freshly fetched /thing details into collection items
+
+    A streaming stage between the collection parser and `upsert_games_from_bgg`.
+    Per chunk it loads cached details in one query and calls `fetch` only for
+    ids whose cache row is missing or older than `max_age`, so re-syncing an
+    unchanged collection makes (almost) no /thing requests
+
+    `fetch` does the network work (batching, concurrency, retries); ids it
+    does not return simply fall back to stale cache or the collection data
+    """
+    max_age = max_age if max_age is not None else details_max_age()
+    stmt = _upsert_insert(db, GameDetails)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GameDetails.bgg_id],
+        set_={f: stmt.excluded[f] for f in (*_METADATA_FIELDS, "fetched_at")},
+    )
+
+    for chunk in _chunks(items, chunk_size):
+        ids = list(dict.fromkeys(item.bgg_id for item in chunk))
+        cutoff = _utcnow() - max_age
+
+        cached: dict[int, BggCollectionItem] = {}
+        fresh: set[int] = set()
+        rows = db.execute(
+            select(GameDetails.fetched_at, GameDetails.bgg_id, *(getattr(GameDetails, f) for f in _METADATA_FIELDS))
+            .where(GameDetails.bgg_id.in_(ids))
+        )
+        for fetched_at, *values in rows:
+            cached[values[0]] = BggCollectionItem(*values)
+            if fetched_at >= cutoff:
+                fresh.add(values[0])
+        stale = [bgg_id for bgg_id in ids if bgg_id not in fresh]
+
+        if stale:
+            # Don't hold SQLite's write lock, or PostgreSQL row locks, from
+            # earlier chunks' upserts while waiting on BGG
+            db.commit()
+            fetched = fetch(stale)
+            if fetched:
+                now = _utcnow()
+                db.execute(
+                    stmt,
+                    [
+                        {"bgg_id": d.bgg_id, **{f: getattr(d, f) for f in _METADATA_FIELDS}, "fetched_at": now}
+                        for d in fetched.values()
+                    ],
+                )
+                db.commit()
+                cached.update(fetched)
+
+        for item in chunk:
+            yield _merge(item, cached.get(item.bgg_id))
+
+
+def content_hash(item: BggCollectionItem) -> str:
+    """Stable fingerprint of the BGG-owned fields of a collection item"""
+    payload = "\x1f".join(str(getattr(item, f)) for f in ("bgg_id", *_METADATA_FIELDS))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class SyncDelta:
+    mode: str  # "full" or "incremental"
+    modified_since: datetime | None = None
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def as_dict(self) -> dict:
+        data = dataclasses.asdict(self)
+        data["modified_since"] = self.modified_since.isoformat() if self.modified_since else None
+        return data
+
+
+class CollectionDelta:
+    """
+    Per-collection delta tracking between syncs
+
+    Stores a sync cursor (last sync times) and a content hash per bgg_id. A
+    sync runs in one of two modes:
+    - incremental: BGG is asked for items modified since the last sync (minus
+      a safety margin, rounded down to the day); removals cannot be detected
+    - full: the whole collection is fetched; ids that disappeared since the
+      last sync are reported as removed. Used for first syncs, on request,
+      and when the last full sync is older than BGG_FULL_SYNC_DAYS (default 7)
+
+    Either way, items are compared against the stored hashes in memory so only
+    added or changed items continue down the pipeline. Removed items only
+    drop out of the hash set (and, given `collection_id`, out of that
+    collection): games and placements are local data and are never deleted
+    by a sync
+
+    `key` is the collection's `sync_key`. Given `collection_id`, `commit()`
+    also records the added and changed items as owned by that collection
+
+    Usage: construct, `filter()` the item stream, then `commit()` after the
+    upsert succeeded (hashes are only trusted once the data is stored)
+    """
+
+    def __init__(self, db: Session, key: str, *, full: bool = False, collection_id: int | None = None) -> None:
+        self.db = db
+        self.key = key.strip().lower()
+        self.collection_id = collection_id
+        self._now = _utcnow()
+
+        cursor = db.get(SyncCursor, self.key)
+        full_every = timedelta(days=float(os.getenv("BGG_FULL_SYNC_DAYS", "7")))
+        if (
+            full
+            or cursor is None
+            or cursor.last_full_sync_at is None
+            or cursor.last_full_sync_at < self._now - full_every
+        ):
+            self.delta = SyncDelta(mode="full")
+        else:
+            since = (cursor.last_synced_at - _MODIFIED_SINCE_MARGIN).replace(hour=0, minute=0, second=0, microsecond=0)
+            self.delta = SyncDelta(mode="incremental", modified_since=since)
+
+        self._stored: dict[int, str] = {
+            bgg_id: digest
+            for bgg_id, digest in db.execute(
+                select(SyncItemHash.bgg_id, SyncItemHash.content_hash).where(
+                    SyncItemHash.username == self.key
+                )
+            )
+        }
+        self._seen: set[int] = set()
+        self._new_hashes: dict[int, str] = {}
+
+    @property
+    def modified_since(self) -> datetime | None:
+        return self.delta.modified_since
+
+    def filter(self, items: Iterable[BggCollectionItem]) -> Iterator[BggCollectionItem]:
+        """Yield only items that are new or changed since the last sync"""
+        for item in items:
+            if item.bgg_id in self._seen:  # BGG lists each owned copy separately
+                continue
+            self._seen.add(item.bgg_id)
+
+            digest = content_hash(item)
+            previous = self._stored.get(item.bgg_id)
+            if previous == digest:
+                self.delta.unchanged += 1
+                continue
+            if previous is None:
+                self.delta.added += 1
+            else:
+                self.delta.changed += 1
+            self._new_hashes[item.bgg_id] = digest
+            yield item
+
+    def commit(self) -> SyncDelta:
+        """Persist new hashes and the cursor; call once the upsert has committed"""
+        cursor = self.db.get(SyncCursor, self.key)
+        if cursor is None:
+            cursor = SyncCursor(username=self.key)
+            self.db.add(cursor)
+        cursor.last_synced_at = self._now
+        if self.delta.mode == "full":
+            cursor.last_full_sync_at = self._now
+        self.db.flush()
+
+        if self._new_hashes:
+            stmt = _upsert_insert(self.db, SyncItemHash)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SyncItemHash.username, SyncItemHash.bgg_id],
+                set_={"content_hash": stmt.excluded.content_hash},
+            )
+            self.db.execute(
+                stmt,
+                [{"username": self.key, "bgg_id": k, "content_hash": v} for k, v in self._new_hashes.items()],
+            )
+
+        if self.delta.mode == "full":
+            removed = [bgg_id for bgg_id in self._stored if bgg_id not in self._seen]
+            for i in range(0, len(removed), UPSERT_CHUNK_SIZE):
+                self.db.execute(
+                    delete(SyncItemHash).where(
+                        SyncItemHash.username == self.key,
+                        SyncItemHash.bgg_id.in_(removed[i : i + UPSERT_CHUNK_SIZE]),
+                    )
+                )
+            self.delta.removed = len(removed)
+        else:
+            removed = []
+
+        if self.collection_id is not None:
+            self._record_ownership(list(self._new_hashes), removed)
+
+        self.db.commit()
+        return self.delta
+
+    def _record_ownership(self, owned: list[int], removed: list[int]) -> None:
+        cid = self.collection_id
+        for i in range(0, len(owned), UPSERT_CHUNK_SIZE):
+            games = select(literal(cid), Game.id).where(Game.bgg_id.in_(owned[i : i + UPSERT_CHUNK_SIZE]))
+            self.db.execute(
+                _upsert_insert(self.db, CollectionGame)
+                .from_select([CollectionGame.collection_id, CollectionGame.game_id], games)
+                .on_conflict_do_nothing()
+            )
+        for i in range(0, len(removed), UPSERT_CHUNK_SIZE):
+            games = select(Game.id).where(Game.bgg_id.in_(removed[i : i + UPSERT_CHUNK_SIZE]))
+            self.db.execute(
+                delete(CollectionGame).where(
+                    CollectionGame.collection_id == cid, CollectionGame.game_id.in_(games)
+                )
+            )
@@ -0,0 +1,45 @@
+#apps/api/app/services/fast_json.py
+"""
+JSON encoding for hot read paths
+
+Handlers on these paths build plain dicts/lists straight from SQLAlchemy
+Core rows and encode them once, instead of constructing Pydantic models that
+FastAPI then validates and serializes again. Output is compact UTF-8 JSON,
+byte-identical between the two encoders:
+- orjson when installed (several times faster)
+- the stdlib `json` module otherwise
+
+The shapes must match schemas.py; tests/test_json_contract.py checks them
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Sequence
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def rows_to_json(rows: Iterable[Sequence], keys: Sequence[str]) -> bytes:
+    """Rows -> JSON array of objects with `keys` (extra trailing columns are ignored)"""
+    return dumps([dict(zip(keys, row)) for row in rows])
+
+
+class FastJSONResponse(Response):
+    """A JSON response whose content is already-encoded bytes, or encoded with `dumps`"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
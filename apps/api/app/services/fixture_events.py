@@ -0,0 +1,172 @@
+#apps/api/app/services/fixture_events.py
+"""
+In-process change feed for fixtures (GET /api/fixtures/{id}/events)
+
+Placement writes publish a small diff after they commit:
+
+    {"fixture_id": 1, "version": 7, "changes": [{"slot": "r0c0", "game_id": 3}]}
+
+`game_id: null` means the slot was emptied. Each event is encoded to SSE
+bytes once per publish, and handed to every subscriber's queue with one
+`call_soon_threadsafe` per event loop, so a commit costs the same whatever
+the number of listeners, and no listener touches the database
+
+When a sync changes a placed game's metadata, its slot is announced again
+with the same `game_id`: re-fetch what is shown for it
+
+Subscribers that fall too far behind are sent `reset` and disconnected; the
+client should re-fetch the grid. A gap in `version`s means the same thing
+
+In-process listeners (`add_listener`) are also handed each diff, on the
+writer's thread, e.g. to rebuild grid sprites or patch the read model
+
+Only processes sharing this broker see each other's writes; running several
+API workers needs an external broker (Redis, Postgres LISTEN/NOTIFY)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable
+
+SlotChange = tuple[str, "int | None"]  # (slot, game_id or None when emptied)
+
+# listener(fixture_id, version, changes)
+Listener = Callable[[int, int, "list[SlotChange]"], None]
+
+
+def sse(event: str, data: dict, *, event_id: int | None = None) -> bytes:
+    """One server-sent event, encoded"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+RESET = sse("reset", {"reason": "re-fetch the grid"})
+
+
+class Subscription:
+    """One listener's queue; iterate with `get()` on the loop that created it"""
+
+    def __init__(self, broker: FixtureEvents, fixture_id: int, max_queue: int) -> None:
+        self.fixture_id = fixture_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+        self._broker = broker
+
+    async def get(self, timeout: float | None = None) -> bytes | None:
+        """Next encoded event, or None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _deliver(self, message: bytes) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._reset()
+
+    def _reset(self) -> None:
+        # Drop the backlog; the client has to re-fetch anyway
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESET)
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+        self._broker._unsubscribe(self)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _fan_out(subscriptions: list[Subscription], message: bytes) -> None:
+    for sub in subscriptions:
+        sub._deliver(message)
+
+
+class FixtureEvents:
+    def __init__(self, max_queue: int = 64) -> None:
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self._listeners: list[Listener] = []
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call `listener(fixture_id, version, changes)` after each publish; see Listener"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, fixture_id: int, version: int, changes: list[SlotChange]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(fixture_id, version, changes)
+
+    def subscribe(self, fixture_id: int) -> Subscription:
+        """Listen to a fixture; call from the event loop that will read it"""
+        sub = Subscription(self, fixture_id, self.max_queue)
+        with self._lock:
+            self._subscriptions[fixture_id].add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscriptions.get(sub.fixture_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscriptions[sub.fixture_id]
+
+    def subscriber_count(self, fixture_id: int | None = None) -> int:
+        with self._lock:
+            if fixture_id is not None:
+                return len(self._subscriptions.get(fixture_id, ()))
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    def _by_loop(self, fixture_ids: Iterable[int]) -> dict[asyncio.AbstractEventLoop, list[Subscription]]:
+        with self._lock:
+            by_loop: dict[asyncio.AbstractEventLoop, list[Subscription]] = defaultdict(list)
+            for fixture_id in fixture_ids:
+                for sub in self._subscriptions.get(fixture_id, ()):
+                    by_loop[sub.loop].append(sub)
+        return by_loop
+
+    def publish(self, fixture_id: int, version: int, changes: Iterable[SlotChange]) -> None:
+        """Announce a committed placement change; safe from any thread"""
+        changes = list(changes)
+        self._notify(fixture_id, version, changes)
+        by_loop = self._by_loop([fixture_id])
+        if not by_loop:
+            return
+        message = sse(
+            "placements",
+            {
+                "fixture_id": fixture_id,
+                "version": version,
+                "changes": [{"slot": slot, "game_id": game_id} for slot, game_id in changes],
+            },
+            event_id=version,
+        )
+        for loop, subs in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_fan_out, subs, message)
+            except RuntimeError:  # loop already closed; its listeners are gone
+                pass
+
+
+fixture_events = FixtureEvents(max_queue=int(os.getenv("API_EVENTS_QUEUE_SIZE", "64")))
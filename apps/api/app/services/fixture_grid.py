@@ -0,0 +1,191 @@
+#apps/api/app/services/fixture_grid.py
+"""
+Fixture grid rendering and caching
+
+The grid is the hottest read in the app (every page load, every edit), so:
+- One joined query fetches the fixture, its placements and their games
+- Placements land in their cell by arithmetic on (row, col); slot names
+  ("r0c0", ...) are precomputed once per fixture shape
+- Rendered grids are cached as JSON bytes, keyed by fixture id and the
+  fixture's version column (see services/fixture_versions.py)
+
+Keying on the database version means a cache hit costs one primary-key
+lookup, and every process sharing the database agrees on what is stale. A
+render is stored under the version it read in the same query, so a write
+racing a render can never leave new content under an old key or vice versa
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Fixture, Game, Placement
+from app.services.fast_json import dumps
+from app.services.slots import slot_names
+
+
+GridKey = tuple[int, int]  # (fixture_id, fixture version)
+
+
+class GridCache:
+    """Bounded LRU of rendered grids (JSON bytes)"""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[GridKey, bytes] = OrderedDict()
+
+    def get(self, key: GridKey) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: GridKey, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+grid_cache = GridCache(max_entries=int(os.getenv("API_GRID_CACHE_SIZE", "256")))
+
+
+class FixtureShapes:
+    """
+    (rows, cols) per fixture id, for bounds checks without a query
+
+    Fixture shapes and owners never change once created, so entries never
+    go stale
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._shapes: dict[int, tuple[int, int]] = {}
+        self._owners: dict[int, int] = {}
+
+    def get_many(
+        self, db: Session, fixture_ids: Iterable[int], *, user_id: int | None = None
+    ) -> dict[int, tuple[int, int]]:
+        """
+        Shapes of the fixtures that exist, loading unknown ids in one query
+
+        With `user_id`, other users' fixtures are left out as if missing
+        """
+        wanted = set(fixture_ids)
+        with self._lock:
+            found = {fid: self._shapes[fid] for fid in wanted if fid in self._shapes}
+        missing = wanted - found.keys()
+        if missing:
+            rows = db.execute(
+                select(Fixture.id, Fixture.user_id, Fixture.rows, Fixture.cols).where(Fixture.id.in_(missing))
+            ).all()
+            loaded = {fid: (n_rows, n_cols) for fid, _, n_rows, n_cols in rows}
+            with self._lock:
+                self._shapes.update(loaded)
+                self._owners.update((fid, owner) for fid, owner, _, _ in rows)
+            found.update(loaded)
+        if user_id is not None:
+            with self._lock:
+                found = {fid: shape for fid, shape in found.items() if self._owners.get(fid) == user_id}
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self._owners.clear()
+
+
+fixture_shapes = FixtureShapes()
+
+
+_GAME_COLUMNS = (
+    Game.id,
+    Game.bgg_id,
+    Game.name,
+    Game.year_published,
+    Game.thumbnail_url,
+    Game.image_url,
+)
+GAME_KEYS = ("id", "bgg_id", "name", "year_published", "thumbnail_url", "image_url")
+
+
+def grid_body(fixture: tuple, games: list[dict | None]) -> bytes:
+    """
+    FixtureGridOut JSON from (id, name, rows, cols, version) and the game
+    dict (GAME_KEYS) or None in each cell, row-major
+    """
+    fid, name, n_rows, n_cols, version = fixture
+    payload = {
+        "fixture": {"id": fid, "name": name, "rows": n_rows, "cols": n_cols, "version": version},
+        "cells": [{"slot": slot, "game": game} for slot, game in zip(slot_names(n_rows, n_cols), games)],
+    }
+    return dumps(payload)
+
+
+def render_grid(db: Session, fixture_id: int) -> tuple[bytes, int] | None:
+    """
+    Build the FixtureGridOut JSON for a fixture in one query
+
+    Returns (body, fixture version), or None when the fixture does not
+    exist. Output matches schemas.FixtureGridOut field for field
+    """
+    rows = db.execute(
+        select(
+            Fixture.id,
+            Fixture.name,
+            Fixture.rows,
+            Fixture.cols,
+            Fixture.version,
+            Placement.row,
+            Placement.col,
+            *_GAME_COLUMNS,
+        )
+        .select_from(Fixture)
+        .outerjoin(Placement, Placement.fixture_id == Fixture.id)
+        .outerjoin(Game, Game.id == Placement.game_id)
+        .where(Fixture.id == fixture_id)
+    ).all()
+    if not rows:
+        return None
+
+    n_rows, n_cols, version = rows[0][2:5]
+    games: list[dict | None] = [None] * (n_rows * n_cols)
+    for row in rows:
+        r, c, game = row[5], row[6], row[7:]
+        # The database keeps cells within bounds
+        if r is not None and game[0] is not None:
+            games[r * n_cols + c] = dict(zip(GAME_KEYS, game))
+    return grid_body(tuple(rows[0][:5]), games), version
+
+
+def get_grid_json(db: Session, fixture_id: int, version: int | None = None) -> tuple[bytes, int] | None:
+    """
+    Cached `render_grid`: (body, fixture version), or None if no such fixture
+
+    Pass `version` when the caller already looked it up
+    """
+    if version is None:
+        version = db.scalar(select(Fixture.version).where(Fixture.id == fixture_id))
+        if version is None:
+            return None
+    body = grid_cache.get((fixture_id, version))
+    if body is not None:
+        return body, version
+
+    rendered = render_grid(db, fixture_id)
+    if rendered is not None:
+        grid_cache.put((fixture_id, rendered[1]), rendered[0])
+    return rendered
@@ -0,0 +1,108 @@
+#apps/api/app/services/fixture_versions.py
+"""
+Per-fixture version counters (optimistic concurrency)
+
+Every placement write bumps `fixtures.version` for each fixture it changes,
+in the same transaction as the write. Clients send back the version they
+last saw (If-Match or `expected_version`); the bump is then a conditional
+UPDATE, so of two concurrent writers exactly one wins and the other gets a
+409 instead of silently overwriting
+
+The version doubles as the grid's ETag and cache key
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models import Fixture
+
+
+class VersionConflict(Exception):
+    def __init__(self, fixture_id: int, expected: int, current: int | None) -> None:
+        super().__init__(f"fixture {fixture_id} is at version {current}, not {expected}")
+        self.fixture_id = fixture_id
+        self.expected = expected
+        self.current = current
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(header: str | None) -> int | None:
+    """`"3"` / `W/"3"` -> 3; None when absent. Raises ValueError otherwise"""
+    if header is None:
+        return None
+    value = header.strip().removeprefix("W/").strip('"')
+    if not value.isdigit():
+        raise ValueError("If-Match must be a fixture version ETag, e.g. \"3\"")
+    return int(value)
+
+
+def etag_matches(if_none_match: str | None, version: int) -> bool:
+    """Does an If-None-Match header name this version (or `*`)?"""
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag(version) in tags
+
+
+def check_versions(db: Session, expected: Mapping[int, int]) -> None:
+    """Raise VersionConflict unless every fixture is at its expected version"""
+    if not expected:
+        return
+    current = dict(
+        db.execute(select(Fixture.id, Fixture.version).where(Fixture.id.in_(expected.keys()))).tuples().all()
+    )
+    for fixture_id, version in expected.items():
+        if current.get(fixture_id) != version:
+            raise VersionConflict(fixture_id, version, current.get(fixture_id))
+
+
+def bump_versions(
+    db: Session,
+    fixture_ids: Iterable[int],
+    *,
+    expected: Mapping[int, int] | None = None,
+) -> dict[int, int]:
+    """
+    Increment the version of each fixture; returns {fixture_id: new version}
+
+    Fixtures listed in `expected` are bumped only if still at that version,
+    else VersionConflict is raised (the caller rolls back); listed fixtures
+    that are not being bumped are just checked. Does not commit
+    """
+    expected = expected or {}
+    ids = set(fixture_ids)
+    check_versions(db, {fid: v for fid, v in expected.items() if fid not in ids})
+    versions: dict[int, int] = {}
+
+    for fixture_id, version in expected.items():
+        if fixture_id not in ids:
+            continue
+        new = db.execute(
+            update(Fixture)
+            .where(Fixture.id == fixture_id, Fixture.version == version)
+            .values(version=Fixture.version + 1)
+            .returning(Fixture.version)
+        ).scalar()
+        if new is None:
+            current = db.scalar(select(Fixture.version).where(Fixture.id == fixture_id))
+            raise VersionConflict(fixture_id, version, current)
+        versions[fixture_id] = new
+
+    rest = ids - versions.keys()
+    if rest:
+        versions.update(
+            db.execute(
+                update(Fixture)
+                .where(Fixture.id.in_(rest))
+                .values(version=Fixture.version + 1)
+                .returning(Fixture.id, Fixture.version)
+            ).tuples().all()
+        )
+    return versions
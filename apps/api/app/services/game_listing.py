@@ -0,0 +1,177 @@
+#apps/api/app/services/game_listing.py
+"""
+GET /api/games listing: keyset pagination, field projection, streaming
+
+- Pages are keyset-paginated on (name, id), or (match bucket, name, id) for
+  searches, so page N costs the same as page 1: no OFFSET, no COUNT
+- The cursor is opaque to clients: base64url of the last row's sort key
+- `fields` selects a subset of GameWithPlacementOut columns (id is always
+  included); only those columns are read from the database
+- Rows are encoded straight from Core rows into JSON chunks; nothing builds
+  the full list of Pydantic models
+- Listings are per user: only games in their collections, with their own
+  placement (see services/users.py). They walk the user's owned_games rows
+  in (name, game id) order, so page 1 reads `limit + 1` index entries
+  however large the collection. Searches match names through the trigram
+  index where the backend has one (services/game_search.py), then keep the
+  user's games, ranked by match bucket and bm25
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from itertools import islice
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import Select, and_, select, tuple_
+from sqlalchemy.orm import sessionmaker
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Game, OwnedGame, Placement
+from app.services.fast_json import rows_to_json
+from app.services.game_search import filter_by_name
+
+# Same names and order as schemas.GameWithPlacementOut
+GAME_FIELDS = {
+    "id": Game.id,
+    "bgg_id": Game.bgg_id,
+    "name": Game.name,
+    "year_published": Game.year_published,
+    "thumbnail_url": Game.thumbnail_url,
+    "image_url": Game.image_url,
+    "fixture_id": Placement.fixture_id,
+    "slot": Placement.slot,
+}
+
+MAX_PAGE_SIZE = 500
+
+# Rows per streamed chunk
+_CHUNK_ROWS = 256
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """`"name,slot"` -> ("id", "name", "slot"); None/empty -> every field"""
+    if not fields:
+        return tuple(GAME_FIELDS)
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - GAME_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(name for name in GAME_FIELDS if name == "id" or name in wanted)
+
+
+def encode_cursor(key: Iterable[Any]) -> str:
+    raw = json.dumps(list(key), separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def listing_query(
+    fields: tuple[str, ...],
+    *,
+    user_id: int,
+    q: str | None = None,
+    use_fts: bool = False,
+    after: list | None = None,
+    limit: int | None = None,
+) -> Select:
+    """
+    Select `fields` (plus the sort key, as trailing columns) for one page
+
+    Fetches `limit + 1` rows so the caller can tell whether another page
+    follows. Searches order by match bucket (name prefix, word prefix,
+    substring), then with `use_fts` (see game_search.fts_supported) by bm25,
+    then name
+    """
+    stmt = (
+        select(*(GAME_FIELDS[f] for f in fields))
+        .select_from(OwnedGame)
+        .join(Game, Game.id == OwnedGame.game_id)
+        .outerjoin(Placement, and_(Placement.user_id == user_id, Placement.game_id == Game.id))
+        .where(OwnedGame.user_id == user_id)
+    )
+    ordering: list = []
+    if q:
+        stmt, ordering = filter_by_name(stmt, q, use_fts=use_fts)
+
+    # owned_games.name is a copy of games.name: same order, same cursors
+    if limit is None:
+        return stmt.order_by(*ordering, OwnedGame.name, OwnedGame.game_id)
+
+    key = [*ordering, OwnedGame.name, OwnedGame.game_id]
+    if after is not None:
+        if len(after) != len(key):
+            raise ValueError("Invalid cursor")
+        stmt = stmt.where(tuple_(*key) > tuple_(*after))
+    return (
+        stmt.add_columns(*(k.label(f"_key{i}") for i, k in enumerate(key)))
+        .order_by(*key)
+        .limit(limit + 1)
+    )
+
+
+def next_cursor(rows: list, fields: tuple[str, ...], limit: int) -> str | None:
+    """Cursor for the page after `rows` (a `listing_query` result), if any"""
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(rows[limit - 1][len(fields):])
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def encode_rows(rows: Iterable, fields: tuple[str, ...]) -> bytes:
+    """Rows as comma-separated JSON objects (a slice of an array body)"""
+    return rows_to_json(rows, fields)[1:-1]
+
+
+def iter_json(rows: Iterable, fields: tuple[str, ...]) -> Iterator[bytes]:
+    """Encode rows as a JSON array of objects, in chunks"""
+    yield b"["
+    sep = b""
+    for chunk in _batched(rows, _CHUNK_ROWS):
+        yield sep + encode_rows(chunk, fields)
+        sep = b","
+    yield b"]"
+
+
+def stream_all(session_factory: sessionmaker, stmt: Select, fields: tuple[str, ...]) -> Iterator[bytes]:
+    """
+    `iter_json` over an unpaginated listing, fetching rows as it goes
+
+    Opens its own session: request-scoped ones are closed before a streamed
+    body is sent
+    """
+    with session_factory() as db:
+        rows = db.execute(stmt.execution_options(yield_per=_CHUNK_ROWS))
+        yield from iter_json(rows, fields)
+
+
+async def astream_all(
+    session_factory: async_sessionmaker, stmt: Select, fields: tuple[str, ...]
+) -> AsyncIterator[bytes]:
+    """`stream_all` on an async session"""
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        yield b"["
+        sep = b""
+        async for rows in result.partitions(_CHUNK_ROWS):
+            yield sep + encode_rows(rows, fields)
+            sep = b","
+        yield b"]"
@@ -0,0 +1,172 @@
+#apps/api/app/services/game_search.py
+"""
+Game name search backed by an SQLite FTS5 index
+
+`games_fts` is an external-content FTS5 table over games.name using the
+trigram tokenizer, kept in sync by triggers on `games`. Trigrams let any
+substring of 3+ characters use the index, so partial words ("wond") match
+without a full table scan
+
+Query syntax accepted by `apply_name_search`:
+- words are ANDed: "potter hogwarts" matches "Harry Potter: Hogwarts Battle"
+- a trailing * asks for a word prefix: "wing*" matches "Wingspan", not "Blue Wings"
+- words shorter than 3 characters cannot use trigrams; they are applied as
+  LIKE filters on top (or alone, if the query has no longer word)
+
+Results are ordered by relevance: names starting with the first word, then
+names with a word starting with it, then bm25, then name
+
+Backends without FTS5 trigram support (SQLite < 3.34, other dialects) fall
+back to the plain case-insensitive LIKE path
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+from sqlalchemy import DDL, case, column, event, func, literal_column, or_, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Query
+
+from app.models import Game
+
+FTS_TABLE = "games_fts"
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(name, content='games', content_rowid='id', tokenize='trigram')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_ai AFTER INSERT ON games BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_ad AFTER DELETE ON games BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_au AFTER UPDATE OF name ON games BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+)
+
+# Trigram tokenizer shipped in SQLite 3.34
+_MIN_SQLITE = (3, 34, 0)
+
+
+def fts_supported(bind: Engine | Connection) -> bool:
+    return bind.dialect.name == "sqlite" and sqlite3.sqlite_version_info >= _MIN_SQLITE
+
+
+def _create_index(target, connection: Connection, **kw) -> None:
+    if fts_supported(connection):
+        for stmt in _CREATE_STATEMENTS:
+            connection.execute(DDL(stmt))
+
+
+def _drop_index(target, connection: Connection, **kw) -> None:
+    if fts_supported(connection):
+        connection.execute(DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+# Created/dropped alongside the games table (create_all / drop_all)
+event.listen(Game.__table__, "after_create", _create_index)
+event.listen(Game.__table__, "before_drop", _drop_index)
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """
+    Add the FTS index to a database created before it existed
+
+    Safe to run on every startup: it only (re)builds when the index is missing
+    """
+    if not fts_supported(engine):
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        if exists:
+            return
+        _create_index(None, conn)
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _like_pattern(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def filter_by_name(stmt, q: str, *, use_fts: bool) -> tuple[Any, list]:
+    """
+    Apply a name search to a statement or query over `Game`
+
+    Works on ORM queries and Core selects alike. Returns the filtered
+    statement and its relevance ordering, best first: a match bucket (name
+    starts with the first word / a word does / elsewhere) then, with FTS,
+    bm25. The ordering is empty when `q` holds no words
+    """
+    words = [w for w in q.split() if w.strip("*")]
+    if not words:
+        return stmt, []
+
+    fts_terms: list[str] = []
+    for word in words:
+        prefix = word.endswith("*")
+        term = word.rstrip("*")
+        pattern = _like_pattern(term)
+
+        if prefix:
+            stmt = stmt.filter(
+                or_(
+                    Game.name.ilike(f"{pattern}%", escape="\\"),
+                    Game.name.ilike(f"% {pattern}%", escape="\\"),
+                )
+            )
+        elif not use_fts or len(term) < 3:
+            stmt = stmt.filter(Game.name.ilike(f"%{pattern}%", escape="\\"))
+
+        if use_fts and len(term) >= 3:
+            fts_terms.append(_fts_phrase(term))
+
+    first = _like_pattern(words[0].rstrip("*"))
+    ordering = [
+        case(
+            (Game.name.ilike(f"{first}%", escape="\\"), 0),
+            (Game.name.ilike(f"% {first}%", escape="\\"), 1),
+            else_=2,
+        )
+    ]
+
+    if fts_terms:
+        match_target = literal_column(FTS_TABLE)
+        stmt = stmt.join(_fts, _fts.c.rowid == Game.id).filter(
+            match_target.op("MATCH")(" ".join(fts_terms))
+        )
+        ordering.append(func.bm25(match_target))
+
+    return stmt, ordering
+
+
+def apply_name_search(qry: Query, q: str, *, use_fts: bool | None = None) -> Query:
+    """
+    Filter and order a query over `Game` by a name search
+
+    `use_fts=None` picks FTS when the session's backend supports it
+    """
+    if use_fts is None:
+        use_fts = fts_supported(qry.session.get_bind())
+    qry, ordering = filter_by_name(qry, q, use_fts=use_fts)
+    return qry.order_by(*ordering, Game.name.asc())
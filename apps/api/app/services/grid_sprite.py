@@ -0,0 +1,232 @@
+"""
+Grid sprites: every thumbnail in a fixture packed into one image
+
+A 50x50 grid would otherwise cost the browser 2,500 image requests. The
+sprite is one JPEG of `thumb`-size tiles (see services/image_cache.py), in
+row-major slot order, plus an offset map keyed by slot:
+
+    {"fixture_id": 1, "version": 7, "tile": 96, "width": 480, "height": 192,
+     "slots": {"r0c0": [x, y, w, h], ...}}
+
+Slots that are empty, or whose game has no image, are left out of the map
+
+Sprites are cached in memory under the fixture version they were built
+from (one per fixture, LRU, capped in bytes). Placement writes publish to
+the fixture event broker; a fixture whose sprite is cached gets it rebuilt
+on a background worker right away, so the next load rarely waits
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Fixture, Game, Placement
+from app.services.fast_json import dumps
+from app.services.fixture_events import fixture_events
+from app.services.image_cache import SIZES, ImageCache, ImageFetchError, source_url
+from app.services.slots import format_slot
+
+try:  # optional dependency
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
+TILE_SIZE = "thumb"
+
+# A build waits this long for all its thumbnails, then packs whatever arrived
+_BUILD_TIMEOUT = 60.0
+
+
+def sprites_available() -> bool:
+    """Packing needs Pillow"""
+    return Image is not None
+
+
+@dataclass(frozen=True)
+class SpriteEntry:
+    fixture_id: int
+    version: int
+    image: bytes  # JPEG
+    offsets: bytes  # the JSON offset map
+    # How it was built, so a background rebuild can do the same
+    session_factory: sessionmaker
+    images: ImageCache
+
+    @property
+    def size(self) -> int:
+        return len(self.image) + len(self.offsets)
+
+
+def build_sprite(session_factory: sessionmaker, images: ImageCache, fixture_id: int) -> SpriteEntry | None:
+    """Pack the fixture's current thumbnails; None if there is no such fixture"""
+    with session_factory() as db:
+        rows = db.execute(
+            select(Fixture.version, Placement.row, Placement.col, Game.thumbnail_url, Game.image_url)
+            .select_from(Fixture)
+            .outerjoin(Placement, Placement.fixture_id == Fixture.id)
+            .outerjoin(Game, Game.id == Placement.game_id)
+            .where(Fixture.id == fixture_id)
+        ).all()
+    if not rows:
+        return None
+
+    version = rows[0][0]
+    placed = sorted(
+        (r, c, url)
+        for _, r, c, *urls in rows
+        if r is not None and (url := source_url(TILE_SIZE, *urls)) is not None
+    )
+    # Queue every download/resize first so the image pool works on them together
+    images.prefetch({url for _, _, url in placed}, TILE_SIZE)
+
+    tile = SIZES[TILE_SIZE]
+    per_row = max(1, math.ceil(math.sqrt(len(placed))))
+    sheet = Image.new("RGB", (per_row * tile, max(1, math.ceil(len(placed) / per_row)) * tile), "white")
+    offsets: dict[str, list[int]] = {}
+    deadline = time.monotonic() + _BUILD_TIMEOUT
+    for r, c, url in placed:
+        try:
+            entry = images.get(url, TILE_SIZE, timeout=max(0.0, deadline - time.monotonic()))
+            with Image.open(io.BytesIO(images.read(entry))) as thumb:
+                thumb.thumbnail((tile, tile))
+                n = len(offsets)
+                x, y = (n % per_row) * tile, (n // per_row) * tile
+                sheet.paste(thumb.convert("RGB"), (x, y))
+                offsets[format_slot(r, c)] = [x, y, thumb.width, thumb.height]
+        except (ImageFetchError, OSError, TimeoutError):
+            continue  # a missing image leaves the slot out of the map
+
+    out = io.BytesIO()
+    sheet.save(out, "JPEG", quality=85, optimize=True)
+    offset_map = {
+        "fixture_id": fixture_id,
+        "version": version,
+        "tile": tile,
+        "width": sheet.width,
+        "height": sheet.height,
+        "slots": offsets,
+    }
+    return SpriteEntry(fixture_id, version, out.getvalue(), dumps(offset_map), session_factory, images)
+
+
+class GridSprites:
+    """Latest sprite per fixture (LRU, capped in bytes) and the worker that builds them"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, workers: int = 1) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, SpriteEntry] = OrderedDict()
+        self._total = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprite")
+        self._jobs: dict[int, Future] = {}
+        self._rebuild: set[int] = set()
+
+    def get(
+        self,
+        session_factory: sessionmaker,
+        images: ImageCache,
+        fixture_id: int,
+        version: int,
+        *,
+        timeout: float | None = None,
+    ) -> SpriteEntry | None:
+        """
+        A sprite at least as new as `version`, building it if needed (blocks)
+
+        None when the fixture does not exist. Raises TimeoutError if the build
+        takes longer than `timeout` seconds; it keeps running and is cached
+        """
+        entry = self._cached(fixture_id)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # A build that started before the caller's write comes back too old; wait for the next
+        for _ in range(3):
+            if entry is not None and entry.version >= version:
+                return entry
+            job = self._submit(fixture_id, session_factory, images, rebuild=False)
+            entry = job.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if entry is None:
+                return None
+        return entry
+
+    def changed(self, fixture_id: int, version: int | None = None, changes=()) -> None:
+        """Fixture event listener: rebuild the fixture's sprite if one is cached"""
+        with self._lock:
+            entry = self._entries.get(fixture_id)
+        if entry is not None:
+            self._submit(entry.fixture_id, entry.session_factory, entry.images)
+
+    def wait(self) -> None:
+        """Block until no build is queued or running"""
+        while True:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            if not jobs:
+                return
+            for job in jobs:
+                job.exception()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+    # -- internals -----------------------------------------------------------
+
+    def _cached(self, fixture_id: int) -> SpriteEntry | None:
+        with self._lock:
+            entry = self._entries.get(fixture_id)
+            if entry is not None:
+                self._entries.move_to_end(fixture_id)
+            return entry
+
+    def _submit(
+        self, fixture_id: int, session_factory: sessionmaker, images: ImageCache, *, rebuild: bool = True
+    ) -> Future:
+        with self._lock:
+            job = self._jobs.get(fixture_id)
+            if job is None:
+                job = self._jobs[fixture_id] = self._pool.submit(self._run, fixture_id, session_factory, images)
+            elif rebuild:
+                # The running build may have read the fixture before this change
+                self._rebuild.add(fixture_id)
+            return job
+
+    def _run(self, fixture_id: int, session_factory: sessionmaker, images: ImageCache) -> SpriteEntry | None:
+        try:
+            entry = build_sprite(session_factory, images, fixture_id)
+            if entry is not None:
+                self._put(entry)
+            return entry
+        finally:
+            with self._lock:
+                del self._jobs[fixture_id]
+                again = fixture_id in self._rebuild
+                self._rebuild.discard(fixture_id)
+            if again:
+                self._submit(fixture_id, session_factory, images)
+
+    def _put(self, entry: SpriteEntry) -> None:
+        with self._lock:
+            old = self._entries.get(entry.fixture_id)
+            if old is not None and old.version > entry.version:
+                return
+            self._total += entry.size - (old.size if old is not None else 0)
+            self._entries[entry.fixture_id] = entry
+            self._entries.move_to_end(entry.fixture_id)
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= evicted.size
+
+
+grid_sprites = GridSprites(max_bytes=int(float(os.getenv("API_SPRITE_CACHE_MB", "64")) * 1024 * 1024))
+fixture_events.add_listener(grid_sprites.changed)
@@ -0,0 +1,377 @@
+"""
+Box art served from our own disk, resized for the grid
+
+`Game.thumbnail_url` / `image_url` point at BGG's CDN; a big grid would make
+every browser fetch full-size art from far away. Instead, each source image
+is downloaded once (lazily, or ahead of time after a sync) and every size the
+UI asks for is cut from that copy once
+
+Layout under the store root (default: $API_DATA_DIR/image-cache):
+- index.sqlite: one row per (source url, size) -> content digest
+- ab/abcdef....jpg: image bytes, named by their sha256 (content-addressed, so
+  a variant that comes out identical to its original shares its file)
+
+Downloads and resizes run on a small bounded pool; concurrent requests for
+the same variant wait on one job. The total size of stored files (each
+counted once, however many variants share it) is capped, and the least
+recently used files are evicted first, with every variant pointing at them
+
+Pillow is optional: without it every size is the original image
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+import httpx
+
+try:  # optional dependency
+    from PIL import Image, UnidentifiedImageError
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
+# Longest edge in pixels, by the names `?size=` accepts; None = as downloaded
+SIZES: dict[str, int | None] = {
+    "thumb": 96,
+    "small": 200,
+    "medium": 400,
+    "large": 800,
+    "original": None,
+}
+DEFAULT_SIZE = "small"
+
+# BGG's thumbnails are about 200px; anything bigger is cut from the full image
+_THUMBNAIL_MAX_EDGE = 200
+
+# Downloads larger than this are refused
+MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+
+_FORMATS = {"JPEG": (".jpg", "image/jpeg"), "PNG": (".png", "image/png"), "WEBP": (".webp", "image/webp")}
+
+# The index only mirrors files on disk; losing its last writes in a crash is harmless
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = OFF;
+CREATE TABLE IF NOT EXISTS variants (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    size TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_variants_accessed_at ON variants (accessed_at);
+CREATE INDEX IF NOT EXISTS ix_variants_digest ON variants (digest);
+"""
+
+
+class ImageFetchError(RuntimeError):
+    """The source image could not be downloaded, or is not an image"""
+
+
+@dataclass
+class ImageStats:
+    hits: int = 0
+    misses: int = 0
+    downloads: int = 0
+    resizes: int = 0
+    evictions: int = 0
+    bytes_downloaded: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ImageEntry:
+    digest: str
+    path: str
+    content_type: str
+    bytes: int
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Does an If-None-Match header name this image (or `*`)?"""
+        if not if_none_match:
+            return False
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+def source_url(size: str, thumbnail_url: str | None, image_url: str | None) -> str | None:
+    """The BGG url a size is cut from: the small thumbnail when it is big enough"""
+    edge = SIZES[size]
+    if edge is not None and edge <= _THUMBNAIL_MAX_EDGE:
+        return thumbnail_url or image_url
+    return image_url or thumbnail_url
+
+
+def _key(url: str, size: str) -> str:
+    return hashlib.sha256(f"{url}#{size}".encode()).hexdigest()
+
+
+def _sniff(data: bytes, fallback: str) -> str:
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return fallback
+
+
+def resize(data: bytes, edge: int) -> tuple[bytes, str] | None:
+    """`data` scaled to fit `edge` x `edge`; None if it already fits"""
+    try:
+        img = Image.open(io.BytesIO(data))
+        # JPEG can decode straight to a nearby smaller scale, skipping most of the work
+        img.draft("RGB", (edge, edge))
+        if img.width <= edge and img.height <= edge:
+            return None
+        img.thumbnail((edge, edge), Image.LANCZOS)
+    except (UnidentifiedImageError, OSError) as exc:
+        raise ImageFetchError(f"not a readable image: {exc}") from exc
+
+    out = io.BytesIO()
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img.save(out, "PNG", optimize=True)
+        return out.getvalue(), "PNG"
+    img.convert("RGB").save(out, "JPEG", quality=85, optimize=True)
+    return out.getvalue(), "JPEG"
+
+
+class ImageCache:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+        workers: int = 2,
+        http: httpx.Client | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = ImageStats()
+
+        self._http = http or httpx.Client(timeout=20.0, follow_redirects=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image")
+        self._jobs: dict[str, Future] = {}
+        self._jobs_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False, isolation_level=None)
+        self._index.executescript(_SCHEMA)
+        # Kept in memory so a store does not re-sum the whole index
+        self._total = self._index.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM (SELECT MAX(bytes) AS bytes FROM variants GROUP BY digest)"
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+        with self._lock:
+            self._index.close()
+
+    # -- reads ---------------------------------------------------------------
+
+    def lookup(self, url: str, size: str) -> ImageEntry | None:
+        """The stored variant, if there is one (nothing is downloaded)"""
+        key = _key(url, size)
+        with self._lock:
+            row = self._index.execute(
+                "SELECT digest, path, content_type, bytes FROM variants WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._index.execute("UPDATE variants SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        if row is None or not (self.root / row[1]).exists():
+            return None
+        return ImageEntry(*row)
+
+    def get(self, url: str, size: str, *, timeout: float | None = 30.0) -> ImageEntry:
+        """The variant, downloading and resizing on the pool if needed (blocks)"""
+        entry = self.lookup(url, size)
+        if entry is not None:
+            self.stats.hits += 1
+            return entry
+        self.stats.misses += 1
+        return self._submit(url, size).result(timeout=timeout)
+
+    def read(self, entry: ImageEntry) -> bytes:
+        return (self.root / entry.path).read_bytes()
+
+    def prefetch(self, urls: Iterable[str], size: str) -> int:
+        """Queue the variant for each url not stored yet; returns how many were queued"""
+        queued = 0
+        for url in urls:
+            if self.lookup(url, size) is None:
+                self._submit(url, size)
+                queued += 1
+        return queued
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total
+
+    # -- jobs ----------------------------------------------------------------
+
+    def _submit(self, url: str, size: str) -> Future:
+        key = _key(url, size)
+        with self._jobs_lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._jobs[key] = self._pool.submit(self._run, key, url, size)
+            return job
+
+    def _run(self, key: str, url: str, size: str) -> ImageEntry:
+        try:
+            return self._make(url, size)
+        finally:
+            with self._jobs_lock:
+                self._jobs.pop(key, None)
+
+    def _make(self, url: str, size: str) -> ImageEntry:
+        entry = self.lookup(url, size)
+        if entry is not None:
+            return entry
+        original = self.lookup(url, "original") or self._download(url)
+        edge = SIZES[size]
+        resized = resize(self.read(original), edge) if edge is not None and Image is not None else None
+        if resized is None:
+            # Byte-for-byte the original: one more row, same file
+            return self._record(url, size, original)
+        self.stats.resizes += 1
+        data, fmt = resized
+        return self._store(url, size, data, *_FORMATS[fmt])
+
+    def _download(self, url: str) -> ImageEntry:
+        try:
+            with self._http.stream("GET", url) as response:
+                if response.status_code != 200:
+                    raise ImageFetchError(f"{url} answered {response.status_code}")
+                body = bytearray()
+                for chunk in response.iter_bytes():
+                    body += chunk
+                    if len(body) > MAX_DOWNLOAD_BYTES:
+                        raise ImageFetchError(f"{url} is larger than {MAX_DOWNLOAD_BYTES} bytes")
+                declared = response.headers.get("content-type", "").split(";")[0].strip()
+        except httpx.HTTPError as exc:
+            raise ImageFetchError(f"could not download {url}: {exc}") from exc
+
+        data = bytes(body)
+        content_type = _sniff(data, declared if declared.startswith("image/") else "application/octet-stream")
+        if Image is not None and content_type == "application/octet-stream":
+            raise ImageFetchError(f"{url} is not an image")
+        self.stats.downloads += 1
+        self.stats.bytes_downloaded += len(data)
+        suffix = {v[1]: v[0] for v in _FORMATS.values()}.get(content_type, "")
+        return self._store(url, "original", data, suffix, content_type)
+
+    # -- writes --------------------------------------------------------------
+
+    def _store(self, url: str, size: str, data: bytes, suffix: str, content_type: str) -> ImageEntry:
+        digest = hashlib.sha256(data).hexdigest()
+        rel = f"{digest[:2]}/{digest}{suffix}"
+        dest = self.root / rel
+        if not dest.exists():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, dest)
+        return self._record(url, size, ImageEntry(digest, rel, content_type, len(data)))
+
+    def _record(self, url: str, size: str, entry: ImageEntry) -> ImageEntry:
+        now = time.time()
+        orphan = None
+        with self._lock:
+            old = self._index.execute(
+                "SELECT digest, path, bytes FROM variants WHERE key = ?", (_key(url, size),)
+            ).fetchone()
+            # Files are shared between rows with the same content; each counts once
+            if not self._shared(entry.digest):
+                self._total += entry.bytes
+            self._index.execute(
+                "INSERT OR REPLACE INTO variants "
+                "(key, url, size, digest, path, content_type, bytes, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_key(url, size), url, size, entry.digest, entry.path, entry.content_type, entry.bytes, now, now),
+            )
+            if old is not None and old[0] != entry.digest and not self._shared(old[0]):
+                self._total -= old[2]
+                orphan = old[1]
+        if orphan is not None:
+            (self.root / orphan).unlink(missing_ok=True)
+        self._evict(keep=entry.digest)
+        return entry
+
+    def _shared(self, digest: str) -> bool:
+        """Does any variant point at this file? (caller holds the lock)"""
+        return self._index.execute("SELECT 1 FROM variants WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used files, and their variants, until we are under `max_bytes`"""
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return
+            victims = []
+            for digest, path, size in self._index.execute(
+                "SELECT digest, MAX(path), MAX(bytes) FROM variants GROUP BY digest ORDER BY MAX(accessed_at) ASC"
+            ):
+                if self._total <= self.max_bytes:
+                    break
+                if digest == keep:  # the one being served right now
+                    continue
+                victims.append((digest, path))
+                self._total -= size
+            evicted = self._index.executemany(
+                "DELETE FROM variants WHERE digest = ?", [(digest,) for digest, _ in victims]
+            ).rowcount
+        for _, path in victims:
+            (self.root / path).unlink(missing_ok=True)
+        self.stats.evictions += evicted
+
+
+_shared: ImageCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """
+    The process-wide image cache
+
+    Configured from the environment on first use:
+    - API_IMAGE_CACHE_MAX_MB (default 512)
+    - API_IMAGE_WORKERS: concurrent downloads/resizes (default 2)
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ImageCache(
+                Path(os.getenv("API_DATA_DIR", "./data")) / "image-cache",
+                max_bytes=int(float(os.getenv("API_IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024),
+                workers=int(os.getenv("API_IMAGE_WORKERS", "2")),
+            )
+        return _shared
+
+
+def shutdown_image_cache() -> None:
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+            _shared = None
@@ -0,0 +1,367 @@
+"""
+Per-route request metrics, SQL accounting and a slow-request profiler
+
+`MetricsMiddleware` times every HTTP request and, through SQLAlchemy engine
+events, counts the statements it runs and the time spent in them. Totals
+are kept per (method, route template), e.g. GET /api/fixtures/{fixture_id}/grid,
+and exposed at GET /api/metrics in Prometheus text format:
+- api_request_duration_seconds: latency histogram
+- api_requests_total: requests by status code
+- api_db_statements_total, api_db_seconds_total: SQL statements and their time
+- api_response_bytes_total: response body bytes
+- bgg_cache_hits_total, bgg_cache_misses_total, bgg_cache_bytes: the BGG
+  response cache (see bgg/cache.py), once a sync has opened it
+
+Options (read per request):
+- API_SERVER_TIMING=1 adds a Server-Timing header (db time and statement
+  count, total time) for browser dev tools. Headers leave before a streamed
+  body, so it covers the work done up to the first byte
+- API_PROFILE_SLOW_MS=N samples the stacks of the threads serving each
+  request every API_PROFILE_INTERVAL_MS (default 5) and keeps the profile
+  of requests that took N ms or more, as folded stacks for flamegraph.pl or
+  speedscope (GET /api/metrics/profiles). A request's threads are the one
+  running the middleware plus any thread that ran SQL for it, so sync
+  handlers are covered from their first query on
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.bgg.cache import ResponseCache
+
+# Prometheus' default buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests no route matched share one label, so bad URLs cannot grow the registry
+UNMATCHED = "unmatched"
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class RequestStats:
+    """What one request has cost so far"""
+
+    start: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_seconds: float = 0.0
+    response_bytes: int = 0
+    threads: set[int] = field(default_factory=set)
+    samples: Counter = field(default_factory=Counter)  # folded stack -> count
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("api_request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.threads.add(threading.get_ident())
+        conn.info.setdefault("api_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    starts = conn.info.get("api_query_start")
+    if stats is not None and starts:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - starts.pop()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    # A failed statement gets no after_cursor_execute; count it here so its
+    # start time does not linger on the pooled connection
+    stats = _current.get()
+    conn = context.connection
+    starts = conn.info.get("api_query_start") if conn is not None and context.execution_context is not None else None
+    if stats is not None and starts:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - starts.pop()
+
+
+@dataclass
+class _RouteTotals:
+    buckets: list[int] = field(default_factory=lambda: [0] * len(BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+    statements: int = 0
+    db_seconds: float = 0.0
+    response_bytes: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+
+class Metrics:
+    """Per-route totals; thread-safe"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteTotals] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            totals = self._routes.get((method, route))
+            if totals is None:
+                totals = self._routes[(method, route)] = _RouteTotals()
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    totals.buckets[i] += 1
+                    break
+            totals.count += 1
+            totals.seconds += seconds
+            totals.statements += stats.statements
+            totals.db_seconds += stats.db_seconds
+            totals.response_bytes += stats.response_bytes
+            totals.statuses[status] += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        with self._lock:
+            routes = sorted((key, _copy(totals)) for key, totals in self._routes.items())
+        lines = [
+            "# HELP api_request_duration_seconds Request latency by route",
+            "# TYPE api_request_duration_seconds histogram",
+        ]
+        for (method, route), totals in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            for bound, cumulative in zip(BUCKETS, itertools.accumulate(totals.buckets)):
+                lines.append(f'api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {totals.count}')
+            lines.append(f"api_request_duration_seconds_sum{{{labels}}} {totals.seconds:.6f}")
+            lines.append(f"api_request_duration_seconds_count{{{labels}}} {totals.count}")
+
+        counters = (
+            ("api_db_statements_total", "SQL statements run by requests, by route", lambda t: t.statements),
+            ("api_db_seconds_total", "Time spent in SQL statements, by route", lambda t: f"{t.db_seconds:.6f}"),
+            ("api_response_bytes_total", "Response body bytes, by route", lambda t: t.response_bytes),
+        )
+        lines += ["# HELP api_requests_total Requests by route and status", "# TYPE api_requests_total counter"]
+        for (method, route), totals in routes:
+            for status, n in sorted(totals.statuses.items()):
+                lines.append(f'api_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+        for name, help_text, value in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), totals in routes:
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {value(totals)}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+def _copy(totals: _RouteTotals) -> _RouteTotals:
+    return _RouteTotals(
+        list(totals.buckets),
+        totals.count,
+        totals.seconds,
+        totals.statements,
+        totals.db_seconds,
+        totals.response_bytes,
+        Counter(totals.statuses),
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_bgg_cache(cache: ResponseCache | None) -> str:
+    """The BGG response cache's counters in Prometheus text format; empty without one"""
+    if cache is None:
+        return ""
+    return (
+        "# HELP bgg_cache_hits_total BGG responses served from the cache\n"
+        "# TYPE bgg_cache_hits_total counter\n"
+        f"bgg_cache_hits_total {cache.stats.hits}\n"
+        "# HELP bgg_cache_misses_total BGG requests the cache had no entry for\n"
+        "# TYPE bgg_cache_misses_total counter\n"
+        f"bgg_cache_misses_total {cache.stats.misses}\n"
+        "# HELP bgg_cache_bytes Bytes stored in the BGG response cache\n"
+        "# TYPE bgg_cache_bytes gauge\n"
+        f"bgg_cache_bytes {cache.total_bytes()}\n"
+    )
+
+
+metrics = Metrics()
+
+
+# -----------------------------------------------------------------------------
+# Slow-request profiler
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Profile:
+    id: int
+    method: str
+    route: str
+    duration_ms: float
+    samples: Counter
+
+    def folded(self) -> str:
+        """One `frame;frame;frame count` line per distinct stack, root first"""
+        return "".join(f"{stack} {n}\n" for stack, n in self.samples.most_common())
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "route": self.route,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.samples.values()),
+        }
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _fold(frame) -> str | None:
+    """The stack under `frame` as "root;...;leaf", or None when the thread is idle"""
+    code = frame.f_code
+    if code.co_filename.endswith("selectors.py") or (code.co_name == "wait" and code.co_filename.endswith("threading.py")):
+        return None
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame).replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SlowRequestProfiler:
+    """Samples the threads of in-flight requests; keeps the last `keep` slow profiles"""
+
+    def __init__(self, keep: int = 20) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[int, RequestStats] = {}  # in flight, by id()
+        self._profiles: deque[Profile] = deque(maxlen=keep)
+        self._ids = itertools.count(1)
+        self._thread: threading.Thread | None = None
+        self._busy = threading.Event()  # set while a request is in flight
+        self.interval = 0.005
+
+    def begin(self, stats: RequestStats, interval: float) -> None:
+        stats.threads.add(threading.get_ident())
+        with self._lock:
+            self.interval = interval
+            self._requests[id(stats)] = stats
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_forever, name="api-profiler", daemon=True)
+                self._thread.start()
+
+    def end(self, stats: RequestStats, method: str, route: str, seconds: float, threshold: float) -> None:
+        with self._lock:
+            self._requests.pop(id(stats), None)
+            if not self._requests:
+                self._busy.clear()
+            if seconds >= threshold and stats.samples:
+                self._profiles.append(Profile(next(self._ids), method, route, seconds * 1000, Counter(stats.samples)))
+
+    def profiles(self) -> list[Profile]:
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, profile_id: int) -> Profile | None:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def sample(self) -> None:
+        """Record one stack per thread of each in-flight request"""
+        me = threading.get_ident()
+        frames = sys._current_frames()
+        with self._lock:
+            for stats in self._requests.values():
+                for thread_id in list(stats.threads):
+                    frame = frames.get(thread_id)
+                    if frame is None or thread_id == me:
+                        continue
+                    stack = _fold(frame)
+                    if stack is not None:
+                        stats.samples[stack] += 1
+
+    def _sample_forever(self) -> None:
+        while True:
+            self._busy.wait()  # sleeps through idle periods
+            time.sleep(self.interval)
+            self.sample()
+
+
+profiler = SlowRequestProfiler()
+
+
+# -----------------------------------------------------------------------------
+# Middleware
+# -----------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """Pure ASGI, so streamed bodies are timed to their last byte"""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        server_timing = _flag("API_SERVER_TIMING")
+        slow_ms = os.getenv("API_PROFILE_SLOW_MS")
+        if slow_ms:
+            profiler.begin(stats, float(os.getenv("API_PROFILE_INTERVAL_MS", "5")) / 1000)
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if server_timing:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", _server_timing(stats))]
+            elif message["type"] == "http.response.body":
+                stats.response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            seconds = time.perf_counter() - stats.start
+            route = scope.get("route")
+            label = getattr(route, "path", None) or UNMATCHED
+            metrics.observe(scope["method"], label, status, seconds, stats)
+            if slow_ms:
+                profiler.end(stats, scope["method"], label, seconds, float(slow_ms) / 1000)
+
+
+def _server_timing(stats: RequestStats) -> bytes:
+    total_ms = (time.perf_counter() - stats.start) * 1000
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} statements", '
+        f"total;dur={total_ms:.2f}"
+    ).encode()
@@ -0,0 +1,193 @@
+#apps/api/app/services/placement_batch.py
+"""
+Batched placement edits (POST /api/placements/batch)
+
+A batch of moves, swaps and clears is applied as one transaction:
+1. Parse every slot into a (row, col) cell and check it against the user's
+   cached fixture shapes, and every game id against the games the user owns
+2. Load the current occupant of each touched slot and the current slot of
+   each moved game (one query)
+3. Replay the ops in memory to get the final slot -> game mapping
+4. Bump the version of every changed fixture, conditionally for those the
+   client sent an expected version for (409 on mismatch)
+5. Write only the slots whose occupant changed: one DELETE of their old
+   rows, then one executemany INSERT of the new ones
+
+Because all old rows go before any new row is inserted, and the final
+mapping is one-to-one, a swap never trips uq_fixture_cell or
+uq_game_one_location halfway through
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, Mapping
+
+from sqlalchemy import and_, delete, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Game, Placement
+from app.schemas import BatchClear, BatchMove, BatchOp, BatchSwap, PlacementOut
+from app.services.fixture_grid import fixture_shapes
+from app.services.fixture_versions import bump_versions
+from app.services.slots import format_slot, parse_slot
+from app.services.users import owns_game
+
+Cell = tuple[int, int, int]  # (fixture_id, row, col)
+
+
+@dataclass
+class BatchResult:
+    placements: list[PlacementOut]  # touched slots that end up occupied
+    cleared: list[tuple[int, str]]  # touched (fixture_id, slot)s that end up empty
+    versions: dict[int, int]  # new version of each changed fixture
+    changes: dict[int, list[tuple[str, int | None]]]  # fixture -> [(slot, new game_id)]
+
+
+def _cell(fixture_id: int, slot: str) -> Cell:
+    return (fixture_id, *parse_slot(slot))
+
+
+def _cells_of(op: BatchOp) -> Iterator[Cell]:
+    """The cells an op touches; ValueError for a malformed slot"""
+    if isinstance(op, BatchSwap):
+        yield _cell(op.a.fixture_id, op.a.slot)
+        yield _cell(op.b.fixture_id, op.b.slot)
+    else:
+        yield _cell(op.fixture_id, op.slot)
+
+
+def _validate(db: Session, ops: list[BatchOp], user_id: int) -> None:
+    """Raise LookupError (missing fixture/game) or ValueError (bad slot)"""
+    cells = []
+    for i, op in enumerate(ops):
+        try:
+            cells.append(list(_cells_of(op)))
+        except ValueError as exc:
+            raise ValueError(f"ops[{i}]: {exc}") from exc
+    shapes = fixture_shapes.get_many(db, {fid for op_cells in cells for fid, _, _ in op_cells}, user_id=user_id)
+    for i, op_cells in enumerate(cells):
+        for fid, row, col in op_cells:
+            if fid not in shapes:
+                raise LookupError(f"ops[{i}]: fixture {fid} not found")
+            n_rows, n_cols = shapes[fid]
+            if row >= n_rows or col >= n_cols:
+                raise ValueError(f"ops[{i}]: slot {format_slot(row, col)!r} is out of bounds for fixture {fid}")
+
+    game_ids = {op.game_id for op in ops if isinstance(op, BatchMove)}
+    if game_ids:
+        found = set(
+            db.scalars(select(Game.id).where(Game.id.in_(game_ids), owns_game(user_id, Game.id)))
+        )
+        for i, op in enumerate(ops):
+            if isinstance(op, BatchMove) and op.game_id not in found:
+                raise LookupError(f"ops[{i}]: game {op.game_id} not found")
+
+
+# Matched against lists of cells: one seek per cell on uq_fixture_cell
+_CELL = tuple_(Placement.fixture_id, Placement.row, Placement.col)
+
+
+class _Layout:
+    """Cell <-> game mapping for the cells and games a batch touches"""
+
+    def __init__(self, rows) -> None:
+        self.at: dict[Cell, int] = {}
+        self.where: dict[int, Cell] = {}
+        for fid, row, col, game_id in rows:
+            self.put(game_id, (fid, row, col))
+
+    def take(self, cell: Cell) -> int | None:
+        game_id = self.at.pop(cell, None)
+        if game_id is not None:
+            del self.where[game_id]
+        return game_id
+
+    def put(self, game_id: int, cell: Cell) -> None:
+        old = self.where.get(game_id)
+        if old is not None:
+            self.take(old)
+        self.take(cell)  # evict the current occupant, as PUT /api/placements does
+        self.at[cell] = game_id
+        self.where[game_id] = cell
+
+    def apply(self, op: BatchOp) -> None:
+        if isinstance(op, BatchMove):
+            self.put(op.game_id, _cell(op.fixture_id, op.slot))
+        elif isinstance(op, BatchClear):
+            self.take(_cell(op.fixture_id, op.slot))
+        else:
+            a, b = _cell(op.a.fixture_id, op.a.slot), _cell(op.b.fixture_id, op.b.slot)
+            game_a, game_b = self.take(a), self.take(b)
+            if game_a is not None:
+                self.put(game_a, b)
+            if game_b is not None:
+                self.put(game_b, a)
+
+
+def apply_placement_batch(
+    db: Session,
+    ops: list[BatchOp],
+    *,
+    user_id: int,
+    expected_versions: Mapping[int, int] | None = None,
+) -> BatchResult:
+    """
+    Validate and apply `user_id`'s `ops` in one transaction (commits)
+
+    Raises LookupError / ValueError for bad ops and VersionConflict when a
+    fixture moved past its expected version; nothing is written then
+    """
+    _validate(db, ops, user_id)
+
+    touched = list(dict.fromkeys(cell for op in ops for cell in _cells_of(op)))
+    moved_games = {op.game_id for op in ops if isinstance(op, BatchMove)}
+    current = db.execute(
+        select(Placement.fixture_id, Placement.row, Placement.col, Placement.game_id).where(
+            or_(
+                _CELL.in_(touched),
+                and_(Placement.user_id == user_id, Placement.game_id.in_(moved_games)),
+            )
+        )
+    ).all()
+
+    layout = _Layout(current)
+    before = dict(layout.at)
+    for op in ops:
+        layout.apply(op)
+
+    changed = [s for s in before.keys() | layout.at.keys() if before.get(s) != layout.at.get(s)]
+    versions = bump_versions(db, {fid for fid, _, _ in changed}, expected=expected_versions)
+    if changed:
+        db.execute(delete(Placement).where(_CELL.in_(changed)))
+        new_rows = [
+            {"user_id": user_id, "fixture_id": fid, "row": row, "col": col, "game_id": layout.at[(fid, row, col)]}
+            for fid, row, col in changed
+            if (fid, row, col) in layout.at
+        ]
+        if new_rows:
+            db.execute(insert(Placement), new_rows)
+
+    # Plain columns, read before the commit: no ORM rows to expire and reload
+    report = list(dict.fromkeys([*touched, *changed]))
+    rows = db.execute(
+        select(Placement.id, Placement.fixture_id, Placement.row, Placement.col, Placement.game_id)
+        .where(_CELL.in_(report))
+        .order_by(Placement.fixture_id, Placement.id)
+    ).all()
+    db.commit()
+
+    changes: dict[int, list[tuple[str, int | None]]] = {}
+    for fid, row, col in changed:
+        changes.setdefault(fid, []).append((format_slot(row, col), layout.at.get((fid, row, col))))
+
+    occupied = {(fid, row, col) for _, fid, row, col, _ in rows}
+    return BatchResult(
+        placements=[
+            PlacementOut(id=pid, fixture_id=fid, slot=format_slot(row, col), game_id=game_id)
+            for pid, fid, row, col, game_id in rows
+        ],
+        cleared=[(fid, format_slot(row, col)) for fid, row, col in report if (fid, row, col) not in occupied],
+        versions=versions,
+        changes=changes,
+    )
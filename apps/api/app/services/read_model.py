@@ -0,0 +1,468 @@
+"""
+In-process read model: games, fixtures and placements held in memory
+
+The whole dataset fits in memory many times over, yet every read used to
+rebuild it from SQLite. With API_READ_MODEL=1 (SQLite only) the hot reads
+are answered from compact in-memory structures instead, with no query:
+- GET /api/games (without `q`; searches still go to the database)
+- GET /api/fixtures and GET /api/fixtures/{id}/grid
+
+Layout:
+- games: one `GameRow` (`__slots__`) per game, plus a bgg_id -> id index
+- fixtures: one `FixtureRow` per fixture whose `cells` is a dense array of
+  game ids in row-major slot order (0 = empty), so a grid renders by index
+- ownership per collection, and each user's game -> (fixture, row, col)
+- each user's listing order, (name, id) sorted, built on first use
+
+Staying current:
+- this process's placement writes patch it in place from the fixture event
+  broker (services/fixture_events.py), version by version; a gap in a
+  fixture's versions reloads just that fixture on the next read
+- sync jobs hand over the collection they just synced (`collection_synced`)
+- other processes' commits show up in `PRAGMA data_version`, read on a
+  connection of our own before each read. A change marks the model stale;
+  the next read compares sync cursors and a one-row summary of the fixtures
+  (count, sum of versions, max id; versions only grow) with ours, and only
+  when they differ compares every fixture's version, reloading the
+  fixtures, or the catalog, that moved
+
+Own commits change data_version too, so the first read after any write runs
+that check (two small queries, no reload); reads between writes run no
+query at all
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import Collection, CollectionGame, Fixture, Game, Placement, SyncCursor
+from app.services.fixture_events import SlotChange, fixture_events
+from app.services.fixture_grid import GAME_KEYS, grid_body, grid_cache
+from app.services.slots import format_slot, parse_slot
+
+# Fixture ids per IN (...) list, under SQLite's host parameter limit
+_CHUNK_SIZE = 500
+
+Cell = tuple[int, int, int]  # (fixture_id, row, col)
+
+
+def read_model_enabled() -> bool:
+    return os.getenv("API_READ_MODEL", "0").lower() in ("1", "true", "yes")
+
+
+class GameRow:
+    __slots__ = ("id", "bgg_id", "name", "year_published", "thumbnail_url", "image_url")
+
+    def __init__(self, id, bgg_id, name, year_published, thumbnail_url, image_url) -> None:
+        self.id = id
+        self.bgg_id = bgg_id
+        self.name = name
+        self.year_published = year_published
+        self.thumbnail_url = thumbnail_url
+        self.image_url = image_url
+
+    def values(self) -> tuple:
+        """In GAME_KEYS order"""
+        return (self.id, self.bgg_id, self.name, self.year_published, self.thumbnail_url, self.image_url)
+
+
+class FixtureRow:
+    __slots__ = ("id", "user_id", "name", "rows", "cols", "version", "cells")
+
+    def __init__(self, id, user_id, name, rows, cols, version) -> None:
+        self.id = id
+        self.user_id = user_id
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+        self.version = version
+        self.cells = array("q", [0]) * (rows * cols)
+
+
+# Listing fields (game_listing.GAME_FIELDS) from a game and its cell, if placed
+_FIELDS = {
+    "id": lambda game, cell: game.id,
+    "bgg_id": lambda game, cell: game.bgg_id,
+    "name": lambda game, cell: game.name,
+    "year_published": lambda game, cell: game.year_published,
+    "thumbnail_url": lambda game, cell: game.thumbnail_url,
+    "image_url": lambda game, cell: game.image_url,
+    "fixture_id": lambda game, cell: cell[0] if cell else None,
+    "slot": lambda game, cell: format_slot(cell[1], cell[2]) if cell else None,
+}
+
+
+class _DataVersion:
+    """`PRAGMA data_version` on a private connection: it changes when any other connection commits"""
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._last = self._read()
+
+    def _read(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self) -> bool:
+        current = self._read()
+        changed, self._last = current != self._last, current
+        return changed
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _watcher(session_factory: sessionmaker) -> _DataVersion | None:
+    # In-memory databases have no other connections to watch for
+    path = session_factory.kw["bind"].url.database
+    if not path or path == ":memory:" or path.startswith("file::memory:"):
+        return None
+    return _DataVersion(path)
+
+
+@dataclass
+class ReadModelStats:
+    catalog_loads: int = 0
+    refreshes: int = 0
+    fixture_loads: int = 0  # fixtures whose placements were reloaded
+    applied: int = 0  # placement diffs patched in place
+
+
+class ReadModel:
+    """See the module docstring; thread-safe"""
+
+    def __init__(self, session_factory: sessionmaker) -> None:
+        self.session_factory = session_factory
+        self.stats = ReadModelStats()
+        self._lock = threading.RLock()
+        self._check_lock = threading.Lock()
+        self._watch = _watcher(session_factory)
+        self._loaded = False
+        self._stale = True
+        self._dirty: set[int] = set()  # fixtures with a write we could not patch
+
+        self._games: dict[int, GameRow] = {}
+        self._by_bgg_id: dict[int, int] = {}
+        self._collections: dict[int, tuple[int, set[int]]] = {}  # id -> (user id, game ids)
+        self._cursors: dict[str, object] = {}  # SyncCursor.username -> last_synced_at
+        self._fixtures: dict[int, FixtureRow] = {}
+        self._user_fixtures: dict[int, list[int]] = {}
+        self._located: dict[int, dict[int, Cell]] = {}  # user id -> game id -> cell
+        self._listing: dict[int, list[tuple[str, int]]] = {}  # user id -> sorted (name, id)
+
+    # -- reads -----------------------------------------------------------------
+
+    def fixtures_of(self, user_id: int) -> list[tuple]:
+        """The user's fixtures as (id, name, rows, cols, version), in id order"""
+        self._refresh_if_stale()
+        with self._lock:
+            fixtures = (self._fixtures[fid] for fid in self._user_fixtures.get(user_id, ()))
+            return [(f.id, f.name, f.rows, f.cols, f.version) for f in fixtures]
+
+    def fixture_version(self, fixture_id: int, user_id: int) -> int | None:
+        """None when there is no such fixture, or another user owns it"""
+        self._refresh_if_stale()
+        with self._lock:
+            fixture = self._fixtures.get(fixture_id)
+            return fixture.version if fixture is not None and fixture.user_id == user_id else None
+
+    def grid_json(self, fixture_id: int, user_id: int) -> tuple[bytes, int] | None:
+        """(FixtureGridOut JSON, version) as fixture_grid.get_grid_json, sharing its cache"""
+        self._refresh_if_stale()
+        with self._lock:
+            fixture = self._fixtures.get(fixture_id)
+            if fixture is None or fixture.user_id != user_id:
+                return None
+            key = (fixture.id, fixture.version)
+            body = grid_cache.get(key)
+            if body is None:
+                games = [dict(zip(GAME_KEYS, self._games[gid].values())) if gid else None for gid in fixture.cells]
+                body = grid_body((fixture.id, fixture.name, fixture.rows, fixture.cols, fixture.version), games)
+                grid_cache.put(key, body)
+            return body, fixture.version
+
+    def games_page(
+        self, user_id: int, fields: tuple[str, ...], *, after: list | None = None, limit: int | None = None
+    ) -> list[tuple]:
+        """
+        Rows as game_listing.listing_query returns them without `q`
+
+        `fields`, then the (name, id) sort key; `limit + 1` rows when
+        paginated, so `next_cursor` works on them unchanged
+        """
+        self._refresh_if_stale()
+        with self._lock:
+            keys = self._listing_keys(user_id)
+            start = 0
+            if after is not None:
+                if len(after) != 2 or not isinstance(after[0], str) or not isinstance(after[1], int):
+                    raise ValueError("Invalid cursor")
+                start = bisect_right(keys, (after[0], after[1]))
+            page = keys[start:] if limit is None else keys[start : start + limit + 1]
+            located = self._located.get(user_id, {})
+            getters = [_FIELDS[f] for f in fields]
+            rows = []
+            for key in page:
+                game = self._games[key[1]]
+                cell = located.get(game.id)
+                rows.append((*(get(game, cell) for get in getters), *key))
+            return rows
+
+    def game_by_bgg_id(self, bgg_id: int) -> GameRow | None:
+        self._refresh_if_stale()
+        with self._lock:
+            game_id = self._by_bgg_id.get(bgg_id)
+            return self._games.get(game_id) if game_id is not None else None
+
+    # -- write paths -------------------------------------------------------------
+
+    def placements_changed(self, fixture_id: int, version: int, changes: list[SlotChange]) -> None:
+        """Fixture event listener: patch a committed diff in place"""
+        with self._lock:
+            if not self._loaded:
+                return
+            fixture = self._fixtures.get(fixture_id)
+            if fixture is None:
+                # A fixture we do not know: check against the database
+                self._stale = True
+                return
+            if version != fixture.version + 1:
+                if version > fixture.version:
+                    # A write we did not see: reload this fixture alone
+                    self._dirty.add(fixture.id)
+                return
+            if any(game_id and game_id not in self._games for _, game_id in changes):
+                self._stale = True
+                return
+            located = self._located.setdefault(fixture.user_id, {})
+            for slot, game_id in changes:
+                row, col = parse_slot(slot)
+                self._clear_cell(fixture, located, row * fixture.cols + col)
+                if game_id:
+                    fixture.cells[row * fixture.cols + col] = game_id
+                    located[game_id] = (fixture.id, row, col)
+            fixture.version = version
+            self.stats.applied += 1
+
+    def fixture_created(self, fixture: Fixture) -> None:
+        with self._lock:
+            if self._loaded and fixture.id not in self._fixtures:
+                self._add_fixture(fixture.id, fixture.user_id, fixture.name, fixture.rows, fixture.cols, fixture.version)
+
+    def collection_synced(self, db: Session, collection: Collection) -> None:
+        """Sync write path: take the collection's games and ownership as just committed"""
+        if not self._loaded:
+            return
+        rows = db.execute(
+            select(Game.id, Game.bgg_id, Game.name, Game.year_published, Game.thumbnail_url, Game.image_url)
+            .join(CollectionGame, CollectionGame.game_id == Game.id)
+            .where(CollectionGame.collection_id == collection.id)
+        ).all()
+        synced_at = db.scalar(select(SyncCursor.last_synced_at).where(SyncCursor.username == collection.sync_key))
+        with self._lock:
+            metadata_changed = False
+            for row in rows:
+                old = self._games.get(row[0])
+                if old is None or old.values() != tuple(row):
+                    metadata_changed |= old is not None
+                    self._put_game(GameRow(*row))
+            self._collections[collection.id] = (collection.user_id, {row[0] for row in rows})
+            self._cursors[collection.sync_key] = synced_at
+            self._listing.pop(collection.user_id, None)
+            if metadata_changed:
+                # Names order listings, and grids embed every field
+                self._listing.clear()
+                grid_cache.clear()
+
+    def close(self) -> None:
+        if self._watch is not None:
+            self._watch.close()
+
+    # -- loading -----------------------------------------------------------------
+
+    def _refresh_if_stale(self) -> None:
+        if self._watch is not None:
+            with self._check_lock:
+                if self._watch.changed():
+                    self._stale = True
+        if self._stale or self._dirty:
+            with self._lock:
+                if self._stale or self._dirty:
+                    self._refresh()
+
+    def _refresh(self) -> None:
+        # Cleared first: anything marking it stale from here on gets another refresh
+        stale, self._stale = self._stale, False
+        dirty, self._dirty = self._dirty, set()
+        with self.session_factory() as db:
+            cursors = (
+                dict(db.execute(select(SyncCursor.username, SyncCursor.last_synced_at)).tuples().all())
+                if stale
+                else self._cursors
+            )
+            if not self._loaded or cursors != self._cursors:
+                self._load_catalog(db)
+                self._cursors = cursors
+                self._sync_fixtures(db)
+            elif stale and self._fixtures_moved(db, dirty):
+                # Another writer: find which fixtures
+                self._sync_fixtures(db)
+            else:
+                self._sync_fixtures(db, only=dirty)
+        self._loaded = True
+        self.stats.refreshes += 1
+
+    def _fixtures_moved(self, db: Session, skip: set[int]) -> bool:
+        """Whether any fixture but `skip` was added, dropped or bumped behind our back"""
+        fixtures = [f for fid, f in self._fixtures.items() if fid not in skip]
+        ours = (len(fixtures), sum(f.version for f in fixtures), max((f.id for f in fixtures), default=0))
+        theirs = db.execute(
+            select(func.count(), func.coalesce(func.sum(Fixture.version), 0), func.coalesce(func.max(Fixture.id), 0))
+            .where(Fixture.id.not_in(sorted(skip)))
+        ).one()
+        return tuple(theirs) != ours
+
+    def _load_catalog(self, db: Session) -> None:
+        self._games.clear()
+        self._by_bgg_id.clear()
+        for row in db.execute(
+            select(Game.id, Game.bgg_id, Game.name, Game.year_published, Game.thumbnail_url, Game.image_url)
+        ):
+            self._put_game(GameRow(*row))
+        self._collections = {cid: (uid, set()) for cid, uid in db.execute(select(Collection.id, Collection.user_id))}
+        for cid, game_id in db.execute(select(CollectionGame.collection_id, CollectionGame.game_id)):
+            self._collections[cid][1].add(game_id)
+        self._listing.clear()
+        if self._loaded:
+            grid_cache.clear()
+        self.stats.catalog_loads += 1
+
+    def _sync_fixtures(self, db: Session, only: set[int] | None = None) -> None:
+        """
+        Add new fixtures, drop deleted ones, reload the placements of any whose version moved
+
+        With `only`, just those fixtures are looked at
+        """
+        stmt = select(Fixture.id, Fixture.user_id, Fixture.name, Fixture.rows, Fixture.cols, Fixture.version)
+        if only is not None:
+            if not only:
+                return
+            stmt = stmt.where(Fixture.id.in_(sorted(only)))
+        rows = db.execute(stmt).all()
+        changed: list[FixtureRow] = []
+        for fid, user_id, name, n_rows, n_cols, version in rows:
+            fixture = self._fixtures.get(fid)
+            if fixture is None:
+                changed.append(self._add_fixture(fid, user_id, name, n_rows, n_cols, version))
+            elif fixture.version != version:
+                fixture.version = version
+                changed.append(fixture)
+        for fid in (self._fixtures.keys() if only is None else only & self._fixtures.keys()) - {row[0] for row in rows}:
+            self._drop_fixture(self._fixtures[fid])
+        self.stats.fixture_loads += len(changed)
+
+        if only is None and len(changed) == len(rows):
+            self._load_placements(db, changed, select(Placement.fixture_id, Placement.row, Placement.col, Placement.game_id))
+            return
+        for i in range(0, len(changed), _CHUNK_SIZE):
+            chunk = changed[i : i + _CHUNK_SIZE]
+            stmt = select(Placement.fixture_id, Placement.row, Placement.col, Placement.game_id).where(
+                Placement.fixture_id.in_([f.id for f in chunk])
+            )
+            self._load_placements(db, chunk, stmt)
+
+    def _load_placements(self, db: Session, fixtures: list[FixtureRow], stmt) -> None:
+        by_id = {f.id: f for f in fixtures}
+        for fixture in fixtures:
+            located = self._located.setdefault(fixture.user_id, {})
+            for i in range(len(fixture.cells)):
+                self._clear_cell(fixture, located, i)
+        for fid, row, col, game_id in db.execute(stmt):
+            fixture = by_id[fid]
+            fixture.cells[row * fixture.cols + col] = game_id
+            self._located[fixture.user_id][game_id] = (fid, row, col)
+
+    # -- helpers -----------------------------------------------------------------
+
+    def _put_game(self, game: GameRow) -> None:
+        self._games[game.id] = game
+        self._by_bgg_id[game.bgg_id] = game.id
+
+    def _add_fixture(self, fid: int, user_id: int, name: str, n_rows: int, n_cols: int, version: int) -> FixtureRow:
+        fixture = self._fixtures[fid] = FixtureRow(fid, user_id, name, n_rows, n_cols, version)
+        insort(self._user_fixtures.setdefault(user_id, []), fid)
+        return fixture
+
+    def _drop_fixture(self, fixture: FixtureRow) -> None:
+        located = self._located.setdefault(fixture.user_id, {})
+        for i in range(len(fixture.cells)):
+            self._clear_cell(fixture, located, i)
+        del self._fixtures[fixture.id]
+        self._user_fixtures[fixture.user_id].remove(fixture.id)
+
+    @staticmethod
+    def _clear_cell(fixture: FixtureRow, located: dict[int, Cell], i: int) -> None:
+        game_id = fixture.cells[i]
+        if game_id:
+            fixture.cells[i] = 0
+            # The game may already have moved into another cell
+            if located.get(game_id) == (fixture.id, i // fixture.cols, i % fixture.cols):
+                del located[game_id]
+
+    def _listing_keys(self, user_id: int) -> list[tuple[str, int]]:
+        keys = self._listing.get(user_id)
+        if keys is None:
+            owned: set[int] = set()
+            for owner, game_ids in self._collections.values():
+                if owner == user_id:
+                    owned |= game_ids
+            keys = self._listing[user_id] = sorted(
+                (self._games[gid].name, gid) for gid in owned if gid in self._games
+            )
+        return keys
+
+
+_lock = threading.Lock()
+_model: ReadModel | None = None
+
+
+def read_model_for(session_factory: sessionmaker) -> ReadModel | None:
+    """The model over `session_factory`'s database, created on first use; None when disabled"""
+    global _model
+    if not read_model_enabled() or session_factory.kw["bind"].dialect.name != "sqlite":
+        return None
+    with _lock:
+        if _model is None or _model.session_factory is not session_factory:
+            if _model is not None:
+                _model.close()
+            _model = ReadModel(session_factory)
+        return _model
+
+
+def current_read_model() -> ReadModel | None:
+    """The model write paths should update, if one is in use"""
+    return _model
+
+
+def reset_read_model() -> None:
+    global _model
+    with _lock:
+        if _model is not None:
+            _model.close()
+        _model = None
+
+
+def _on_fixture_event(fixture_id: int | None, version: int | None, changes: list[SlotChange]) -> None:
+    model = _model
+    if model is not None:
+        model.placements_changed(fixture_id, version, changes)
+
+
+fixture_events.add_listener(_on_fixture_event)
@@ -0,0 +1,113 @@
+"""
+Slot coordinates: integer cells in the database, "r{row}c{col}" in the API
+
+Placements are stored as (fixture_id, row, col) under the composite unique
+key uq_fixture_cell, so "everything in row 3" or "this 2x2 block" are
+index range seeks (see `cells_in`), and grids place games by arithmetic
+instead of string lookups. The "r0c0" strings clients send and receive are
+parsed and formatted here and nowhere else; `Placement.slot` is the same
+format computed in SQL, for reads that return it
+
+The database enforces bounds on its own:
+- ck_placement_cell_nonnegative: row and col are >= 0
+- triggers reject cells outside their fixture's rows x cols (a CHECK
+  constraint cannot see another table)
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from sqlalchemy import DDL, and_, event
+from sqlalchemy.engine import Connection
+
+from app.models import Placement
+
+_SLOT_RE = re.compile(r"^r(\d+)c(\d+)$")
+
+
+def parse_slot(slot: str) -> tuple[int, int]:
+    """`"r2c5"` -> (2, 5); ValueError for anything else"""
+    match = _SLOT_RE.match(slot)
+    if not match:
+        raise ValueError("slot must look like r0c0")
+    return int(match.group(1)), int(match.group(2))
+
+
+def format_slot(row: int, col: int) -> str:
+    return f"r{row}c{col}"
+
+
+@lru_cache(maxsize=256)
+def slot_names(rows: int, cols: int) -> tuple[str, ...]:
+    """Row-major slot names for a rows x cols fixture"""
+    return tuple(format_slot(r, c) for r in range(rows) for c in range(cols))
+
+
+def cells_in(fixture_id: int, rows: range, cols: range | None = None):
+    """
+    WHERE clause: placements of a fixture within `rows` (and `cols`)
+
+    A prefix of uq_fixture_cell, so it is answered by an index range scan
+    """
+    clause = and_(
+        Placement.fixture_id == fixture_id,
+        Placement.row >= rows.start,
+        Placement.row < rows.stop,
+    )
+    if cols is not None:
+        clause = and_(clause, Placement.col >= cols.start, Placement.col < cols.stop)
+    return clause
+
+
+_OUT_OF_BOUNDS = "placement is outside its fixture"
+
+_SQLITE_TRIGGERS = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS placements_in_bounds_{suffix} BEFORE {event_} ON placements
+    WHEN NEW."row" >= (SELECT rows FROM fixtures WHERE id = NEW.fixture_id)
+      OR NEW.col >= (SELECT cols FROM fixtures WHERE id = NEW.fixture_id)
+    BEGIN
+        SELECT RAISE(ABORT, '{_OUT_OF_BOUNDS}');
+    END
+    """
+    for suffix, event_ in (("bi", "INSERT"), ("bu", 'UPDATE OF fixture_id, "row", col'))
+)
+
+_POSTGRES_TRIGGERS = (
+    f"""
+    CREATE OR REPLACE FUNCTION placements_in_bounds() RETURNS trigger AS $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM fixtures
+            WHERE id = NEW.fixture_id AND (NEW."row" >= rows OR NEW.col >= cols)
+        ) THEN
+            RAISE EXCEPTION '{_OUT_OF_BOUNDS}' USING ERRCODE = 'check_violation';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS placements_in_bounds ON placements",
+    """
+    CREATE TRIGGER placements_in_bounds BEFORE INSERT OR UPDATE OF fixture_id, "row", col ON placements
+    FOR EACH ROW EXECUTE FUNCTION placements_in_bounds()
+    """,
+)
+
+
+def ensure_bounds_triggers(connection: Connection) -> None:
+    """(Re)create the bounds triggers; safe to run on every startup"""
+    dialect = connection.dialect.name
+    statements = _SQLITE_TRIGGERS if dialect == "sqlite" else _POSTGRES_TRIGGERS if dialect == "postgresql" else ()
+    for stmt in statements:
+        connection.execute(DDL(stmt))
+
+
+def _create_triggers(target, connection: Connection, **kw) -> None:
+    ensure_bounds_triggers(connection)
+
+
+# Created alongside the placements table (create_all); dropped with it
+event.listen(Placement.__table__, "after_create", _create_triggers)
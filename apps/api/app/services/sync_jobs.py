@@ -0,0 +1,278 @@
+#apps/api/app/services/sync_jobs.py
+"""
+Background BGG sync jobs
+
+A sync can spend tens of seconds waiting on BGG's 202 queue, so it runs on a
+small worker pool inside the API process instead of inside the request
+
+This module owns:
+- The job records (status, current stage, progress counters)
+- Merging duplicate requests: one active job per (user, BGG username)
+- The fetch -> parse -> enrich -> upsert pipeline a worker runs
+
+Jobs live in memory only; they are progress reports, not durable state
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.bgg.client import (
+    BggApiError,
+    BggCollectionItem,
+    FetchStats,
+    fetch_collection,
+    fetch_thing_details,
+)
+from app.services.bgg_sync import (
+    UPSERT_CHUNK_SIZE,
+    CollectionDelta,
+    UpsertResult,
+    enrich_with_details,
+    upsert_games_from_bgg,
+)
+from app.services.fixture_events import SlotChange, fixture_events
+from app.models import CollectionGame, Game, Placement
+from app.services.fixture_versions import bump_versions
+from app.services.image_cache import DEFAULT_SIZE, get_image_cache, source_url
+from app.services.read_model import current_read_model
+from app.services.slots import format_slot
+from app.services.users import DEFAULT_USERNAME, ensure_collection, user_ids
+
+# Finished jobs kept around for GET /api/sync/jobs/{id}
+_MAX_FINISHED_JOBS = 200
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Download the collection's grid-size box art right after a sync, instead of
+# on the first grid view (off by default: it is one CDN request per game)
+_PREFETCH_IMAGES = os.getenv("API_IMAGE_PREFETCH", "0") in ("1", "true", "yes")
+
+
+@dataclass
+class SyncJob:
+    id: str
+    username: str  # the BGG account
+    user_id: int | None = None  # whose collection it fills; None = the default user
+    status: str = "queued"  # queued | running | succeeded | failed
+    stage: str = "queued"  # queued | fetching | enriching | upserting | done
+    items_fetched: int = 0
+    items_upserted: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class SyncJobManager:
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("BGG_SYNC_WORKERS", "2")),
+            thread_name_prefix="bgg-sync",
+        )
+        self._lock = threading.Lock()
+        self._jobs: dict[str, SyncJob] = {}
+        self._active_by_user: dict[tuple[int | None, str], str] = {}
+        self._done: dict[str, threading.Event] = {}
+
+    def submit(
+        self,
+        *,
+        username: str,
+        token: str,
+        session_factory: sessionmaker,
+        user_id: int | None = None,
+        full: bool = False,
+    ) -> tuple[SyncJob, bool]:
+        """
+        Queue a sync of `username` into `user_id`'s collections, or join the
+        one already queued/running
+
+        Returns (job, created)
+        """
+        user_key = (user_id, username.strip().lower())
+        with self._lock:
+            active_id = self._active_by_user.get(user_key)
+            if active_id is not None:
+                return self._jobs[active_id], False
+
+            job = SyncJob(id=uuid.uuid4().hex, username=username, user_id=user_id)
+            self._jobs[job.id] = job
+            self._active_by_user[user_key] = job.id
+            self._done[job.id] = threading.Event()
+            self._trim()
+
+        self._executor.submit(self._run, job, token, full, session_factory, user_key)
+        return job, True
+
+    def get(self, job_id: str) -> SyncJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> bool:
+        """Block until the job finishes; mostly useful in tests and scripts"""
+        done = self._done.get(job_id)
+        return done.wait(timeout) if done else False
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(
+        self,
+        job: SyncJob,
+        token: str,
+        full: bool,
+        session_factory: sessionmaker,
+        user_key: tuple[int | None, str],
+    ) -> None:
+        job.status, job.started_at = "running", time.time()
+        try:
+            with session_factory() as db:
+                job.result = run_bgg_sync(db, job, token=token, full=full)
+            job.status = "succeeded"
+        except BggApiError as exc:
+            job.status, job.error = "failed", str(exc)
+        except Exception as exc:  # keep the worker alive; report instead
+            job.status, job.error = "failed", f"{type(exc).__name__}: {exc}"
+        finally:
+            job.stage, job.finished_at = "done", time.time()
+            with self._lock:
+                self._active_by_user.pop(user_key, None)
+            self._done[job.id].set()
+
+    def _trim(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status not in ACTIVE_STATUSES]
+        for old in sorted(finished, key=lambda j: j.created_at)[:-_MAX_FINISHED_JOBS]:
+            self._jobs.pop(old.id, None)
+            self._done.pop(old.id, None)
+
+
+def _counting(items: Iterable[BggCollectionItem], job: SyncJob) -> Iterator[BggCollectionItem]:
+    for item in items:
+        job.items_fetched += 1
+        yield item
+
+
+def run_bgg_sync(db: Session, job: SyncJob, *, token: str, full: bool = False) -> dict:
+    """
+    The sync pipeline: fetch -> parse -> delta -> enrich -> upsert
+
+    Items stream through every stage; `job` is updated as they go. Only items
+    added or changed since the collection's last sync get past the delta
+    stage. Ownership lands in the job user's collection named after the BGG
+    username
+    """
+    stats = FetchStats()
+    user_id = job.user_id if job.user_id is not None else user_ids.resolve(db, DEFAULT_USERNAME)
+    collection = ensure_collection(db, user_id, job.username)
+    delta = CollectionDelta(db, collection.sync_key, full=full, collection_id=collection.id)
+
+    job.stage = "fetching"
+    items = fetch_collection(
+        username=job.username,
+        token=token,
+        stats=stats,
+        modified_since=delta.modified_since,
+    )
+
+    def fetch_details(ids: list[int]) -> dict[int, BggCollectionItem]:
+        job.stage = "enriching"
+        try:
+            return fetch_thing_details(ids=ids, token=token, stats=stats)
+        finally:
+            job.stage = "upserting"
+
+    def on_chunk(progress: UpsertResult) -> None:
+        job.items_upserted = progress.processed
+
+    job.stage = "upserting"
+    result = upsert_games_from_bgg(
+        db,
+        enrich_with_details(db, delta.filter(_counting(items, job)), fetch=fetch_details),
+        on_chunk=on_chunk,
+    )
+    if result.updated_ids:
+        _republish_placed(db, result.updated_ids)
+
+    delta_counts = delta.commit().as_dict()
+    model = current_read_model()
+    if model is not None:
+        model.collection_synced(db, collection)
+
+    images_queued = _prefetch_images(db, collection.id) if _PREFETCH_IMAGES else 0
+    return {
+        "delta": delta_counts,
+        "processed": result.processed,
+        "inserted": result.inserted,
+        "updated": result.updated,
+        "unchanged": result.unchanged,
+        "images_queued": images_queued,
+        "timings": stats.as_dict(),
+    }
+
+
+def _republish_placed(db: Session, game_ids: list[int]) -> None:
+    """
+    Bump the fixtures holding any of `game_ids` and announce those slots
+
+    Their games may have new names/images, and grids (and their ETags) embed
+    them; fixtures without an updated game keep their version and cache
+    """
+    changes: dict[int, list[SlotChange]] = {}
+    for start in range(0, len(game_ids), UPSERT_CHUNK_SIZE):
+        rows = db.execute(
+            select(Placement.fixture_id, Placement.row, Placement.col, Placement.game_id)
+            .where(Placement.game_id.in_(game_ids[start : start + UPSERT_CHUNK_SIZE]))
+        )
+        for fixture_id, row, col, game_id in rows:
+            changes.setdefault(fixture_id, []).append((format_slot(row, col), game_id))
+    if not changes:
+        return
+    versions = bump_versions(db, changes.keys())
+    db.commit()
+    for fixture_id, diff in changes.items():
+        fixture_events.publish(fixture_id, versions[fixture_id], diff)
+
+
+def _prefetch_images(db: Session, collection_id: int) -> int:
+    """Queue the default-size image of every game in the collection not stored yet"""
+    rows = db.execute(
+        select(Game.thumbnail_url, Game.image_url)
+        .join(CollectionGame, CollectionGame.game_id == Game.id)
+        .where(CollectionGame.collection_id == collection_id)
+    )
+    urls = {source_url(DEFAULT_SIZE, *row) for row in rows} - {None}
+    return get_image_cache().prefetch(urls, DEFAULT_SIZE)
+
+
+_manager: SyncJobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> SyncJobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SyncJobManager()
+        return _manager
+
+
+def shutdown_job_manager() -> None:
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
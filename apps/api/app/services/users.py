@@ -0,0 +1,237 @@
+#apps/api/app/services/users.py
+"""
+Users, their collections, and what they own
+
+One instance serves many users (a café and its members). Games are shared
+rows; each user has their own collections (one per synced BGG account,
+plus "local"), fixtures and placements:
+
+    users 1--* collections 1--* collection_games *--1 games
+    users 1--* fixtures 1--* placements (placements.user_id = fixture owner)
+
+Every per-user query starts from an index keyed on the user (the
+collections unique key, ix_fixtures_user_id_id, uq_game_one_location), so
+its cost follows the size of that user's data, not the number of users.
+Game listings read `owned_games`: one row per (user, game) with the game's
+name, kept by triggers on collection_games and games, so a page is a range
+of ix_owned_games_user_id_name rather than a sort of the whole collection
+
+Requests name their user in the X-User header; without it they act as
+API_DEFAULT_USER ("default"), which owns everything a single-user database
+had before users existed. The header is trusted as-is: put the API behind
+something that sets it (an auth proxy) before exposing it
+
+Only requests that create something (a fixture, a sync) create their user.
+Anywhere else an unknown name acts as NO_USER_ID, which owns nothing, so
+reads never write and a made-up header cannot grow the users table
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Iterable
+
+from sqlalchemy import DDL, event, exists, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Base, Collection, CollectionGame, User
+
+DEFAULT_USERNAME = os.getenv("API_DEFAULT_USER", "default")
+
+# Collection for games added by hand rather than by a BGG sync
+LOCAL_COLLECTION = "local"
+
+MAX_USERNAME_LENGTH = 64
+
+# Acting user of requests whose X-User does not exist yet; no row has this id
+NO_USER_ID = 0
+
+# Ids per IN (...) list, under SQLite's host parameter limit
+_CHUNK_SIZE = 500
+
+
+def normalize_username(username: str | None) -> str:
+    """Lowercased, trimmed; empty means the default user. ValueError if too long"""
+    name = (username or "").strip().lower() or DEFAULT_USERNAME
+    if len(name) > MAX_USERNAME_LENGTH:
+        raise ValueError(f"username must be at most {MAX_USERNAME_LENGTH} characters")
+    return name
+
+
+class UserIds:
+    """
+    username -> user id
+
+    User rows are never renamed, so entries never go stale; a hit costs no
+    query. Unknown names are not cached, so a user created later is found
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: dict[str, int] = {}
+
+    def cached(self, username: str) -> int | None:
+        with self._lock:
+            return self._ids.get(username)
+
+    def lookup(self, db: Session, username: str) -> int | None:
+        """Id of `username` (already normalized), or None if there is no such user"""
+        user_id = self.cached(username)
+        if user_id is None:
+            user_id = db.scalar(select(User.id).where(User.username == username))
+            if user_id is not None:
+                with self._lock:
+                    self._ids[username] = user_id
+        return user_id
+
+    def resolve(self, db: Session, username: str) -> int:
+        """Id of `username` (already normalized), inserting the user if new (commits)"""
+        user_id = self.lookup(db, username)
+        if user_id is None:
+            user_id = _create_user(db, username)
+            with self._lock:
+                self._ids[username] = user_id
+        return user_id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+
+def _create_user(db: Session, username: str) -> int:
+    try:
+        user_id = db.scalar(insert(User).values(username=username).returning(User.id))
+        db.commit()
+    except IntegrityError:  # another request created it first
+        db.rollback()
+        user_id = db.scalar(select(User.id).where(User.username == username))
+    return user_id
+
+
+user_ids = UserIds()
+
+
+def ensure_collection(db: Session, user_id: int, name: str) -> Collection:
+    """The user's collection called `name` (lowercased), created if missing (commits)"""
+    name = name.strip().lower()
+    stmt = select(Collection).where(Collection.user_id == user_id, Collection.name == name)
+    collection = db.scalars(stmt).first()
+    if collection is None:
+        collection = Collection(user_id=user_id, name=name)
+        db.add(collection)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            collection = db.scalars(stmt).one()
+    return collection
+
+
+def add_to_collection(db: Session, collection_id: int, game_ids: Iterable[int]) -> None:
+    """Record ownership of `game_ids` (not committed); ids already there are skipped"""
+    wanted = sorted(set(game_ids))
+    for i in range(0, len(wanted), _CHUNK_SIZE):
+        chunk = wanted[i : i + _CHUNK_SIZE]
+        present = set(
+            db.scalars(
+                select(CollectionGame.game_id).where(
+                    CollectionGame.collection_id == collection_id,
+                    CollectionGame.game_id.in_(chunk),
+                )
+            )
+        )
+        rows = [{"collection_id": collection_id, "game_id": gid} for gid in chunk if gid not in present]
+        if rows:
+            db.execute(insert(CollectionGame), rows)
+
+
+def owns_game(user_id: int, game_id):
+    """EXISTS clause: the user has `game_id` in one of their collections"""
+    return exists(
+        select(1)
+        .select_from(CollectionGame)
+        .join(Collection, Collection.id == CollectionGame.collection_id)
+        .where(Collection.user_id == user_id, CollectionGame.game_id == game_id)
+    )
+
+
+_OWNED_INSERT = """
+    INSERT INTO owned_games (user_id, game_id, name)
+    SELECT c.user_id, g.id, g.name FROM collections c, games g
+    WHERE c.id = NEW.collection_id AND g.id = NEW.game_id
+    ON CONFLICT (user_id, game_id) DO NOTHING
+"""
+
+# A game stays owned while any of the user's collections holds it; also
+# covers collection_games rows removed by a cascade
+_OWNED_DELETE = """
+    DELETE FROM owned_games
+    WHERE game_id = OLD.game_id AND NOT EXISTS (
+        SELECT 1 FROM collection_games cg JOIN collections c ON c.id = cg.collection_id
+        WHERE cg.game_id = OLD.game_id AND c.user_id = owned_games.user_id
+    )
+"""
+
+_OWNED_RENAME = "UPDATE owned_games SET name = NEW.name WHERE game_id = NEW.id"
+
+_SQLITE_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS owned_games_ai AFTER INSERT ON collection_games BEGIN {_OWNED_INSERT}; END",
+    f"CREATE TRIGGER IF NOT EXISTS owned_games_ad AFTER DELETE ON collection_games BEGIN {_OWNED_DELETE}; END",
+    f"CREATE TRIGGER IF NOT EXISTS owned_games_au AFTER UPDATE OF name ON games BEGIN {_OWNED_RENAME}; END",
+)
+
+_POSTGRES_TRIGGERS = tuple(
+    stmt
+    for name, event_, body in (
+        ("owned_games_add", "AFTER INSERT ON collection_games", _OWNED_INSERT),
+        ("owned_games_remove", "AFTER DELETE ON collection_games", _OWNED_DELETE),
+        ("owned_games_rename", "AFTER UPDATE OF name ON games", _OWNED_RENAME),
+    )
+    for stmt in (
+        f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+        BEGIN
+            {body};
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {name} ON {event_.rsplit(' ', 1)[1]}",
+        f"CREATE TRIGGER {name} {event_} FOR EACH ROW EXECUTE FUNCTION {name}()",
+    )
+)
+
+
+def ensure_owned_games(connection: Connection) -> None:
+    """
+    (Re)create the owned_games triggers, and fill the table if it lags behind
+
+    Safe to run on every startup; the fill only runs for a database whose
+    collections predate the table
+    """
+    dialect = connection.dialect.name
+    statements = _SQLITE_TRIGGERS if dialect == "sqlite" else _POSTGRES_TRIGGERS if dialect == "postgresql" else ()
+    for stmt in statements:
+        connection.execute(DDL(stmt))
+    if connection.scalar(text("SELECT 1 FROM owned_games LIMIT 1")) is None:
+        connection.execute(
+            text(
+                "INSERT INTO owned_games (user_id, game_id, name)"
+                " SELECT DISTINCT c.user_id, g.id, g.name"
+                " FROM collection_games cg"
+                " JOIN collections c ON c.id = cg.collection_id"
+                " JOIN games g ON g.id = cg.game_id"
+            )
+        )
+
+
+def _create_triggers(target, connection: Connection, tables=(), **kw) -> None:
+    # After the whole create_all: the triggers span three tables
+    if any(t.name == "owned_games" for t in tables):
+        ensure_owned_games(connection)
+
+
+event.listen(Base.metadata, "after_create", _create_triggers)
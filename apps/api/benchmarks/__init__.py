@@ -0,0 +1,11 @@
+"""
+Standalone performance benchmarks for the API
+
+Run from apps/api, e.g.:
+    python -m benchmarks.bench_upsert
+
+These are not collected by pytest (files are named bench_*.py). The
+suite in benchmarks/suite/ runs the main scenarios on generated data of any
+size and saves results for comparison:
+    python -m benchmarks.suite --preset medium --save base.json
+"""
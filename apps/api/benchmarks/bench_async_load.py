@@ -0,0 +1,150 @@
+#apps/api/benchmarks/bench_async_load.py
+"""
+Threadpool vs async handlers under concurrent load
+
+Seeds a scratch database with N games, then for each mode starts the API
+under uvicorn (API_ASYNC_DB=0, then 1) and runs C concurrent asyncio
+clients for D seconds against a request mix:
+- 70% GET /api/fixtures/{id}/grid
+- 20% GET /api/games?q=...&limit=50
+- 10% PUT /api/placements
+
+Reports requests per second and p50/p99 latency per mode
+
+Usage:
+    python -m benchmarks.bench_async_load --clients 500 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _seed(data_dir: str, n_games: int) -> None:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    from app.db import make_engine
+    from app.migrations import upgrade_schema
+    from app.models import Base, Fixture, Game
+    from app.seed import seed_if_empty
+    from app.services.bgg_sync import upsert_games_from_bgg
+    from app.services.users import DEFAULT_USERNAME, LOCAL_COLLECTION, add_to_collection, ensure_collection, user_ids
+    from benchmarks.bench_upsert import synthetic_items
+
+    engine = make_engine(f"sqlite:///{Path(data_dir) / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    with Session(engine) as db:
+        seed_if_empty(db)
+        user_id = user_ids.resolve(db, DEFAULT_USERNAME)
+        db.add(Fixture(user_id=user_id, name="Bench wall", rows=20, cols=20))
+        db.commit()
+        upsert_games_from_bgg(db, synthetic_items(n_games))
+        add_to_collection(db, ensure_collection(db, user_id, LOCAL_COLLECTION).id, db.scalars(select(Game.id)))
+        db.commit()
+    engine.dispose()
+
+
+def _start(data_dir: str, port: int, *, async_db: bool) -> subprocess.Popen:
+    env = {**os.environ, "API_DATA_DIR": data_dir, "API_ASYNC_DB": "1" if async_db else "0"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--backlog", "4096"],
+        cwd=API_DIR,
+        env=env,
+    )
+
+
+async def _wait_ready(client) -> None:
+    for _ in range(200):
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def _worker(client, deadline: float, latencies: list, errors: list, game_ids: list[int], rng: random.Random) -> None:
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        start = time.perf_counter()
+        try:
+            if roll < 0.7:
+                res = await client.get("/api/fixtures/2/grid")
+            elif roll < 0.9:
+                res = await client.get("/api/games", params={"q": f"game {rng.randint(1, 999)}", "limit": 50})
+            else:
+                res = await client.put(
+                    "/api/placements",
+                    json={"fixture_id": 2, "slot": f"r{rng.randrange(20)}c{rng.randrange(20)}", "game_id": rng.choice(game_ids)},
+                )
+            if res.status_code >= 500:
+                errors.append(res.status_code)
+        except Exception as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def _load(base: str, clients: int, duration: float) -> tuple[float, list[float], list]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        await _wait_ready(client)
+        game_ids = [g["id"] for g in (await client.get("/api/games", params={"fields": "id", "limit": 500})).json()]
+        latencies: list[float] = []
+        errors: list = []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(_worker(client, deadline, latencies, errors, game_ids, random.Random(i)) for i in range(clients))
+        )
+    return duration, latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _seed(tmp, args.games)
+        print(f"{args.games} games, {args.clients} clients, {args.duration:.0f}s per mode\n")
+        print(f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for mode in ("threadpool", "async"):
+            port = _free_port()
+            proc = _start(tmp, port, async_db=mode == "async")
+            try:
+                duration, latencies, errors = asyncio.run(_load(f"http://127.0.0.1:{port}", args.clients, args.duration))
+            finally:
+                proc.terminate()
+                proc.wait(10)
+            ms = sorted(t * 1000 for t in latencies)
+            p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+            print(f"{mode:<12}{len(ms) / duration:>10.0f}{statistics.median(ms):>10.2f}{p99:>10.2f}{len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
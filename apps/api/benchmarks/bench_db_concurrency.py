@@ -0,0 +1,122 @@
+#apps/api/benchmarks/bench_db_concurrency.py
+"""
+SQLite read/write concurrency benchmark
+
+Runs reader threads (grid-style joined reads) next to writer threads
+(placement moves: two DELETEs + INSERT + commit, like upsert_placement)
+against a file-backed DB for a fixed duration, once per engine profile:
+- default: SQLite's stock rollback journal
+- wal: the profile app/db.py uses by default
+
+Reports reads/s, writes/s and "database is locked" failures
+
+Usage:
+    python -m benchmarks.bench_db_concurrency --readers 8 --writers 2 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db import make_engine
+from app.models import Base, Fixture, Game, Placement, User
+
+ROWS, COLS = 10, 10
+
+
+def _seed(Session_) -> tuple[int, int, list[int]]:
+    with Session_() as db:
+        user = User(username="bench")
+        db.add(user)
+        db.flush()
+        fixture = Fixture(user_id=user.id, name="Bench", rows=ROWS, cols=COLS)
+        db.add(fixture)
+        games = [Game(bgg_id=i, name=f"Game {i}", year_published=2000) for i in range(ROWS * COLS * 2)]
+        db.add_all(games)
+        db.flush()
+        for i, game in enumerate(games[: ROWS * COLS]):
+            db.add(Placement(user_id=user.id, fixture_id=fixture.id, row=i // COLS, col=i % COLS, game_id=game.id))
+        db.commit()
+        return user.id, fixture.id, [g.id for g in games]
+
+
+def run_profile(profile: str, path: Path, readers: int, writers: int, seconds: float) -> dict:
+    engine = make_engine(f"sqlite:///{path}", profile=profile)
+    Base.metadata.create_all(bind=engine)
+    Session_ = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    user_id, fixture_id, game_ids = _seed(Session_)
+
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader() -> None:
+        stmt = (
+            select(Placement.row, Placement.col, Game.id, Game.name)
+            .join(Game, Game.id == Placement.game_id)
+            .where(Placement.fixture_id == fixture_id)
+        )
+        while not stop.is_set():
+            with Session_() as db:
+                db.execute(stmt).all()
+            with lock:
+                counts["reads"] += 1
+
+    def writer(seed: int) -> None:
+        rng = random.Random(seed)
+        while not stop.is_set():
+            game_id = rng.choice(game_ids)
+            row, col = rng.randrange(ROWS), rng.randrange(COLS)
+            try:
+                with Session_() as db:
+                    db.query(Placement).filter(Placement.game_id == game_id).delete(synchronize_session=False)
+                    db.query(Placement).filter(
+                        Placement.fixture_id == fixture_id, Placement.row == row, Placement.col == col
+                    ).delete(synchronize_session=False)
+                    db.add(Placement(user_id=user_id, fixture_id=fixture_id, row=row, col=col, game_id=game_id))
+                    db.commit()
+                key = "writes"
+            except OperationalError:
+                key = "locked"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for profile in ("default", "wal"):
+        with tempfile.TemporaryDirectory() as tmp:
+            counts = run_profile(profile, Path(tmp) / "bench.db", args.readers, args.writers, args.seconds)
+        print(
+            f"{profile:<8} reads/s={counts['reads'] / args.seconds:9.1f}   "
+            f"writes/s={counts['writes'] / args.seconds:8.1f}   locked errors={counts['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
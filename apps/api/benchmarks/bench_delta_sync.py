@@ -0,0 +1,62 @@
+#apps/api/benchmarks/bench_delta_sync.py
+"""
+Delta sync benchmark
+
+Runs the DB side of the sync pipeline (delta -> enrich -> upsert -> commit)
+for N synthetic collection items against a file-backed SQLite DB:
+- first sync (everything added)
+- no-change re-sync (full mode: every item hashed and compared)
+- re-sync with 1% of items changed
+
+The BGG fetch is replaced by an in-memory list; /thing enrichment by a stub
+that returns nothing, so only local work is measured
+
+Usage:
+    python -m benchmarks.bench_delta_sync --items 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.services.bgg_sync import CollectionDelta, enrich_with_details, upsert_games_from_bgg
+from benchmarks.bench_upsert import synthetic_items
+
+
+def sync_once(Session_, items, *, full: bool) -> tuple[float, dict]:
+    start = time.perf_counter()
+    with Session_() as db:
+        delta = CollectionDelta(db, "benchmark-user", full=full)
+        upsert_games_from_bgg(db, enrich_with_details(db, delta.filter(items), fetch=lambda ids: {}))
+        report = delta.commit()
+    return time.perf_counter() - start, report.as_dict()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5_000)
+    args = parser.parse_args()
+
+    items = synthetic_items(args.items)
+    changed = synthetic_items(args.items, rename_every=100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session_ = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+        for label, batch in (("first sync", items), ("no-change re-sync", items), ("1% changed", changed)):
+            elapsed, report = sync_once(Session_, batch, full=True)
+            summary = ", ".join(f"{k}={report[k]}" for k in ("added", "changed", "unchanged", "removed"))
+            print(f"{label:<20} {elapsed * 1000:8.1f} ms   {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#apps/api/benchmarks/bench_fixture_events.py
+"""
+Fixture change feed load test
+
+Starts the API under uvicorn on a scratch database, connects N clients to
+GET /api/fixtures/{id}/events, then makes placement writes and measures,
+per write, the time from sending the PUT until each client has the diff:
+- write: PUT round trip alone (commit included)
+- fan-out: PUT sent -> event received, across every client
+
+Clients share one asyncio loop in this process, so at high N part of the
+fan-out time is the clients' own parsing; the server side does one
+encode and one queue hand-off per write regardless of N
+
+Usage:
+    python -m benchmarks.bench_fixture_events --clients 1000 --writes 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int):
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def _listen(client, url: str, ready: asyncio.Event, connected: list, n_clients: int, arrivals: dict, writes: int) -> None:
+    async with client.stream("GET", url) as response:
+        buf = ""
+        seen = 0
+        async for chunk in response.aiter_text():
+            buf += chunk
+            while "\n\n" in buf:
+                event, buf = buf.split("\n\n", 1)
+                if event.startswith("event: hello"):
+                    connected.append(1)
+                    if len(connected) == n_clients:
+                        ready.set()
+                elif event.startswith("event: placements"):
+                    version = int(event.split("id: ", 1)[1].split("\n", 1)[0])
+                    arrivals.setdefault(version, []).append(time.perf_counter())
+                    seen += 1
+                    if seen == writes:
+                        return
+
+
+def _pct(samples: list[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def _run(base: str, n_clients: int, writes: int) -> None:
+    import httpx
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=None) as client:
+        fixture = (await client.get("/api/fixtures")).json()[0]
+        games = (await client.get("/api/games", params={"fields": "id"})).json()
+        url = f"/api/fixtures/{fixture['id']}/events"
+
+        ready = asyncio.Event()
+        connected: list = []
+        arrivals: dict[int, list[float]] = {}
+        started = time.perf_counter()
+        listeners = [
+            asyncio.create_task(_listen(client, url, ready, connected, n_clients, arrivals, writes))
+            for _ in range(n_clients)
+        ]
+        await ready.wait()
+        print(f"{n_clients} clients connected in {time.perf_counter() - started:.2f}s")
+
+        sent: dict[int, float] = {}
+        write_ms: list[float] = []
+        slots = [f"r{r}c{c}" for r in range(fixture["rows"]) for c in range(fixture["cols"])]
+        for i in range(writes):
+            t0 = time.perf_counter()
+            res = await client.put(
+                "/api/placements",
+                json={"fixture_id": fixture["id"], "slot": slots[i % len(slots)], "game_id": games[0]["id"]},
+            )
+            write_ms.append((time.perf_counter() - t0) * 1000)
+            sent[int(res.headers["etag"].strip('"'))] = t0
+            await asyncio.sleep(0.2)
+
+        await asyncio.wait_for(asyncio.gather(*listeners), timeout=60)
+
+    fan_out = [(t - sent[v]) * 1000 for v, times in arrivals.items() for t in times]
+    print(f"{writes} writes, {len(fan_out)} deliveries\n")
+    print(f"{'':<10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, samples in (("write", write_ms), ("fan-out", fan_out)):
+        print(f"{name:<10}{statistics.median(samples):>10.2f}{_pct(samples, 0.99):>10.2f}{max(samples):>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--writes", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Before importing the app, which opens its database on import
+        os.environ["API_DATA_DIR"] = tmp
+        port = _free_port()
+        server, thread = _start_server(port)
+        try:
+            asyncio.run(_run(f"http://127.0.0.1:{port}", args.clients, args.writes))
+        finally:
+            server.should_exit = True
+            thread.join(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#apps/api/benchmarks/bench_games_listing.py
+"""
+GET /api/games listing benchmark
+
+Loads N synthetic games into a file-backed SQLite DB and times, per mode,
+the first response chunk (time to first byte, minus HTTP) and the full body:
+- legacy: ORM query + list[GameWithPlacementOut], the pre-streaming handler
+- stream: unpaginated streamed listing
+- page 1 / deep page: `limit=50` keyset pages at the start and near the end
+- projected page: `limit=50&fields=name,slot`
+
+Usage:
+    python -m benchmarks.bench_games_listing --games 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Game, Placement, User
+from app.services.users import LOCAL_COLLECTION, add_to_collection, ensure_collection
+from app.schemas import GameWithPlacementOut
+from app.services.bgg_sync import upsert_games_from_bgg
+from app.services.game_listing import (
+    iter_json,
+    listing_query,
+    next_cursor,
+    parse_fields,
+    stream_all,
+)
+from benchmarks.bench_upsert import synthetic_items
+
+
+def legacy(Session_) -> list[bytes]:
+    with Session_() as db:
+        rows = db.query(Game, Placement).outerjoin(Placement, Placement.game_id == Game.id).order_by(Game.name).all()
+        out = [
+            GameWithPlacementOut(
+                id=g.id, bgg_id=g.bgg_id, name=g.name, year_published=g.year_published,
+                thumbnail_url=g.thumbnail_url, image_url=g.image_url,
+                fixture_id=p.fixture_id if p else None, slot=p.slot if p else None,
+            ).model_dump()
+            for g, p in rows
+        ]
+    yield json.dumps(out).encode()
+
+
+def page(Session_, user_id: int, *, fields: str | None = None, after: list | None = None):
+    selected = parse_fields(fields)
+    with Session_() as db:
+        rows = db.execute(listing_query(selected, user_id=user_id, after=after, limit=50)).all()
+    next_cursor(rows, selected, 50)
+    yield from iter_json(rows[:50], selected)
+
+
+def _time(chunks) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    first = next(chunks)
+    ttfb = time.perf_counter() - start
+    size = len(first) + sum(len(c) for c in chunks)
+    return ttfb * 1000, (time.perf_counter() - start) * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session_ = sessionmaker(bind=engine)
+        with Session_() as db:
+            upsert_games_from_bgg(db, synthetic_items(args.games))
+            user = User(username="bench")
+            db.add(user)
+            db.flush()
+            user_id = user.id
+            add_to_collection(db, ensure_collection(db, user_id, LOCAL_COLLECTION).id, db.scalars(select(Game.id)))
+            db.commit()
+            last = db.query(Game.name, Game.id).order_by(Game.name.desc(), Game.id.desc()).offset(60).first()
+
+        everything = parse_fields(None)
+        modes = {
+            "legacy": lambda: legacy(Session_),
+            "stream": lambda: stream_all(Session_, listing_query(everything, user_id=user_id), everything),
+            "page 1": lambda: page(Session_, user_id),
+            "deep page": lambda: page(Session_, user_id, after=list(last)),
+            "projected page": lambda: page(Session_, user_id, fields="name,slot"),
+        }
+
+        print(f"{args.games} games\n")
+        print(f"{'mode':<16}{'ttfb ms':>10}{'total ms':>10}{'bytes':>12}")
+        for mode, run in modes.items():
+            ttfb, total, size = _time(run())
+            print(f"{mode:<16}{ttfb:>10.2f}{total:>10.2f}{size:>12}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Grid sprite benchmark: one packed image instead of a request per cell
+
+Seeds a scratch database with an R x C fixture (default 50x50) whose every
+slot holds a game with a thumbnail, served by an in-process httpx mock CDN.
+Then times:
+- per-cell: every cell's thumb fetched through the image cache (warm), as
+  the browser would with one request per cell
+- sprite build: packing the warm thumbnails into one sprite
+- sprite hit: the cached sprite, what each later grid load costs
+
+Usage:
+    python -m benchmarks.bench_grid_sprite --rows 50 --cols 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import make_engine
+from app.migrations import upgrade_schema
+from app.models import Base, Fixture, Game, Placement, User
+from app.services.grid_sprite import GridSprites, build_sprite
+from app.services.image_cache import ImageCache
+from benchmarks.bench_images import _cdn
+
+
+def _seed(Session_, rows: int, cols: int, urls: list[str]) -> int:
+    with Session_() as db:
+        user_id = db.scalar(insert(User).values(username="bench").returning(User.id))
+        fixture_id = db.scalar(
+            insert(Fixture).values(user_id=user_id, name="Wall", rows=rows, cols=cols).returning(Fixture.id)
+        )
+        db.execute(
+            insert(Game),
+            [{"bgg_id": i + 1, "name": f"Game {i}", "thumbnail_url": url} for i, url in enumerate(urls)],
+        )
+        game_ids = list(db.scalars(select(Game.id).order_by(Game.bgg_id)))
+        db.execute(
+            insert(Placement),
+            [
+                {"user_id": user_id, "fixture_id": fixture_id, "row": i // cols, "col": i % cols, "game_id": gid}
+                for i, gid in enumerate(game_ids[: rows * cols])
+            ],
+        )
+        db.commit()
+    return fixture_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--source-px", type=int, default=150, help="BGG thumbnails are about 150-200px")
+    args = parser.parse_args()
+
+    cells = args.rows * args.cols
+    transport, urls, _ = _cdn(args.source_px, cells)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        Session_ = sessionmaker(bind=engine, autoflush=False)
+        fixture_id = _seed(Session_, args.rows, args.cols, urls)
+        images = ImageCache(Path(tmp) / "images", http=httpx.Client(transport=transport))
+        images.prefetch(urls, "thumb")
+        for url in urls:
+            images.get(url, "thumb", timeout=None)
+
+        start = time.perf_counter()
+        per_cell = sum(len(images.read(images.get(url, "thumb"))) for url in urls)
+        per_cell_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sprite = build_sprite(Session_, images, fixture_id)
+        build_s = time.perf_counter() - start
+
+        sprites = GridSprites()
+        sprites.get(Session_, images, fixture_id, sprite.version)
+        start = time.perf_counter()
+        for _ in range(100):
+            sprites.get(Session_, images, fixture_id, sprite.version)
+        hit_s = (time.perf_counter() - start) / 100
+
+        print(f"{args.rows}x{args.cols} fixture, every slot filled\n")
+        print(f"{'load':<14}{'requests':>10}{'KiB':>10}{'ms':>10}")
+        print(f"{'per-cell':<14}{cells:>10}{per_cell // 1024:>10}{per_cell_s * 1000:>10.1f}")
+        sprite_kib = (len(sprite.image) + len(sprite.offsets)) // 1024
+        print(f"{'sprite build':<14}{2:>10}{sprite_kib:>10}{build_s * 1000:>10.1f}")
+        print(f"{'sprite hit':<14}{2:>10}{sprite_kib:>10}{hit_s * 1000:>10.3f}")
+        images.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
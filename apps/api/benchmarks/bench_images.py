@@ -0,0 +1,85 @@
+"""
+Image cache benchmark: loading every image of a big grid
+
+Simulates one browser opening an R x C grid (default 50x50 = 2,500 cells),
+each cell requesting its game's image at `--size`, from 40 request threads
+(the size of Starlette's threadpool). The CDN is an in-process httpx mock
+serving `--source-px` square JPEGs, so only our own work is timed:
+- cold: every image downloaded once and resized on the worker pool
+- warm: every image served from disk (what each later grid load costs)
+
+The cold pass is repeated per worker-pool size. Bytes are what the browser
+receives compared with the full-size art it used to fetch
+
+Usage:
+    python -m benchmarks.bench_images --rows 50 --cols 50 --workers 1,2,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+from app.services.image_cache import ImageCache
+
+
+def _source(px: int, seed: int) -> bytes:
+    # Noise compresses like real box art, unlike a flat colour
+    img = Image.effect_noise((px, px), 40 + seed % 50).convert("RGB")
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def _cdn(px: int, distinct: int) -> tuple[httpx.MockTransport, list[str], int]:
+    bodies = [_source(px, i) for i in range(distinct)]
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=bodies[int(request.url.path.strip("/").split(".")[0])])
+    )
+    urls = [f"https://cdn.example/{i}.jpg" for i in range(distinct)]
+    return transport, urls, sum(len(b) for b in bodies) // distinct
+
+
+def _load_grid(cache: ImageCache, urls: list[str], cells: int, size: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=40) as requests:
+        served = sum(
+            requests.map(lambda i: len(cache.read(cache.get(urls[i % len(urls)], size, timeout=None))), range(cells))
+        )
+    return time.perf_counter() - start, served
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--size", default="small")
+    parser.add_argument("--source-px", type=int, default=600)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    cells = args.rows * args.cols
+    transport, urls, source_bytes = _cdn(args.source_px, cells)
+    print(f"{cells} cells, {args.source_px}px sources ({source_bytes // 1024} KiB avg), size={args.size}\n")
+    print(f"{'workers':>8}  {'pass':<6}{'total s':>10}{'ms/img':>10}{'KiB sent':>12}{'vs full art':>13}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ImageCache(Path(tmp), workers=workers, http=httpx.Client(transport=transport))
+            for label in ("cold", "warm"):
+                seconds, served = _load_grid(cache, urls, cells, args.size)
+                print(
+                    f"{workers:>8}  {label:<6}{seconds:>10.2f}{seconds * 1000 / cells:>10.2f}"
+                    f"{served // 1024:>12}{served / (source_bytes * cells):>12.1%}"
+                )
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#apps/api/benchmarks/bench_json.py
+"""
+Per-row JSON serialization cost for the hot read endpoints
+
+Times encoding N GameWithPlacementOut-shaped rows (the /api/games payload):
+- pydantic: build models row by row, then jsonable_encoder + json.dumps,
+  which is what `response_model` did for list_games before
+- pydantic-core: build models, one TypeAdapter.dump_json
+- stdlib json: Core row tuples -> dicts -> json.dumps
+- fast_json: Core row tuples -> dicts -> services.fast_json (orjson if installed)
+
+Usage:
+    python -m benchmarks.bench_json --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.schemas import GameWithPlacementOut
+from app.services import fast_json
+from app.services.game_listing import GAME_FIELDS
+
+KEYS = tuple(GAME_FIELDS)
+
+
+def synthetic_rows(n: int) -> list[tuple]:
+    return [
+        (
+            i,
+            100_000 + i,
+            f"Synthetic Game {i}",
+            1990 + i % 35,
+            f"https://cf.geekdo-images.com/thumb/{i}.jpg",
+            f"https://cf.geekdo-images.com/original/{i}.jpg",
+            1 if i % 3 == 0 else None,
+            f"r{i % 10}c{i % 7}" if i % 3 == 0 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def pydantic_fastapi(rows) -> bytes:
+    models = [GameWithPlacementOut(**dict(zip(KEYS, row))) for row in rows]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+_ADAPTER = TypeAdapter(list[GameWithPlacementOut])
+
+
+def pydantic_core(rows) -> bytes:
+    return _ADAPTER.dump_json([GameWithPlacementOut(**dict(zip(KEYS, row))) for row in rows])
+
+
+def stdlib_json(rows) -> bytes:
+    return json.dumps([dict(zip(KEYS, row)) for row in rows], separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def fast(rows) -> bytes:
+    return fast_json.rows_to_json(rows, KEYS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"{args.rows} rows, best of {args.repeat}; fast_json uses {encoder}\n")
+    print(f"{'mode':<16}{'total ms':>10}{'ns/row':>10}{'vs pydantic':>13}")
+
+    baseline = None
+    for name, fn in (("pydantic", pydantic_fastapi), ("pydantic-core", pydantic_core), ("stdlib json", stdlib_json), ("fast_json", fast)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(rows)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{name:<16}{best * 1000:>10.2f}{best / args.rows * 1e9:>10.0f}{baseline / best:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Per-user query latency as collections and the number of users grow
+
+For each collection size G (default 1,000 -> 10,000 -> 100,000 games per
+user), seeds a scratch database whose catalog holds 2G games, then adds
+users in steps (default 10 -> 50). Each user owns a random G-game subset in
+one collection, and has one 10x10 fixture with 100 of their games placed.
+After each step, for a sample of users, times:
+- page 1: GET /api/games?limit=50 (the user's games, by name)
+- page 20: the same, 19 cursors in
+- full list: GET /api/games (every game the user owns)
+- search: GET /api/games?q=... (a selective and a broad query)
+- grid: GET /api/fixtures/{id}/grid (rendered, cache bypassed)
+- fixtures: GET /api/fixtures
+
+Queries run in-process on the same statements the routes use. Flat rows
+across user steps mean per-user cost does not depend on the number of
+users; flat page rows across collection sizes mean a page costs the same
+however many games its user owns (the full list and broad searches grow
+with the collection, as they must)
+
+Usage:
+    python -m benchmarks.bench_multi_user --users 50 --games-per-user 1000,10000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import make_engine
+from app.migrations import upgrade_schema
+from app.models import Base, Collection, CollectionGame, Fixture, Game, Placement, User
+from app.routes.fixtures import list_fixtures_stmt
+from app.services.bgg_sync import upsert_games_from_bgg
+from app.services.fixture_grid import render_grid
+from app.services.game_listing import listing_query, parse_fields
+from app.services.game_search import fts_supported
+from benchmarks.bench_upsert import synthetic_items
+
+ROWS, COLS = 10, 10
+
+
+def _add_users(Session_, first: int, last: int, game_ids: list[int], per_user: int, rng: random.Random) -> None:
+    """Users first..last-1, each with a collection, a fixture and placements"""
+    with Session_() as db:
+        for start in range(first, last, 50):
+            names = [{"username": f"user{i}"} for i in range(start, min(start + 50, last))]
+            user_ids = list(db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), names))
+            collection_ids = list(
+                db.scalars(
+                    insert(Collection).returning(Collection.id, sort_by_parameter_order=True),
+                    [{"user_id": uid, "name": "local"} for uid in user_ids],
+                )
+            )
+            fixture_ids = list(
+                db.scalars(
+                    insert(Fixture).returning(Fixture.id, sort_by_parameter_order=True),
+                    [{"user_id": uid, "name": "Shelf", "rows": ROWS, "cols": COLS} for uid in user_ids],
+                )
+            )
+            owned, placed = [], []
+            for uid, cid, fid in zip(user_ids, collection_ids, fixture_ids):
+                games = rng.sample(game_ids, per_user)
+                owned.extend({"collection_id": cid, "game_id": gid} for gid in games)
+                placed.extend(
+                    {"user_id": uid, "fixture_id": fid, "row": i // COLS, "col": i % COLS, "game_id": gid}
+                    for i, gid in enumerate(games[: ROWS * COLS])
+                )
+            db.execute(insert(CollectionGame), owned)
+            db.execute(insert(Placement), placed)
+            db.commit()
+
+
+def _timed(fn, repeat: int) -> list[float]:
+    out = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - start) * 1000)
+    return out
+
+
+def _page(db, fields, user_id: int, pages: int) -> None:
+    after = None
+    for _ in range(pages):
+        rows = db.execute(listing_query(fields, user_id=user_id, limit=50, after=after)).all()
+        after = list(rows[49][len(fields):])
+
+
+def _measure(Session_, n_users: int, sample: int, rng: random.Random) -> dict[str, list[float]]:
+    everything = parse_fields(None)
+    timings: dict[str, list[float]] = {}
+    with Session_() as db:
+        use_fts = fts_supported(db.get_bind())
+        users = db.execute(
+            select(User.id, Fixture.id).join(Fixture, Fixture.user_id == User.id).where(
+                User.id.in_(rng.sample(range(1, n_users + 1), min(sample, n_users)))
+            )
+        ).all()
+        for user_id, fixture_id in users:
+            queries = {
+                "page 1": lambda: _page(db, everything, user_id, 1),
+                "page 20": lambda: _page(db, everything, user_id, 20),
+                "full list": lambda: db.execute(listing_query(everything, user_id=user_id)).all(),
+                "search (1 hit)": lambda: db.execute(
+                    listing_query(everything, user_id=user_id, q=f"game {rng.randrange(10_000)}", use_fts=use_fts)
+                ).all(),
+                "search (broad)": lambda: db.execute(
+                    listing_query(everything, user_id=user_id, q="synthetic", use_fts=use_fts, limit=50)
+                ).all(),
+                "grid": lambda: render_grid(db, fixture_id),
+                "fixtures": lambda: db.execute(list_fixtures_stmt(user_id)).all(),
+            }
+            for name, fn in queries.items():
+                timings.setdefault(name, []).extend(_timed(fn, 3))
+    timings["page 20"] = [t / 20 for t in timings["page 20"]]  # per page
+    return timings
+
+
+def _run(per_user: int, user_steps: list[int], sample: int) -> None:
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        Session_ = sessionmaker(bind=engine, autoflush=False)
+        with Session_() as db:
+            upsert_games_from_bgg(db, synthetic_items(2 * per_user))
+            game_ids = list(db.scalars(select(Game.id)))
+
+        print(f"\n{per_user} games per user, {len(game_ids)} in the catalog")
+        seeded = 0
+        for n_users in user_steps:
+            start = time.perf_counter()
+            _add_users(Session_, seeded + 1, n_users + 1, game_ids, per_user, rng)
+            seeded = n_users
+            print(f"{'':>9}{'':>7}  (seeded up to {n_users} users in {time.perf_counter() - start:.1f}s)")
+            for name, samples in _measure(Session_, n_users, sample, rng).items():
+                samples.sort()
+                p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+                print(f"{per_user:>9}{n_users:>7}  {name:<16}{statistics.median(samples):>10.2f}{p99:>10.2f}")
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument(
+        "--games-per-user", default="1000,10000,100000", help="comma-separated collection sizes, one database each"
+    )
+    parser.add_argument("--sample", type=int, default=20, help="users timed per step")
+    args = parser.parse_args()
+
+    user_steps = sorted({s for s in (10, args.users) if s <= args.users})
+    sizes = [int(size) for size in args.games_per_user.split(",")]
+    print(f"{'games':>9}{'users':>7}  {'query':<16}{'p50 ms':>10}{'p99 ms':>10}")
+    for per_user in sizes:
+        _run(per_user, user_steps, args.sample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#apps/api/benchmarks/bench_parse_memory.py
+"""
+Collection XML parsing memory benchmark
+
+Writes a synthetic /xmlapi2/collection document with N items to a temp file,
+then compares peak Python heap (tracemalloc) for:
+- dom: ElementTree.parse of the whole document (what a naive parser does)
+- stream: `iter_collection_items`, consuming items one at a time
+
+Usage:
+    python -m benchmarks.bench_parse_memory --items 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable
+
+from app.bgg.client import iter_collection_items
+
+ITEM_TEMPLATE = """\t<item objecttype="thing" objectid="{id}" subtype="boardgame" collid="{collid}">
+\t\t<name sortindex="1">Synthetic Game {i}</name>
+\t\t<yearpublished>{year}</yearpublished>
+\t\t<image>https://cf.geekdo-images.com/original/img/pic{id}.jpg</image>
+\t\t<thumbnail>https://cf.geekdo-images.com/small/img/pic{id}.jpg</thumbnail>
+\t\t<status own="1" prevowned="0" fortrade="0" want="0" wanttoplay="0" wanttobuy="0" wishlist="0" preordered="0" lastmodified="2025-01-01 00:00:00" />
+\t\t<numplays>{plays}</numplays>
+\t</item>
+"""
+
+
+def write_collection(path: Path, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n')
+        f.write(f'<items totalitems="{n}" termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">\n')
+        for i in range(n):
+            f.write(ITEM_TEMPLATE.format(id=100_000 + i, collid=9_000_000 + i, i=i, year=1990 + i % 35, plays=i % 17))
+        f.write("</items>\n")
+
+
+def dom_count(path: Path) -> int:
+    tree = ET.parse(path)
+    return sum(1 for _ in tree.getroot().iter("item"))
+
+
+def stream_count(path: Path) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in iter_collection_items(f))
+
+
+def measure(label: str, fn: Callable[[Path], int], path: Path) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} items={count:<8} peak={peak / 1024 / 1024:8.2f} MiB   {elapsed * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "collection.xml"
+        write_collection(path, args.items)
+        print(f"document: {path.stat().st_size / 1024 / 1024:.1f} MiB, {args.items} items")
+
+        measure("dom", dom_count, path)
+        measure("stream", stream_count, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Read model benchmark: hot reads from memory instead of SQLite
+
+Seeds a scratch database with one user owning N games (default 20,000) and
+a 50x50 fixture with every cell filled, then times each hot read both ways:
+- database: the statements the routes run without API_READ_MODEL
+- model: services/read_model.py, after its initial load
+
+Grid renders bypass the grid cache on both sides, and "grid version" is the
+per-request lookup behind ETags and 304s. Also reports how long the model
+takes to load and the memory it holds
+
+Usage:
+    python -m benchmarks.bench_read_model --games 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import make_engine
+from app.migrations import upgrade_schema
+from app.models import Base, Fixture, Game, Placement, User
+from app.routes.fixtures import fixture_version_stmt, list_fixtures_stmt
+from app.services.bgg_sync import upsert_games_from_bgg
+from app.services.fixture_grid import grid_cache, render_grid
+from app.services.game_listing import listing_query, parse_fields
+from app.services.read_model import ReadModel
+from app.services.users import LOCAL_COLLECTION, add_to_collection, ensure_collection
+from benchmarks.bench_upsert import synthetic_items
+
+ROWS, COLS = 50, 50
+
+
+def _seed(Session_, n_games: int) -> tuple[int, int]:
+    with Session_() as db:
+        upsert_games_from_bgg(db, synthetic_items(n_games))
+        user_id = db.scalar(insert(User).values(username="bench").returning(User.id))
+        game_ids = list(db.scalars(select(Game.id)))
+        add_to_collection(db, ensure_collection(db, user_id, LOCAL_COLLECTION).id, game_ids)
+        fixture_id = db.scalar(
+            insert(Fixture).values(user_id=user_id, name="Wall", rows=ROWS, cols=COLS).returning(Fixture.id)
+        )
+        db.execute(
+            insert(Placement),
+            [
+                {"user_id": user_id, "fixture_id": fixture_id, "row": i // COLS, "col": i % COLS, "game_id": gid}
+                for i, gid in enumerate(game_ids[: ROWS * COLS])
+            ],
+        )
+        db.commit()
+    return user_id, fixture_id
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _uncached(render):
+    def run():
+        grid_cache.clear()
+        return render()
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    everything = parse_fields(None)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        Session_ = sessionmaker(bind=engine, autoflush=False)
+        user_id, fixture_id = _seed(Session_, args.games)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        model = ReadModel(Session_)
+        model.fixtures_of(user_id)
+        load_s = time.perf_counter() - start
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        with Session_() as db:
+            reads = {
+                "page 1": (
+                    lambda: db.execute(listing_query(everything, user_id=user_id, limit=50)).all(),
+                    lambda: model.games_page(user_id, everything, limit=50),
+                ),
+                "full list": (
+                    lambda: db.execute(listing_query(everything, user_id=user_id)).all(),
+                    lambda: model.games_page(user_id, everything),
+                ),
+                "fixtures": (
+                    lambda: db.execute(list_fixtures_stmt(user_id)).all(),
+                    lambda: model.fixtures_of(user_id),
+                ),
+                "grid version": (
+                    lambda: db.scalar(fixture_version_stmt(fixture_id, user_id)),
+                    lambda: model.fixture_version(fixture_id, user_id),
+                ),
+                "grid render": (
+                    _uncached(lambda: render_grid(db, fixture_id)),
+                    _uncached(lambda: model.grid_json(fixture_id, user_id)),
+                ),
+            }
+
+            print(f"{args.games} games, {ROWS}x{COLS} fixture filled")
+            print(f"model load {load_s * 1000:.0f} ms, {held / 2**20:.1f} MiB held\n")
+            print(f"{'read':<14}{'database ms':>13}{'model ms':>11}{'speedup':>10}")
+            for name, (database, in_memory) in reads.items():
+                db_ms = _median_ms(database, args.repeat)
+                model_ms = _median_ms(in_memory, args.repeat)
+                print(f"{name:<14}{db_ms:>13.3f}{model_ms:>11.3f}{db_ms / model_ms:>9.1f}x")
+        model.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#apps/api/benchmarks/bench_search.py
+"""
+Game search benchmark
+
+Loads N synthetic games into a file-backed SQLite DB and reports p50/p99
+latency of the /api/games name search query for:
+- like: the previous `name ILIKE '%q%'` full scan
+- fts: `apply_name_search` over the FTS5 trigram index
+
+Hit counts differ where the syntax does: LIKE treats the whole query as one
+literal substring ("castle*" matches nothing), search ANDs the words. Broad
+queries are dominated by loading thousands of rows either way; selective
+ones show the index
+
+Usage:
+    python -m benchmarks.bench_search --games 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import Base, Game, Placement
+from app.services.bgg_sync import upsert_games_from_bgg
+from app.services.game_search import apply_name_search
+from benchmarks.bench_upsert import synthetic_items
+
+_WORDS = (
+    "Ancient", "Castle", "Dragon", "Empire", "Forest", "Galaxy", "Harbor", "Island",
+    "Kingdom", "Legends", "Mystic", "Ocean", "Pirates", "Quest", "Railways", "Shadows",
+    "Temple", "Valley", "Wonders", "Zeppelin",
+)
+
+QUERIES = ("wond", "dragon quest", "castle*", "ship", "xyzzy", "kingdom 12")
+
+
+def _named_items(n: int):
+    rng = random.Random(7)
+    for i, item in enumerate(synthetic_items(n)):
+        words = " ".join(rng.sample(_WORDS, 3))
+        yield item.__class__(**{**item.__dict__, "name": f"{words} {i}"})
+
+
+def _run(db: Session, q: str, *, use_fts: bool) -> int:
+    qry = db.query(Game, Placement).outerjoin(Placement, Placement.game_id == Game.id)
+    if use_fts:
+        qry = apply_name_search(qry, q, use_fts=True)
+    else:
+        qry = qry.filter(Game.name.ilike(f"%{q}%")).order_by(Game.name.asc())
+    return len(qry.all())
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50, help="runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session_ = sessionmaker(bind=engine)
+
+        with Session_() as db:
+            start = time.perf_counter()
+            upsert_games_from_bgg(db, _named_items(args.games))
+            print(f"loaded {args.games} games in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'query':<16}{'mode':<6}{'hits':>7}{'p50 ms':>10}{'p99 ms':>10}")
+        with Session_() as db:
+            for q in QUERIES:
+                for mode in ("like", "fts"):
+                    use_fts = mode == "fts"
+                    timings = []
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        hits = _run(db, q, use_fts=use_fts)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    p50, p99 = _percentiles(timings)
+                    print(f"{q:<16}{mode:<6}{hits:>7}{p50:>10.2f}{p99:>10.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
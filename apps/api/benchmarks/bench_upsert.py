@@ -0,0 +1,113 @@
+#apps/api/benchmarks/bench_upsert.py
+"""
+Bulk sync benchmark
+
+Syncs N synthetic BggCollectionItems into a file-backed SQLite DB and times:
+- legacy: one SELECT per item through the ORM (the pre-bulk implementation)
+- bulk (cold): `upsert_games_from_bgg` into an empty table
+- bulk (re-sync, unchanged): same items again, every row skipped
+- bulk (re-sync, 10% changed)
+
+Usage:
+    python -m benchmarks.bench_upsert --items 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.bgg.client import BggCollectionItem
+from app.models import Base, Game
+from app.services.bgg_sync import upsert_games_from_bgg
+
+
+def synthetic_items(n: int, *, rename_every: int = 0) -> list[BggCollectionItem]:
+    items = []
+    for i in range(n):
+        suffix = " (revised)" if rename_every and i % rename_every == 0 else ""
+        items.append(
+            BggCollectionItem(
+                bgg_id=100_000 + i,
+                name=f"Synthetic Game {i}{suffix}",
+                year_published=1990 + i % 35,
+                thumbnail_url=f"https://cf.geekdo-images.com/thumb/{i}.jpg",
+                image_url=f"https://cf.geekdo-images.com/original/{i}.jpg",
+            )
+        )
+    return items
+
+
+def legacy_upsert(db: Session, items: list[BggCollectionItem]) -> int:
+    """The original per-item implementation, kept here as the baseline."""
+    processed = 0
+    for item in items:
+        game = db.query(Game).filter(Game.bgg_id == item.bgg_id).one_or_none()
+        if game is None:
+            db.add(
+                Game(
+                    bgg_id=item.bgg_id,
+                    name=item.name,
+                    year_published=item.year_published,
+                    thumbnail_url=item.thumbnail_url,
+                    image_url=item.image_url,
+                )
+            )
+        else:
+            game.name = item.name
+            game.year_published = item.year_published
+            game.thumbnail_url = item.thumbnail_url
+            game.image_url = item.image_url
+        processed += 1
+    db.commit()
+    return processed
+
+
+def _fresh_db(path: Path) -> sessionmaker:
+    if path.exists():
+        path.unlink()
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms   {out}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    args = parser.parse_args()
+
+    items = synthetic_items(args.items)
+    changed = synthetic_items(args.items, rename_every=10)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+
+        Session_ = _fresh_db(db_path)
+        with Session_() as db:
+            _timed("legacy (cold)", lambda: legacy_upsert(db, items))
+        with Session_() as db:
+            _timed("legacy (re-sync)", lambda: legacy_upsert(db, items))
+
+        Session_ = _fresh_db(db_path)
+        with Session_() as db:
+            _timed("bulk (cold)", lambda: upsert_games_from_bgg(db, items))
+        with Session_() as db:
+            _timed("bulk (re-sync, unchanged)", lambda: upsert_games_from_bgg(db, items))
+        with Session_() as db:
+            _timed("bulk (re-sync, 10% changed)", lambda: upsert_games_from_bgg(db, changed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Benchmark suite: generated datasets, end-to-end scenarios, saved results
+
+- dataset.py: deterministic synthetic data, 1k to 1M games and up to 1,000
+  fixtures of up to 50x50, cached as SQLite files
+- scenarios.py: search, grid rendering, placement writes, bulk sync and cold
+  startup through the real routes
+- harness.py: timing, JSON results and comparison with a baseline
+
+Run from apps/api:
+    python -m benchmarks.suite --preset medium --save base.json
+    python -m benchmarks.suite --preset medium --compare base.json
+"""
@@ -0,0 +1,99 @@
+"""
+Benchmark suite runner
+
+Builds (or reuses) the dataset for the chosen spec, runs the scenario
+groups on a scratch copy of it and prints median / p95 / min per scenario.
+Results are saved as JSON (--save, default <data dir>/results/<time>.json).
+With --compare, the medians are checked against a baseline results file
+and the exit status is 1 if any scenario got slower than --threshold;
+--results compares an existing file instead of running
+
+Usage:
+    python -m benchmarks.suite --preset tiny --only search,grid
+    python -m benchmarks.suite --preset large --save large-main.json
+    python -m benchmarks.suite --preset large --compare large-main.json --threshold 0.15
+    python -m benchmarks.suite --results new.json --compare large-main.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.suite.dataset import add_spec_arguments, dataset_file, default_data_dir, spec_from_args
+from benchmarks.suite.harness import (
+    compare,
+    format_comparison,
+    load_results,
+    regressions,
+    results_document,
+    save_results,
+)
+from benchmarks.suite.scenarios import GROUPS, BenchApp, run_groups
+
+
+def _groups(value: str) -> list[str]:
+    groups = [g.strip() for g in value.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown group(s) {', '.join(sorted(unknown))}; choose from {', '.join(GROUPS)}")
+    return groups
+
+
+def _run(args: argparse.Namespace) -> dict:
+    info = dataset_file(spec_from_args(args), args.data_dir)
+    print(f"dataset: {info.games} games, {info.fixtures} fixtures, {info.placements} placements ({info.path})")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench = BenchApp(info, Path(tmp))
+        try:
+            results = run_groups(
+                bench, args.only, rounds=args.rounds, slow_rounds=args.slow_rounds, sync_items=args.sync_items
+            )
+        finally:
+            bench.close()
+
+    print(f"\n{'scenario':<32}{'median ms':>11}{'p95 ms':>10}{'min ms':>10}{'rounds':>8}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats.median * 1000:>11.3f}{stats.p95 * 1000:>10.3f}{stats.min * 1000:>10.3f}{stats.rounds:>8}")
+
+    document = results_document(info.as_dict(), results)
+    path = args.save or (args.data_dir or default_data_dir()) / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_results(path, document)
+    print(f"\nsaved {path}")
+    return document
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_spec_arguments(parser)
+    parser.add_argument("--only", type=_groups, default=list(GROUPS), help=f"comma-separated groups: {','.join(GROUPS)}")
+    parser.add_argument("--rounds", type=int, default=30, help="timed rounds per request scenario")
+    parser.add_argument("--slow-rounds", type=int, default=5, help="timed rounds for sync and startup")
+    parser.add_argument("--sync-items", type=int, default=10_000, help="collection size for the sync scenario")
+    parser.add_argument("--save", type=Path, help="results file to write")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="median slowdown that counts as a regression")
+    parser.add_argument("--results", type=Path, help="compare this results file instead of running")
+    args = parser.parse_args()
+
+    current = load_results(args.results) if args.results else _run(args)
+    if args.compare is None:
+        return
+
+    baseline = load_results(args.compare)
+    if baseline["dataset"].get("spec") != current["dataset"].get("spec"):
+        print("\nwarning: the baseline was run on a different dataset spec", file=sys.stderr)
+    comparisons = compare(baseline, current)
+    print(f"\nagainst {args.compare} (threshold {args.threshold:.0%}):")
+    print(format_comparison(comparisons, args.threshold))
+    slower = regressions(comparisons, args.threshold)
+    if slower:
+        print(f"\n{len(slower)} regression(s): {', '.join(c.name for c in slower)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Synthetic datasets at realistic scale
+
+One user ("default", whom requests without X-User act as) owns every game
+and fixture. Games get BGG-like names built from common title words, years
+skewed towards recent releases and image URLs. Fixtures are mostly cube
+shelves (2x2, 4x4, 5x5, ...) with a few large walls, and the first one is
+always the largest allowed shape, so grid benchmarks have a full-size grid
+to render. Each fixture is filled to a density drawn around `density`,
+until the games run out (a game has one location)
+
+Generation is deterministic for a given spec and seed. Datasets are SQLite
+files kept under a cache directory by spec, so the 1M-game one is built
+once; `build_dataset` works on any engine (PostgreSQL too)
+
+Usage:
+    python -m benchmarks.suite.dataset --preset medium
+    python -m benchmarks.suite.dataset --games 250000 --fixtures 400 --density 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.db import make_engine
+from app.migrations import upgrade_schema
+from app.models import Base, Collection, CollectionGame, Fixture, Game, Placement, User
+from app.services.users import DEFAULT_USERNAME, LOCAL_COLLECTION
+
+# Bump when generation changes, so cached files are rebuilt
+DATASET_VERSION = 2
+
+_INSERT_CHUNK = 5_000
+
+_WORDS = (
+    "Ancient", "Arcana", "Castle", "Catan", "Century", "Clans", "Colony", "Crown", "Dragon",
+    "Dune", "Empire", "Expedition", "Forest", "Frontier", "Galaxy", "Gloom", "Harbor", "Heroes",
+    "Island", "Kingdom", "Legacy", "Legends", "Lost", "Mansion", "Mars", "Mystic", "Ocean",
+    "Pandemic", "Pirates", "Quest", "Railways", "Realm", "Shadows", "Spirit", "Star", "Temple",
+    "Terra", "Tides", "Trails", "Valley", "Village", "Wings", "Wonders", "Zeppelin",
+)
+_SUFFIXES = ("", "", "", "", ": Second Edition", ": Big Box", " Duel", " Deluxe", ": Legacy", " Junior")
+
+# (rows, cols) of everyday furniture and how common each is
+_SHELVES = (
+    ((2, 2), 20), ((4, 4), 20), ((1, 4), 10), ((2, 4), 12), ((5, 5), 10),
+    ((3, 3), 8), ((2, 5), 8), ((1, 5), 6), ((4, 2), 6),
+)
+# Share of fixtures that are walls: 10x10 up to the largest allowed shape
+_WALL_SHARE = 0.05
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    games: int = 10_000
+    fixtures: int = 50
+    max_rows: int = 50
+    max_cols: int = 50
+    density: float = 0.7  # mean share of a fixture's cells holding a game
+    seed: int = 7
+
+    def key(self) -> str:
+        raw = json.dumps({"version": DATASET_VERSION, **dataclasses.asdict(self)}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()[:12]
+
+
+PRESETS = {
+    "tiny": DatasetSpec(games=1_000, fixtures=10),
+    "small": DatasetSpec(games=10_000, fixtures=50),
+    "medium": DatasetSpec(games=100_000, fixtures=200),
+    "large": DatasetSpec(games=1_000_000, fixtures=1_000),
+}
+
+
+@dataclass
+class DatasetInfo:
+    path: Path | None
+    spec: DatasetSpec
+    user_id: int
+    fixture_id: int  # the largest fixture
+    games: int
+    fixtures: int
+    placements: int
+    build_seconds: float
+
+    def as_dict(self) -> dict:
+        return {
+            "spec": dataclasses.asdict(self.spec),
+            "games": self.games,
+            "fixtures": self.fixtures,
+            "placements": self.placements,
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+def game_rows(spec: DatasetSpec):
+    """Game rows for INSERT, in bgg_id order"""
+    rng = random.Random(spec.seed)
+    for i in range(spec.games):
+        words = " ".join(rng.sample(_WORDS, rng.choice((1, 2, 2, 3))))
+        bgg_id = 1_000 + i
+        yield {
+            "bgg_id": bgg_id,
+            # Names repeat at scale, as on BGG
+            "name": f"{words}{rng.choice(_SUFFIXES)}",
+            "year_published": 2025 - min(60, int(rng.expovariate(1 / 8))),
+            "thumbnail_url": f"https://cf.geekdo-images.com/thumb/pic{bgg_id}.jpg",
+            "image_url": f"https://cf.geekdo-images.com/original/pic{bgg_id}.jpg",
+        }
+
+
+def fixture_shapes(spec: DatasetSpec, rng: random.Random) -> list[tuple[int, int]]:
+    shelves = [shape for shape, _ in _SHELVES if shape[0] <= spec.max_rows and shape[1] <= spec.max_cols]
+    weights = [w for shape, w in _SHELVES if shape in shelves]
+    shapes = [(spec.max_rows, spec.max_cols)]
+    for _ in range(spec.fixtures - 1):
+        if rng.random() < _WALL_SHARE or not shelves:
+            shapes.append(
+                (rng.randint(min(10, spec.max_rows), spec.max_rows), rng.randint(min(10, spec.max_cols), spec.max_cols))
+            )
+        else:
+            shapes.append(rng.choices(shelves, weights)[0])
+    return shapes
+
+
+def _fill(rng: random.Random, density: float) -> float:
+    """A fixture's share of filled cells: beta-distributed around `density`"""
+    if density >= 1:
+        return 1.0
+    if density <= 0:
+        return 0.0
+    return rng.betavariate(8 * density, 8 * (1 - density))
+
+
+def _chunked(rows, size: int = _INSERT_CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_dataset(engine: Engine, spec: DatasetSpec) -> DatasetInfo:
+    """Create the schema and fill an empty database with `spec`"""
+    start = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    rng = random.Random(spec.seed + 1)
+
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count()).select_from(Game)):
+            raise ValueError("build_dataset needs an empty database")
+        user_id = conn.scalar(insert(User).values(username=DEFAULT_USERNAME).returning(User.id))
+        collection_id = conn.scalar(
+            insert(Collection).values(user_id=user_id, name=LOCAL_COLLECTION).returning(Collection.id)
+        )
+        for chunk in _chunked(game_rows(spec)):
+            conn.execute(insert(Game), chunk)
+        game_ids = list(conn.scalars(select(Game.id).order_by(Game.bgg_id)))
+        for chunk in _chunked({"collection_id": collection_id, "game_id": g} for g in game_ids):
+            conn.execute(insert(CollectionGame), chunk)
+
+        # Shelved in random order, like a real collection
+        unplaced = game_ids[:]
+        rng.shuffle(unplaced)
+        placements = []
+        fixture_ids = []
+        for n, (rows, cols) in enumerate(fixture_shapes(spec, rng), 1):
+            fixture_id = conn.scalar(
+                insert(Fixture)
+                .values(user_id=user_id, name=f"Shelf {n} ({rows}x{cols})", rows=rows, cols=cols)
+                .returning(Fixture.id)
+            )
+            fixture_ids.append(fixture_id)
+            cells = rows * cols
+            filled = min(len(unplaced), round(cells * _fill(rng, spec.density)))
+            for cell in rng.sample(range(cells), filled):
+                placements.append(
+                    {"user_id": user_id, "fixture_id": fixture_id, "row": cell // cols, "col": cell % cols, "game_id": unplaced.pop()}
+                )
+        for chunk in _chunked(placements):
+            conn.execute(insert(Placement), chunk)
+
+    return DatasetInfo(
+        path=None,
+        spec=spec,
+        user_id=user_id,
+        fixture_id=fixture_ids[0],
+        games=len(game_ids),
+        fixtures=len(fixture_ids),
+        placements=len(placements),
+        build_seconds=time.perf_counter() - start,
+    )
+
+
+def default_data_dir() -> Path:
+    return Path(os.getenv("BENCH_DATA_DIR") or Path(tempfile.gettempdir()) / "shelf-bench")
+
+
+def dataset_file(spec: DatasetSpec, data_dir: Path | None = None, *, rebuild: bool = False) -> DatasetInfo:
+    """
+    The SQLite file for `spec`, built on first use and reused afterwards
+
+    Treat it as read-only; benchmarks that write work on a copy
+    """
+    data_dir = data_dir or default_data_dir()
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / f"dataset-{spec.key()}.db"
+    meta = path.with_suffix(".json")
+    if rebuild:
+        path.unlink(missing_ok=True)
+    if path.exists() and meta.exists():
+        saved = json.loads(meta.read_text())
+        return DatasetInfo(path=path, spec=spec, **{k: v for k, v in saved.items() if k != "spec"})
+
+    partial = path.with_suffix(".partial")
+    for leftover in (partial, Path(f"{partial}-wal"), Path(f"{partial}-shm")):
+        leftover.unlink(missing_ok=True)
+    engine = make_engine(f"sqlite:///{partial}")
+    try:
+        info = build_dataset(engine, spec)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        engine.dispose()
+    partial.replace(path)
+    info.path = path
+    saved = {k: v for k, v in dataclasses.asdict(info).items() if k != "path"}
+    meta.write_text(json.dumps(saved, indent=2))
+    return info
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--games", type=int, help="overrides the preset")
+    parser.add_argument("--fixtures", type=int, help="overrides the preset")
+    parser.add_argument("--max-rows", type=int, help="overrides the preset")
+    parser.add_argument("--max-cols", type=int, help="overrides the preset")
+    parser.add_argument("--density", type=float, help="overrides the preset")
+    parser.add_argument("--seed", type=int, help="overrides the preset")
+    parser.add_argument("--data-dir", type=Path, help="dataset cache (default: $BENCH_DATA_DIR or <tmp>/shelf-bench)")
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    overrides = {
+        field: value
+        for field in ("games", "fixtures", "max_rows", "max_cols", "density", "seed")
+        if (value := getattr(args, field)) is not None
+    }
+    return dataclasses.replace(PRESETS[args.preset], **overrides)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_spec_arguments(parser)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild even if cached")
+    args = parser.parse_args()
+
+    info = dataset_file(spec_from_args(args), args.data_dir, rebuild=args.rebuild)
+    print(f"{info.path}")
+    print(
+        f"{info.games} games, {info.fixtures} fixtures, {info.placements} placements "
+        f"(built in {info.build_seconds:.1f} s, {info.path.stat().st_size / 2**20:.0f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
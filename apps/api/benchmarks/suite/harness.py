@@ -0,0 +1,148 @@
+"""
+Timing, result files and baseline comparison for the benchmark suite
+
+A small stand-in for pytest-benchmark, which the API does not depend on:
+each scenario is called for a few warmup rounds, then timed for `rounds`,
+and summarized as min / median / mean / p95 / max / stddev in seconds.
+Results files are JSON:
+
+    {"version": 1, "created": "...", "machine": {...}, "dataset": {...},
+     "results": {"grid: 50x50 cold": {"median": 0.0123, ...}, ...}}
+
+A comparison flags a scenario whose median grew by more than the threshold
+(default 10%) over the baseline's; medians are used because a stray GC or
+fsync moves the mean and max of a short run
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import sqlalchemy
+
+RESULTS_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Stats:
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    max: float
+    stddev: float
+
+    @classmethod
+    def of(cls, samples: list[float]) -> Stats:
+        ordered = sorted(samples)
+        return cls(
+            rounds=len(ordered),
+            min=ordered[0],
+            median=statistics.median(ordered),
+            mean=statistics.fmean(ordered),
+            p95=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            max=ordered[-1],
+            stddev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        )
+
+
+def measure(fn: Callable[[], object], *, rounds: int, warmup: int = 1, setup: Callable[[], object] | None = None) -> Stats:
+    """Time `fn` (seconds); `setup`, if given, runs untimed before every call"""
+    samples = []
+    for i in range(warmup + rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return Stats.of(samples)
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+        "argv": sys.argv[1:],
+    }
+
+
+def results_document(dataset: dict, results: dict[str, Stats]) -> dict:
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "dataset": dataset,
+        "results": {name: asdict(stats) for name, stats in results.items()},
+    }
+
+
+def save_results(path: Path, document: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> dict:
+    document = json.loads(path.read_text())
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {document.get('version')!r}")
+    return document
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float | None  # median seconds; None when the scenario is new
+    current: float | None  # None when the scenario is gone
+
+    @property
+    def change(self) -> float | None:
+        """Relative change of the median, e.g. 0.25 for 25% slower"""
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+
+def compare(baseline: dict, current: dict) -> list[Comparison]:
+    names = list(current["results"]) + [n for n in baseline["results"] if n not in current["results"]]
+    return [
+        Comparison(
+            name,
+            baseline["results"].get(name, {}).get("median"),
+            current["results"].get(name, {}).get("median"),
+        )
+        for name in names
+    ]
+
+
+def regressions(comparisons: list[Comparison], threshold: float) -> list[Comparison]:
+    return [c for c in comparisons if c.change is not None and c.change > threshold]
+
+
+def format_comparison(comparisons: list[Comparison], threshold: float) -> str:
+    lines = [f"{'scenario':<32}{'baseline ms':>13}{'current ms':>12}{'change':>9}"]
+    for c in comparisons:
+        base = f"{c.baseline * 1000:.3f}" if c.baseline is not None else "-"
+        cur = f"{c.current * 1000:.3f}" if c.current is not None else "-"
+        if c.change is None:
+            change, flag = "", "new" if c.baseline is None else "gone"
+        else:
+            change = f"{c.change:+.1%}"
+            flag = "REGRESSION" if c.change > threshold else ("faster" if c.change < -threshold else "")
+        lines.append(f"{c.name:<32}{base:>13}{cur:>12}{change:>9}  {flag}".rstrip())
+    return "\n".join(lines)
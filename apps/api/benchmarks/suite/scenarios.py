@@ -0,0 +1,232 @@
+"""
+Benchmark scenarios, run against a scratch copy of a generated dataset
+
+Requests go through the real app (routing, dependencies, serialization)
+on a TestClient, so numbers include a little client overhead but match
+what the routes do. Groups:
+- search: name searches and the first listing page (limit=50)
+- grid: the largest fixture's grid, uncached, cached and as a 304
+- placements: PUT a game into a cell, swap two cells, clear a cell
+- sync: a full BGG re-sync of `sync_items` games, 10% renamed per round
+  (BGG itself is replaced by the generated items)
+- startup: a new Python process importing the app, running its startup
+  hook on the dataset and answering one request
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+from anyio.from_thread import start_blocking_portal
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.bgg.client import BggCollectionItem
+from app.db import get_db, get_sessionmaker, make_engine
+from app.main import app
+from app.models import Fixture, Game
+from app.services.fixture_grid import fixture_shapes, grid_cache
+from app.services.read_model import reset_read_model
+from app.services.sync_jobs import get_job_manager
+from app.services.users import user_ids
+from benchmarks.suite.dataset import DatasetInfo
+from benchmarks.suite.harness import Stats, measure
+
+SEARCHES = {
+    "search: word": "dragon",
+    "search: two words": "castle quest",
+    "search: prefix": "wond*",
+    "search: no match": "xyzzy",
+}
+
+_STARTUP_SCRIPT = """
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.get("/api/fixtures").status_code == 200
+"""
+
+
+class BenchApp:
+    """The API on a scratch copy of the dataset"""
+
+    def __init__(self, dataset: DatasetInfo, scratch: Path) -> None:
+        self.dataset = dataset
+        self.path = scratch / "bench.db"
+        shutil.copyfile(dataset.path, self.path)
+        self.engine = make_engine(f"sqlite:///{self.path}")
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        self.rng = random.Random(dataset.spec.seed)
+        with self.Session() as db:
+            self.rows, self.cols = db.execute(
+                select(Fixture.rows, Fixture.cols).where(Fixture.id == dataset.fixture_id)
+            ).one()
+            self.game_ids = list(db.scalars(select(Game.id)))
+
+    @contextmanager
+    def client(self):
+        def override_get_db():
+            with self.Session() as db:
+                yield db
+
+        for cache in (grid_cache, fixture_shapes, user_ids):
+            cache.clear()
+        reset_read_model()
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_sessionmaker] = lambda: self.Session
+        try:
+            # One event loop for every request, as under uvicorn, but no lifespan:
+            # the startup hook would open the default database
+            with start_blocking_portal() as portal:
+                client = TestClient(app)
+                client.portal = portal
+                yield client
+        finally:
+            app.dependency_overrides.clear()
+            reset_read_model()
+
+    def random_slot(self) -> str:
+        return f"r{self.rng.randrange(self.rows)}c{self.rng.randrange(self.cols)}"
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+def _ok(res, status: int = 200):
+    if res.status_code != status:
+        raise RuntimeError(f"{res.request.method} {res.request.url}: {res.status_code} {res.text[:200]}")
+    return res
+
+
+def search(bench: BenchApp, rounds: int) -> dict[str, Stats]:
+    results = {}
+    with bench.client() as client:
+        results["games: page 1"] = measure(lambda: _ok(client.get("/api/games", params={"limit": 50})), rounds=rounds)
+        for name, q in SEARCHES.items():
+            results[name] = measure(
+                lambda q=q: _ok(client.get("/api/games", params={"q": q, "limit": 50})), rounds=rounds
+            )
+    return results
+
+
+def grid(bench: BenchApp, rounds: int) -> dict[str, Stats]:
+    url = f"/api/fixtures/{bench.dataset.fixture_id}/grid"
+    shape = f"{bench.rows}x{bench.cols}"
+    with bench.client() as client:
+        etag = _ok(client.get(url)).headers["etag"]
+        return {
+            f"grid: {shape} cold": measure(lambda: _ok(client.get(url)), rounds=rounds, setup=grid_cache.clear),
+            f"grid: {shape} cached": measure(lambda: _ok(client.get(url)), rounds=rounds),
+            f"grid: {shape} 304": measure(
+                lambda: _ok(client.get(url, headers={"If-None-Match": etag}), 304), rounds=rounds
+            ),
+        }
+
+
+def placements(bench: BenchApp, rounds: int) -> dict[str, Stats]:
+    fixture_id = bench.dataset.fixture_id
+    with bench.client() as client:
+
+        def put():
+            body = {"game_id": bench.rng.choice(bench.game_ids), "fixture_id": fixture_id, "slot": bench.random_slot()}
+            _ok(client.put("/api/placements", json=body))
+
+        def swap():
+            a, b = bench.random_slot(), bench.random_slot()
+            ops = [{"op": "swap", "a": {"fixture_id": fixture_id, "slot": a}, "b": {"fixture_id": fixture_id, "slot": b}}]
+            _ok(client.post("/api/placements/batch", json={"ops": ops}))
+
+        # Each clear gets a freshly placed game to remove
+        slots: list[str] = []
+
+        def fill_one():
+            put_slot = bench.random_slot()
+            body = {"game_id": bench.rng.choice(bench.game_ids), "fixture_id": fixture_id, "slot": put_slot}
+            _ok(client.put("/api/placements", json=body))
+            slots.append(put_slot)
+
+        return {
+            "placement: put": measure(put, rounds=rounds),
+            "placement: batch swap": measure(swap, rounds=rounds),
+            "placement: clear": measure(
+                lambda: _ok(client.delete(f"/api/placements/{fixture_id}/{slots.pop()}")), rounds=rounds, setup=fill_one
+            ),
+        }
+
+
+def sync(bench: BenchApp, rounds: int, *, items: int) -> dict[str, Stats]:
+    with bench.Session() as db:
+        games = db.execute(
+            select(Game.bgg_id, Game.name, Game.year_published, Game.thumbnail_url, Game.image_url)
+            .order_by(Game.bgg_id)
+            .limit(items)
+        ).all()
+    collection: list[BggCollectionItem] = []
+    round_no = 0
+
+    def next_round():
+        # Renames a different 10% each round, so every sync has work to do
+        nonlocal round_no
+        round_no += 1
+        collection[:] = [
+            BggCollectionItem(bgg_id, f"{name} (rev {round_no})" if (i + round_no) % 10 == 0 else name, year, thumb, image)
+            for i, (bgg_id, name, year, thumb, image) in enumerate(games)
+        ]
+
+    with bench.client() as client, patch(
+        "app.services.sync_jobs.fetch_collection", side_effect=lambda **kw: iter(collection)
+    ), patch("app.services.sync_jobs.fetch_thing_details", return_value={}):
+
+        def run():
+            job = _ok(client.post("/api/sync/bgg", json={"username": "bench", "token": "bench", "full": True}), 202).json()
+            if not get_job_manager().wait(job["job_id"], timeout=600):
+                raise RuntimeError("sync did not finish")
+            status = client.get(f"/api/sync/jobs/{job['job_id']}").json()
+            if status["status"] != "succeeded":
+                raise RuntimeError(f"sync failed: {status}")
+
+        # The first sync records every item; later ones only see the renamed tenth
+        return {f"sync: {len(games)} items, 10% changed": measure(run, rounds=rounds, setup=next_round)}
+
+
+def startup(bench: BenchApp, rounds: int) -> dict[str, Stats]:
+    env = {
+        **os.environ,
+        "API_DATABASE_URL": f"sqlite:///{bench.path}",
+        "API_DATA_DIR": str(bench.path.parent),
+    }
+    cwd = Path(__file__).resolve().parents[2]  # apps/api
+
+    def run():
+        subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], env=env, cwd=cwd, check=True)
+
+    # Includes interpreter start and imports: what a restart or a new replica costs
+    return {"startup: cold": measure(run, rounds=rounds)}
+
+
+GROUPS = ("search", "grid", "placements", "sync", "startup")
+
+
+def run_groups(bench: BenchApp, groups, *, rounds: int, slow_rounds: int, sync_items: int) -> dict[str, Stats]:
+    runners = {
+        "search": lambda: search(bench, rounds),
+        "grid": lambda: grid(bench, rounds),
+        "placements": lambda: placements(bench, rounds),
+        "sync": lambda: sync(bench, slow_rounds, items=sync_items),
+        "startup": lambda: startup(bench, slow_rounds),
+    }
+    results: dict[str, Stats] = {}
+    for group in groups:
+        start = time.perf_counter()
+        results.update(runners[group]())
+        print(f"  {group} done in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return results
@@ -0,0 +1,106 @@
+#apps/api/tests/bgg_stub.py
+"""
+Local stand-in for the BGG XML API2
+
+A real HTTP server on 127.0.0.1 (random port) that replays scripted responses:
+- `script(path, [(status, body), ...])` queues responses for a path; the last
+  one repeats once the queue is exhausted (so "202, 202, 200" then keeps 200)
+- every request is recorded (path, query, headers, arrival time)
+
+Recorded XML lives in tests/data/
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def recorded(name: str) -> bytes:
+    return (DATA_DIR / name).read_bytes()
+
+
+@dataclass
+class StubRequest:
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    at: float
+
+
+@dataclass
+class StubResponse:
+    status: int
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class BggStubServer:
+    def __init__(self) -> None:
+        self.requests: list[StubRequest] = []
+        self._scripts: dict[str, list[StubResponse]] = {}
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+                parts = urlsplit(self.path)
+                with stub._lock:
+                    stub.requests.append(
+                        StubRequest(
+                            path=parts.path,
+                            query=parse_qs(parts.query),
+                            headers=dict(self.headers),
+                            at=time.monotonic(),
+                        )
+                    )
+                    queue = stub._scripts.get(parts.path)
+                    if not queue:
+                        resp = StubResponse(404, b"<errors><error><message>not scripted</message></error></errors>")
+                    else:
+                        resp = queue.pop(0) if len(queue) > 1 else queue[0]
+
+                self.send_response(resp.status)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(resp.body)))
+                for k, v in resp.headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(resp.body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def script(self, path: str, responses: list[tuple[int, bytes] | StubResponse]) -> None:
+        with self._lock:
+            self._scripts[path] = [
+                r if isinstance(r, StubResponse) else StubResponse(*r) for r in responses
+            ]
+
+    def requests_for(self, path: str) -> list[StubRequest]:
+        return [r for r in self.requests if r.path == path]
+
+    def start(self) -> "BggStubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
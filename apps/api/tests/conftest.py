@@ -1,30 +1,74 @@
-#apps/api/tests/conftest.py
+import io
+import os
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from PIL import Image
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db import get_db
-from app.models import Base, Game, Fixture, Placement
+from app.db import get_db, get_sessionmaker, make_engine, normalize_url
+from app.models import Base, Collection, CollectionGame, Game, Fixture, Placement, User
+from app.services.fixture_grid import fixture_shapes, grid_cache
+from app.services.grid_sprite import grid_sprites
+from app.services.image_cache import ImageCache, get_image_cache
+from app.services.metrics import metrics, profiler
+from app.services.read_model import reset_read_model
+from app.services.users import user_ids
+from tests.bgg_stub import BggStubServer
+
+# Every test using `client` / `db` runs once per backend. PostgreSQL uses
+# API_TEST_POSTGRES_URL if set, else a throwaway embedded server (pgserver),
+# else its tests are skipped
+BACKENDS = [b.strip() for b in os.getenv("API_TEST_BACKENDS", "sqlite,postgresql").split(",") if b.strip()]
+
+
+def _postgres_url(tmp_path_factory, request) -> str:
+    url = os.getenv("API_TEST_POSTGRES_URL")
+    if url:
+        return url
+    pgserver = pytest.importorskip("pgserver", reason="set API_TEST_POSTGRES_URL or install pgserver")
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("postgres")), cleanup_mode="stop")
+    request.addfinalizer(server.cleanup)
+    return server.get_uri()
+
 
-engine = create_engine(
-    "sqlite://",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+@pytest.fixture(scope="session", params=BACKENDS)
+def engine(request, tmp_path_factory):
+    if request.param == "sqlite":
+        eng = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        eng = make_engine(normalize_url(_postgres_url(tmp_path_factory, request)))
+    yield eng
+    eng.dispose()
 
-TestingSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-)
+
+@pytest.fixture(scope="session")
+def TestingSessionLocal(engine):
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+    )
 
 
 def seed_test_data(db):
+    #User (the default one, which requests without X-User act as)
+    user = User(username="default")
+    db.add(user)
+    db.flush()
+    collection = Collection(user_id=user.id, name="local")
+    db.add(collection)
+
     #Fixture
-    fixture = Fixture(name="Office Cubes (2x5)", rows=2, cols=5)
+    fixture = Fixture(user_id=user.id, name="Office Cubes (2x5)", rows=2, cols=5)
     db.add(fixture)
     db.flush()
 
@@ -39,19 +83,28 @@ def seed_test_data(db):
     ]
     db.add_all(games)
     db.flush()
+    db.add_all(CollectionGame(collection_id=collection.id, game_id=game.id) for game in games)
 
     #Placements
     for i, game in enumerate(games[:5]):
-        db.add(Placement(fixture_id=fixture.id, slot=f"r0c{i}", game_id=game.id))
+        db.add(Placement(user_id=user.id, fixture_id=fixture.id, row=0, col=i, game_id=game.id))
 
-    db.add(Placement(fixture_id=fixture.id, slot="r1c0", game_id=games[5].id))
+    db.add(Placement(user_id=user.id, fixture_id=fixture.id, row=1, col=0, game_id=games[5].id))
     db.commit()
 
 
 @pytest.fixture()
-def client():
+def client(engine, TestingSessionLocal):
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Every test starts from fresh fixture ids, so start from a cold grid cache
+    grid_cache.clear()
+    fixture_shapes.clear()
+    grid_sprites.clear()
+    user_ids.clear()
+    reset_read_model()
+    metrics.clear()
+    profiler.clear()
 
     db = TestingSessionLocal()
     try:
@@ -67,8 +120,77 @@ def client():
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_sessionmaker] = lambda: TestingSessionLocal
 
     with TestClient(app) as c:
         yield c
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def db(client, TestingSessionLocal):
+    """A session on the same seeded test database the `client` fixture uses."""
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@pytest.fixture()
+def query_budget(engine):
+    """
+    `with query_budget(n): ...` fails if the block runs more than n SQL statements
+
+    Counts every statement on the test engine, from any thread, so background
+    work the block waits for (sync jobs) is included. The block's statements
+    are yielded for inspection
+    """
+
+    @contextmanager
+    def budget(limit: int):
+        seen: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            seen.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        if len(seen) > limit:
+            listing = "\n".join(f"  {i}. {' '.join(sql.split())[:200]}" for i, sql in enumerate(seen, 1))
+            raise QueryBudgetExceeded(f"{len(seen)} statements, budget {limit}:\n{listing}")
+
+    return budget
+
+
+@pytest.fixture()
+def bgg_stub():
+    """A local stand-in BGG server; see tests/bgg_stub.py."""
+    server = BggStubServer().start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def jpeg_bytes(width: int, height: int, color=(200, 40, 40)) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, "JPEG")
+    return out.getvalue()
+
+
+@pytest.fixture()
+def images(client, tmp_path):
+    """A fresh image cache under tmp_path, used by the app for this test"""
+    cache = ImageCache(tmp_path / "images")
+    app.dependency_overrides[get_image_cache] = lambda: cache
+    yield cache
+    cache.close()
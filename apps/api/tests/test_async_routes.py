@@ -0,0 +1,189 @@
+#apps/api/tests/test_async_routes.py
+"""
+The async route variants (API_ASYNC_DB=1) against the same seeded data
+
+Runs on a file database: the async and sync engines must see the same data,
+and an in-memory SQLite database is private to its connection
+"""
+
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db import get_async_db, get_async_sessionmaker, get_sessionmaker
+from app.models import Base, Game
+from app.routes import aio
+from app.routes.metrics import router as metrics_router
+from app.services.fixture_grid import fixture_shapes, grid_cache
+from app.services.grid_sprite import grid_sprites
+from app.services.image_cache import ImageCache, get_image_cache
+from app.services.metrics import MetricsMiddleware, metrics
+from app.services.read_model import current_read_model, reset_read_model
+from app.services.users import user_ids
+from tests.conftest import seed_test_data
+
+
+def _png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGBA", (width, height), (0, 0, 0, 0)).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture()
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    with SyncSession() as db:
+        seed_test_data(db)
+    grid_cache.clear()
+    fixture_shapes.clear()
+    grid_sprites.clear()
+    user_ids.clear()
+    metrics.clear()
+
+    # NullPool: TestClient runs each test on its own event loop
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    AsyncSession_ = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession_() as db:
+            yield db
+
+    app = FastAPI()
+    for router in aio.routers:
+        app.include_router(router)
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: AsyncSession_
+    app.dependency_overrides[get_sessionmaker] = lambda: SyncSession
+
+    with TestClient(app) as c:
+        yield c
+    reset_read_model()
+    sync_engine.dispose()
+
+
+def test_async_games_listing_streams_and_pages(async_client):
+    everything = async_client.get("/api/games")
+    assert everything.status_code == 200
+    names = [g["name"] for g in everything.json()]
+    assert names == sorted(names) and len(names) == 6
+
+    page = async_client.get("/api/games", params={"limit": 4, "fields": "name"})
+    assert [g["name"] for g in page.json()] == names[:4]
+    rest = async_client.get("/api/games", params={"cursor": page.headers["x-next-cursor"]})
+    assert [g["name"] for g in rest.json()] == names[4:]
+
+    assert [g["name"] for g in async_client.get("/api/games", params={"q": "wond"}).json()] == ["7 Wonders"]
+
+
+def test_async_grid_and_placement_writes(async_client):
+    fixture_id = async_client.get("/api/fixtures").json()[0]["id"]
+    grid = async_client.get(f"/api/fixtures/{fixture_id}/grid")
+    assert grid.status_code == 200
+    tag = grid.headers["etag"]
+    assert async_client.get(f"/api/fixtures/{fixture_id}/grid", headers={"If-None-Match": tag}).status_code == 304
+
+    moved = async_client.put(
+        "/api/placements",
+        json={"game_id": 6, "fixture_id": fixture_id, "slot": "r1c1"},
+        headers={"If-Match": tag},
+    )
+    assert moved.status_code == 200, moved.text
+    stale = async_client.delete(f"/api/placements/{fixture_id}/r0c0", headers={"If-Match": tag})
+    assert stale.status_code == 409
+
+    batch = async_client.post(
+        "/api/placements/batch",
+        json={"ops": [{"op": "clear", "fixture_id": fixture_id, "slot": "r1c1"}]},
+    )
+    assert batch.status_code == 200
+    cells = {c["slot"]: c["game"] for c in async_client.get(f"/api/fixtures/{fixture_id}/grid").json()["cells"]}
+    assert cells["r1c1"] is None and cells["r1c0"] is None
+
+    assert async_client.get("/api/fixtures/999/grid").status_code == 404
+    assert async_client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 1}).json()["version"] == 0
+
+
+def test_async_game_image(async_client, tmp_path, bgg_stub):
+    bgg_stub.script("/thumb.png", [(200, _png(300, 200))])
+    engine = create_engine(f"sqlite:///{tmp_path / 'async.db'}")
+    with engine.begin() as conn:
+        conn.execute(update(Game).where(Game.id == 1).values(thumbnail_url=f"{bgg_stub.base_url}/thumb.png"))
+    engine.dispose()
+    images = ImageCache(tmp_path / "images")
+    async_client.app.dependency_overrides[get_image_cache] = lambda: images
+
+    res = async_client.get("/api/games/1/image")
+    assert res.status_code == 200 and res.headers["content-type"] == "image/png"
+    assert async_client.get("/api/games/1/image", headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+    assert async_client.get("/api/games/2/image").status_code == 404
+
+    # Game 1 sits in r0c0; its thumbnail is the sprite's only tile
+    offsets = async_client.get("/api/fixtures/1/grid/sprite.json").json()
+    assert offsets["slots"] == {"r0c0": [0, 0, 96, 64]}
+    assert async_client.get("/api/fixtures/1/grid/sprite").headers["content-type"] == "image/jpeg"
+    images.close()
+
+
+def test_async_queries_are_counted(async_client):
+    async_client.get("/api/fixtures")  # resolves the user
+    metrics.clear()
+    async_client.get("/api/fixtures")
+    text = async_client.get("/api/metrics").text
+    assert 'api_db_statements_total{method="GET",route="/api/fixtures"} 1' in text
+
+
+def test_async_reads_do_not_create_users(async_client):
+    stranger = {"X-User": "stranger"}
+    assert async_client.get("/api/games", headers=stranger).json() == []
+    assert async_client.get("/api/fixtures", headers=stranger).json() == []
+    assert user_ids.cached("stranger") is None
+
+    created = async_client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 1}, headers=stranger)
+    assert created.status_code == 200
+    assert [f["id"] for f in async_client.get("/api/fixtures", headers=stranger).json()] == [created.json()["id"]]
+
+
+def _async_reads(client) -> list:
+    out = [client.get("/api/games").content, client.get("/api/games", params={"limit": 4}).content]
+    for fixture in client.get("/api/fixtures").json():
+        res = client.get(f"/api/fixtures/{fixture['id']}/grid")
+        out.append((res.headers["etag"], res.content))
+    return out
+
+
+def test_async_reads_use_the_read_model(async_client, monkeypatch):
+    expected = _async_reads(async_client)
+    monkeypatch.setenv("API_READ_MODEL", "1")
+    assert _async_reads(async_client) == expected
+    model = current_read_model()
+    assert model is not None and model.stats.catalog_loads == 1
+
+    assert async_client.delete("/api/placements/1/r1c0").status_code == 200
+    assert async_client.put("/api/placements", json={"game_id": 6, "fixture_id": 1, "slot": "r1c4"}).status_code == 200
+    assert model.stats.applied == 2
+    with_model = _async_reads(async_client)
+    monkeypatch.delenv("API_READ_MODEL")
+    assert _async_reads(async_client) == with_model
+
+
+def test_async_routes_have_the_same_openapi_schema():
+    from app.routes import fixtures, games, placements, sync
+
+    sync_app, async_app = FastAPI(), FastAPI()
+    for router in (games.router, fixtures.router, placements.router, sync.router):
+        sync_app.include_router(router)
+    for router in aio.routers:
+        async_app.include_router(router)
+    assert async_app.openapi()["paths"] == sync_app.openapi()["paths"]
@@ -0,0 +1,122 @@
+#apps/api/tests/test_bgg_cache.py
+"""
+BGG response cache tests
+
+- Fresh entries are served without any network request
+- Stale entries are revalidated with If-None-Match; a 304 reuses the body
+- The size cap evicts least recently used entries
+- An entry evicted between lookup and open is a miss, and is fetched again
+"""
+
+import asyncio
+import io
+
+from app.bgg.cache import ResponseCache, normalize_url
+from app.bgg.client import BggClient
+from app.bgg.ratelimit import TokenBucket
+from tests.bgg_stub import StubResponse, recorded
+
+COLLECTION = "/xmlapi2/collection"
+
+
+def _client(bgg_stub, cache: ResponseCache) -> BggClient:
+    return BggClient(
+        token="fake-token",
+        base_url=bgg_stub.base_url,
+        limiter=TokenBucket(rate=1000, capacity=10),
+        initial_backoff=0.01,
+        cache=cache,
+    )
+
+
+def _sync(bgg_stub, cache: ResponseCache):
+    async def run():
+        async with _client(bgg_stub, cache) as client:
+            return [i.bgg_id for i in await client.fetch_collection("Piman34")], client.stats
+
+    return asyncio.run(run())
+
+
+def test_repeat_fetch_is_served_from_cache(bgg_stub, tmp_path):
+    bgg_stub.script(COLLECTION, [(202, b""), (200, recorded("bgg_collection.xml"))])
+    cache = ResponseCache(tmp_path)
+
+    first, _ = _sync(bgg_stub, cache)
+    second, stats = _sync(bgg_stub, cache)
+
+    assert first == second == [68448, 92415, 266192]
+    assert len(bgg_stub.requests) == 2  # 202 + 200, nothing for the repeat
+    assert stats.requests == 0 and stats.bytes_received == 0
+    assert stats.cache_hits == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(bgg_stub, tmp_path):
+    bgg_stub.script(
+        COLLECTION,
+        [
+            StubResponse(200, recorded("bgg_collection.xml"), {"ETag": '"v1"'}),
+            StubResponse(304),
+        ],
+    )
+    cache = ResponseCache(tmp_path, ttls={COLLECTION: 0})
+
+    _sync(bgg_stub, cache)
+    ids, stats = _sync(bgg_stub, cache)
+
+    assert ids == [68448, 92415, 266192]
+    assert bgg_stub.requests[1].headers["If-None-Match"] == '"v1"'
+    assert stats.cache_revalidated == 1
+    assert cache.stats.revalidated == 1
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, compression="none", max_bytes=250)
+    url = "https://boardgamegeek.com/xmlapi2/thing"
+
+    cache.store(url, {"id": 1}, io.BytesIO(b"a" * 100))
+    cache.store(url, {"id": 2}, io.BytesIO(b"b" * 100))
+    cache.open(cache.lookup(url, {"id": 1})).close()  # touch 1, so 2 is now LRU
+    cache.store(url, {"id": 3}, io.BytesIO(b"c" * 100))
+
+    assert cache.lookup(url, {"id": 2}) is None
+    assert cache.lookup(url, {"id": 1}) is not None
+    assert cache.total_bytes() == 200
+    assert cache.stats.evictions == 1
+
+
+def test_entry_evicted_after_lookup_is_fetched_again(bgg_stub, tmp_path):
+    bgg_stub.script(COLLECTION, [(200, recorded("bgg_collection.xml"))])
+    cache = ResponseCache(tmp_path)
+    _sync(bgg_stub, cache)
+
+    lookup = cache.lookup
+
+    def lookup_then_evict(url, params=None):
+        entry = lookup(url, params)
+        (tmp_path / entry.path).unlink()  # another sync's store evicts it right here
+        return entry
+
+    cache.lookup = lookup_then_evict
+    ids, stats = _sync(bgg_stub, cache)
+
+    assert ids == [68448, 92415, 266192]
+    assert stats.cache_hits == 0 and stats.requests == 1
+    assert cache.stats.hits == 0 and cache.stats.misses == 2
+
+
+def test_compressed_bodies_round_trip(tmp_path):
+    cache = ResponseCache(tmp_path, compression="gzip")
+    body = recorded("bgg_collection.xml")
+
+    entry = cache.store("https://boardgamegeek.com/xmlapi2/collection", {"username": "x"}, io.BytesIO(body))
+
+    with cache.open(entry) as f:
+        assert f.read() == body
+    assert cache.total_bytes() < len(body)
+
+
+def test_normalized_url_ignores_param_order_and_host_case():
+    assert normalize_url("https://BoardGameGeek.com/xmlapi2/collection", {"username": "x", "own": 1}) == (
+        normalize_url("https://boardgamegeek.com/xmlapi2/collection", {"own": "1", "username": "x"})
+    )
@@ -0,0 +1,143 @@
+#apps/api/tests/test_bgg_client.py
+"""
+BGG client tests
+
+Run against the local stand-in server (tests/bgg_stub.py), so the real
+httpx session, 202 polling and rate limiting are exercised end to end
+"""
+
+import asyncio
+import io
+import time
+
+import pytest
+
+from app.bgg.client import (
+    BggApiError,
+    BggClient,
+    BggQueueTimeout,
+    iter_collection_items,
+    iter_thing_items,
+)
+from app.bgg.ratelimit import TokenBucket
+from tests.bgg_stub import DATA_DIR, recorded
+
+COLLECTION = "/xmlapi2/collection"
+
+
+def _client(bgg_stub, **kwargs) -> BggClient:
+    kwargs.setdefault("limiter", TokenBucket(rate=1000, capacity=10))
+    kwargs.setdefault("initial_backoff", 0.01)
+    kwargs.setdefault("cache", None)
+    return BggClient(token="fake-token", base_url=bgg_stub.base_url, **kwargs)
+
+
+async def _fetch(client: BggClient, username: str = "Piman34"):
+    async with client:
+        return list(await client.fetch_collection(username))
+
+
+def test_fetch_collection_polls_through_202(bgg_stub):
+    bgg_stub.script(COLLECTION, [(202, b""), (202, b""), (200, recorded("bgg_collection.xml"))])
+    client = _client(bgg_stub)
+
+    items = asyncio.run(_fetch(client))
+
+    assert [i.bgg_id for i in items] == [68448, 92415, 266192]
+    assert items[2].thumbnail_url is None
+    assert client.stats.requests == 3
+    assert client.stats.queued_seconds == pytest.approx(0.03)  # 0.01 + 0.02
+
+    sent = bgg_stub.requests_for(COLLECTION)
+    assert sent[0].query == {"username": ["Piman34"], "own": ["1"]}
+    assert sent[0].headers["Authorization"] == "Bearer fake-token"
+
+
+def test_fetch_collection_gives_up_when_always_queued(bgg_stub):
+    bgg_stub.script(COLLECTION, [(202, b"")])
+
+    with pytest.raises(BggQueueTimeout):
+        asyncio.run(_fetch(_client(bgg_stub, max_poll_attempts=3)))
+    assert len(bgg_stub.requests_for(COLLECTION)) == 3
+
+
+def test_error_document_raises(bgg_stub):
+    bgg_stub.script(
+        COLLECTION,
+        [(200, b"<errors><error><message>Invalid username specified</message></error></errors>")],
+    )
+
+    with pytest.raises(BggApiError, match="Invalid username"):
+        asyncio.run(_fetch(_client(bgg_stub)))
+
+
+def test_concurrent_syncs_share_the_rate_limit(bgg_stub):
+    bgg_stub.script(COLLECTION, [(200, recorded("bgg_collection.xml"))])
+    limiter = TokenBucket(rate=20, capacity=1)
+
+    async def many():
+        await asyncio.gather(*(_fetch(_client(bgg_stub, limiter=limiter)) for _ in range(5)))
+
+    started = time.monotonic()
+    asyncio.run(many())
+
+    # 1 token up front, then 4 more at 20/s
+    assert time.monotonic() - started >= 0.19
+    # Requests leave 50ms apart; allow for scheduling jitter on arrival
+    arrivals = sorted(r.at for r in bgg_stub.requests)
+    assert arrivals[-1] - arrivals[0] >= 0.18
+    assert all(b - a >= 0.025 for a, b in zip(arrivals, arrivals[1:]))
+
+
+def test_token_bucket_reservations():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    now[0] = 10.0  # refills, but never past capacity
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_iter_collection_items_is_lazy():
+    with open(DATA_DIR / "bgg_collection.xml", "rb") as f:
+        items = iter_collection_items(f)
+        assert next(items).name == "7 Wonders"
+        assert [i.bgg_id for i in items] == [92415, 266192]
+
+
+def test_iter_thing_items_uses_primary_name():
+    items = {i.bgg_id: i for i in iter_thing_items(str(DATA_DIR / "bgg_thing.xml"))}
+
+    assert items[68448].name == "7 Wonders"
+    assert items[68448].year_published == 2010
+    assert items[266192].name == "Wingspan"
+    assert items[266192].image_url.endswith("pic4458123.jpg")
+
+
+def test_truncated_document_raises_bgg_error():
+    body = recorded("bgg_collection.xml")[:900]
+
+    with pytest.raises(BggApiError, match="malformed"):
+        list(iter_collection_items(io.BytesIO(body)))
+
+
+def test_thing_details_batches_and_retries_failed_batch(bgg_stub):
+    bgg_stub.script(
+        "/xmlapi2/thing",
+        [(500, b"")] + [(200, recorded("bgg_thing.xml"))] * 3,
+    )
+    client = _client(bgg_stub, thing_concurrency=1)
+    ids = list(range(1, 46))  # 45 ids -> 20 + 20 + 5
+
+    async def run():
+        async with client:
+            return await client.fetch_thing_details(ids)
+
+    details = asyncio.run(run())
+
+    sent = [r.query["id"][0].split(",") for r in bgg_stub.requests_for("/xmlapi2/thing")]
+    assert [len(batch) for batch in sent] == [20, 20, 20, 5]  # first batch retried once
+    assert client.stats.thing_retries == 1
+    assert client.stats.failed_thing_ids == []
+    assert details[68448].name == "7 Wonders"
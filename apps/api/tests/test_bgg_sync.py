@@ -0,0 +1,137 @@
+#apps/api/tests/test_bgg_sync.py
+"""
+Sync service tests
+
+These exercise `upsert_games_from_bgg` directly (no HTTP):
+- New bgg_ids are inserted, changed ones updated, identical ones skipped
+- Placements survive a sync untouched
+- Chunking does not change the outcome
+- Enrichment only asks for /thing details that are missing or stale
+- Delta tracking only lets added/changed items through and reports removals
+"""
+
+from datetime import datetime, timedelta
+
+from app.bgg.client import BggCollectionItem
+from app.models import Game, GameDetails, Placement
+from app.services.bgg_sync import CollectionDelta, enrich_with_details, upsert_games_from_bgg
+
+
+def _item(bgg_id: int, name: str, year: int | None = None) -> BggCollectionItem:
+    return BggCollectionItem(
+        bgg_id=bgg_id,
+        name=name,
+        year_published=year,
+        thumbnail_url=None,
+        image_url=None,
+    )
+
+
+def test_upsert_counts_inserted_updated_unchanged(db):
+    result = upsert_games_from_bgg(
+        db,
+        [
+            _item(68448, "7 Wonders", 2010),  # identical to seed data
+            _item(40692, "Small World (2nd ed.)", 2009),  # renamed
+            _item(1, "Brand New Game", 2024),  # not in DB yet
+        ],
+    )
+
+    assert (result.inserted, result.updated, result.unchanged) == (1, 1, 1)
+    assert result.processed == 3
+
+    names = {g.bgg_id: g.name for g in db.query(Game).all()}
+    assert names[40692] == "Small World (2nd ed.)"
+    assert names[1] == "Brand New Game"
+
+
+def test_upsert_keeps_placements(db):
+    before = db.query(Placement).count()
+
+    upsert_games_from_bgg(db, [_item(92415, "Skull & Roses", 2011)])
+
+    assert db.query(Placement).count() == before
+
+
+def test_upsert_consumes_iterables_in_chunks(db):
+    items = (_item(1000 + i, f"Game {i}") for i in range(25))
+
+    result = upsert_games_from_bgg(db, items, chunk_size=4)
+    assert result.inserted == 25
+
+    again = upsert_games_from_bgg(db, [_item(1000 + i, f"Game {i}") for i in range(25)], chunk_size=7)
+    assert again.unchanged == 25
+    assert again.inserted == again.updated == 0
+
+
+class _FakeThingFetch:
+    """Stands in for fetch_thing_details; records which ids were requested."""
+
+    def __init__(self):
+        self.requested: list[list[int]] = []
+
+    def __call__(self, ids):
+        self.requested.append(list(ids))
+        return {i: _item(i, f"Canonical {i}", 2000) for i in ids}
+
+
+def test_enrichment_merges_details_and_skips_fresh_cache(db):
+    fetch = _FakeThingFetch()
+    collection = [_item(1, "Local Name"), _item(2, "Other")]
+
+    enriched = list(enrich_with_details(db, collection, fetch=fetch))
+
+    assert fetch.requested == [[1, 2]]
+    assert enriched[0].name == "Canonical 1"
+    assert enriched[0].year_published == 2000
+
+    # Second pass: everything is cached and fresh, so no /thing calls
+    again = list(enrich_with_details(db, collection, fetch=fetch))
+    assert fetch.requested == [[1, 2]]
+    assert again == enriched
+
+
+def test_enrichment_refetches_only_stale_ids(db):
+    fetch = _FakeThingFetch()
+    list(enrich_with_details(db, [_item(1, "A"), _item(2, "B")], fetch=fetch))
+
+    db.query(GameDetails).filter(GameDetails.bgg_id == 2).update(
+        {GameDetails.fetched_at: datetime(2020, 1, 1)}
+    )
+    db.commit()
+
+    list(enrich_with_details(db, [_item(1, "A"), _item(2, "B")], fetch=fetch, max_age=timedelta(days=30)))
+    assert fetch.requested[-1] == [2]
+
+
+def _delta_sync(db, items, *, full=False):
+    delta = CollectionDelta(db, "Piman34", full=full)
+    passed = list(delta.filter(items))
+    upsert_games_from_bgg(db, passed)
+    return delta, passed, delta.commit()
+
+
+def test_delta_first_sync_is_full_then_incremental(db):
+    items = [_item(1, "A"), _item(2, "B"), _item(2, "B")]  # owned twice
+
+    first, passed, report = _delta_sync(db, items)
+    assert first.modified_since is None
+    assert (report.mode, report.added, report.unchanged) == ("full", 2, 0)
+    assert len(passed) == 2
+
+    second, passed, report = _delta_sync(db, [_item(1, "A"), _item(2, "B (2nd ed.)")])
+    assert second.modified_since is not None
+    assert report.mode == "incremental"
+    assert (report.added, report.changed, report.unchanged) == (0, 1, 1)
+    assert [i.bgg_id for i in passed] == [2]
+
+
+def test_full_delta_reports_removed_items(db):
+    _delta_sync(db, [_item(1, "A"), _item(2, "B")])
+
+    _, passed, report = _delta_sync(db, [_item(1, "A")], full=True)
+
+    assert passed == []
+    assert (report.unchanged, report.removed) == (1, 1)
+    # Games are local data: a removal never deletes the row
+    assert db.query(Game).filter(Game.bgg_id == 2).count() == 1
@@ -0,0 +1,79 @@
+#apps/api/tests/test_fixture_events.py
+import asyncio
+import json
+import threading
+import time
+
+from app.services.fixture_events import RESET, FixtureEvents, fixture_events
+
+
+def _data(message: bytes) -> dict:
+    line = next(l for l in message.decode().splitlines() if l.startswith("data: "))
+    return json.loads(line.removeprefix("data: "))
+
+
+def test_publish_fans_out_to_every_subscriber_of_the_fixture():
+    broker = FixtureEvents()
+
+    async def main():
+        subs = [broker.subscribe(1) for _ in range(3)]
+        other = broker.subscribe(2)
+        # Writes commit on threadpool threads
+        await asyncio.to_thread(broker.publish, 1, 5, [("r0c0", 3), ("r0c1", None)])
+
+        for sub in subs:
+            assert _data(await sub.get(timeout=1)) == {
+                "fixture_id": 1,
+                "version": 5,
+                "changes": [{"slot": "r0c0", "game_id": 3}, {"slot": "r0c1", "game_id": None}],
+            }
+        assert await other.get(timeout=0.05) is None
+
+        for sub in [*subs, other]:
+            sub.close()
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(main())
+
+
+def test_slow_subscriber_is_reset_instead_of_buffering():
+    broker = FixtureEvents(max_queue=2)
+
+    async def main():
+        with broker.subscribe(1) as sub:
+            for version in range(1, 5):
+                broker.publish(1, version, [("r0c0", version)])
+            await asyncio.sleep(0)
+
+            assert await sub.get(timeout=1) is RESET
+            assert await sub.get(timeout=0.05) is None
+
+    asyncio.run(main())
+
+
+def test_event_stream_pushes_committed_placement_diffs(client):
+    fixture_id = client.get("/api/fixtures").json()[0]["id"]
+    received = {}
+
+    def listen():
+        received["body"] = client.get(f"/api/fixtures/{fixture_id}/events").text
+
+    listener = threading.Thread(target=listen)
+    listener.start()
+    deadline = time.monotonic() + 5
+    while fixture_events.subscriber_count(fixture_id) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    client.put("/api/placements", json={"game_id": 1, "fixture_id": fixture_id, "slot": "r1c1"})
+    # Ends the stream, after the diff already queued for it
+    (sub,) = fixture_events._subscriptions[fixture_id]
+    sub.loop.call_soon_threadsafe(sub.queue.put_nowait, RESET)
+    listener.join(5)
+
+    events = [e for e in received["body"].split("\n\n") if e]
+    assert [e.splitlines()[0] for e in events] == ["event: hello", "event: placements", "event: reset"]
+    assert _data(events[1].encode()) == {
+        "fixture_id": fixture_id,
+        "version": 1,
+        "changes": [{"slot": "r1c1", "game_id": 1}, {"slot": "r0c0", "game_id": None}],
+    }
@@ -1,4 +1,8 @@
 #apps/api/tests/test_fixtures.py
+from app.schemas import FixtureGridOut
+from app.services import fixture_grid
+
+
 def test_list_fixtures(client):
     response = client.get("/api/fixtures")
     assert response.status_code == 200
@@ -7,4 +11,54 @@ def test_list_fixtures(client):
     assert len(data) == 1
     assert data[0]["name"] == "Office Cubes (2x5)"
     assert data[0]["rows"] == 2
-    assert data[0]["cols"] == 5
\ No newline at end of file
+    assert data[0]["cols"] == 5
+
+
+def test_fixture_grid_matches_schema_and_seed(client):
+    fixture_id = client.get("/api/fixtures").json()[0]["id"]
+    response = client.get(f"/api/fixtures/{fixture_id}/grid")
+    assert response.status_code == 200
+
+    grid = FixtureGridOut.model_validate_json(response.content)
+    assert [c.slot for c in grid.cells][:3] == ["r0c0", "r0c1", "r0c2"]
+    assert len(grid.cells) == 10
+
+    cells = {c.slot: c for c in grid.cells}
+    assert cells["r0c0"].game.name == "7 Wonders"
+    assert cells["r1c0"].game.name == "Kingdomino"
+    assert cells["r1c1"].game is None
+
+
+def test_fixture_grid_is_cached_until_a_placement_changes(client, mocker):
+    render = mocker.spy(fixture_grid, "render_grid")
+    fixture_id = client.get("/api/fixtures").json()[0]["id"]
+
+    first = client.get(f"/api/fixtures/{fixture_id}/grid").content
+    second = client.get(f"/api/fixtures/{fixture_id}/grid").content
+    assert first == second
+    assert render.call_count == 1
+
+    client.delete(f"/api/placements/{fixture_id}/r0c0")
+    cells = {c["slot"]: c for c in client.get(f"/api/fixtures/{fixture_id}/grid").json()["cells"]}
+    assert cells["r0c0"]["game"] is None
+    assert render.call_count == 2
+
+
+def test_missing_fixture_grid_is_404(client):
+    assert client.get("/api/fixtures/999/grid").status_code == 404
+
+
+def test_fixture_grid_etag_revalidates_until_a_placement_changes(client):
+    fixture_id = client.get("/api/fixtures").json()[0]["id"]
+    first = client.get(f"/api/fixtures/{fixture_id}/grid")
+    tag = first.headers["etag"]
+    assert tag == f'"{first.json()["fixture"]["version"]}"'
+
+    unchanged = client.get(f"/api/fixtures/{fixture_id}/grid", headers={"If-None-Match": tag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    client.delete(f"/api/placements/{fixture_id}/r0c0")
+    changed = client.get(f"/api/fixtures/{fixture_id}/grid", headers={"If-None-Match": tag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != tag
@@ -0,0 +1,156 @@
+#apps/api/tests/test_games.py
+from contextlib import contextmanager
+
+from sqlalchemy import event, select
+
+from app.bgg.client import BggCollectionItem
+from app.models import Collection, Game
+from app.services.bgg_sync import upsert_games_from_bgg
+from app.services.game_search import fts_supported
+from app.services.users import add_to_collection
+
+
+def _names(client, q):
+    res = client.get("/api/games", params={"q": q})
+    assert res.status_code == 200
+    return [g["name"] for g in res.json()]
+
+
+@contextmanager
+def _statements(engine):
+    seen = []
+
+    def record(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _add_owned_games(db, items):
+    """Upsert games and put them in the default user's collection"""
+    upsert_games_from_bgg(db, items)
+    local = db.scalars(select(Collection).where(Collection.name == "local")).one()
+    add_to_collection(db, local.id, db.scalars(select(Game.id).where(Game.bgg_id.in_([i.bgg_id for i in items]))))
+    db.commit()
+
+
+def test_list_games_without_query_is_sorted_by_name(client):
+    names = _names(client, "")
+    assert names == sorted(names)
+    assert len(names) == 6
+
+
+def test_search_matches_partial_words_case_insensitively(client):
+    assert _names(client, "WOND") == ["7 Wonders"]
+    assert _names(client, "ogwart") == ["Harry Potter: Hogwarts Battle"]
+
+
+def test_search_ands_words(client):
+    assert _names(client, "potter battle") == ["Harry Potter: Hogwarts Battle"]
+    assert _names(client, "potter skull") == []
+
+
+def test_search_prefix_matches_word_starts_only(client):
+    assert _names(client, "sk*") == ["Skull"]
+    assert _names(client, "world*") == ["Small World"]
+    assert _names(client, "orld*") == []
+
+
+def test_search_orders_name_prefix_matches_first(client, db):
+    _add_owned_games(
+        db,
+        [
+            BggCollectionItem(bgg_id=1, name="Wonderland Tales", year_published=None, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=2, name="Ancient Wonders", year_published=None, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=3, name="Awonderful Game", year_published=None, thumbnail_url=None, image_url=None),
+        ],
+    )
+    assert _names(client, "wonder") == [
+        "Wonderland Tales",
+        "7 Wonders",
+        "Ancient Wonders",
+        "Awonderful Game",
+    ]
+
+
+def test_search_index_follows_renames_and_inserts(client, db, engine):
+    item = BggCollectionItem(bgg_id=68448, name="Seven Marvels", year_published=2010, thumbnail_url=None, image_url=None)
+    upsert_games_from_bgg(db, [item])
+
+    with _statements(engine) as seen:
+        assert _names(client, "wonders") == []
+        assert _names(client, "marvel") == ["Seven Marvels"]
+    searches = [sql for sql in seen if "FROM owned_games" in sql]
+    assert len(searches) == 2
+    if fts_supported(engine):
+        assert all("games_fts MATCH" in sql for sql in searches)
+
+
+def test_search_ranks_by_bm25_within_a_bucket(client, db, engine):
+    _add_owned_games(
+        db,
+        [
+            BggCollectionItem(bgg_id=1, name="A Long Tale of Many Marvels", year_published=None, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=2, name="Ancient Marvels", year_published=None, thumbnail_url=None, image_url=None),
+        ],
+    )
+    names = _names(client, "marvels")
+    if fts_supported(engine):
+        # Both names have a word starting with the term; the shorter one scores better
+        assert names == ["Ancient Marvels", "A Long Tale of Many Marvels"]
+    else:
+        assert names == ["A Long Tale of Many Marvels", "Ancient Marvels"]
+    page = client.get("/api/games", params={"q": "marvels", "limit": 1})
+    rest = client.get("/api/games", params={"q": "marvels", "cursor": page.headers["x-next-cursor"]})
+    assert [g["name"] for g in page.json() + rest.json()] == names
+
+
+def test_list_games_pages_with_keyset_cursor(client):
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/api/games", params=params)
+        assert res.status_code == 200
+        page = res.json()
+        assert len(page) <= 4
+        seen.extend(g["name"] for g in page)
+        cursor = res.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == _names(client, "")
+
+
+def test_search_pages_keep_relevance_buckets(client, db):
+    _add_owned_games(
+        db,
+        [
+            BggCollectionItem(bgg_id=1, name="Wonderland Tales", year_published=None, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=2, name="Ancient Wonders", year_published=None, thumbnail_url=None, image_url=None),
+        ],
+    )
+    first = client.get("/api/games", params={"q": "wonder", "limit": 2})
+    second = client.get("/api/games", params={"q": "wonder", "cursor": first.headers["x-next-cursor"]})
+
+    assert [g["name"] for g in first.json()] == ["Wonderland Tales", "7 Wonders"]
+    assert [g["name"] for g in second.json()] == ["Ancient Wonders"]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_list_games_projects_fields(client):
+    res = client.get("/api/games", params={"fields": "name,slot", "limit": 1})
+
+    assert res.json() == [{"id": 1, "name": "7 Wonders", "slot": "r0c0"}]
+
+
+def test_list_games_rejects_bad_fields_and_cursors(client):
+    assert client.get("/api/games", params={"fields": "name,password"}).status_code == 400
+    assert client.get("/api/games", params={"cursor": "not-a-cursor"}).status_code == 400
+    # A search cursor has one more key part than a plain listing cursor
+    cursor = client.get("/api/games", params={"q": "s", "limit": 1}).headers["x-next-cursor"]
+    assert client.get("/api/games", params={"cursor": cursor}).status_code == 400
@@ -0,0 +1,67 @@
+import threading
+
+from sqlalchemy import update
+
+from app.models import Game
+from app.services.grid_sprite import grid_sprites
+from tests.conftest import jpeg_bytes
+
+
+def _with_thumbnails(db, bgg_stub, game_ids) -> None:
+    for game_id in game_ids:
+        bgg_stub.script(f"/{game_id}.jpg", [(200, jpeg_bytes(150, 100))])
+        db.execute(update(Game).where(Game.id == game_id).values(thumbnail_url=f"{bgg_stub.base_url}/{game_id}.jpg"))
+    db.commit()
+
+
+def test_sprite_packs_placed_thumbnails_with_slot_offsets(client, db, images, bgg_stub):
+    _with_thumbnails(db, bgg_stub, [1, 2, 3])
+    version = int(client.get("/api/fixtures/1/grid").headers["etag"].strip('"'))
+
+    offsets = client.get("/api/fixtures/1/grid/sprite.json")
+    assert offsets.status_code == 200
+    body = offsets.json()
+    assert body["version"] == version and body["tile"] == 96
+    assert body["slots"] == {"r0c0": [0, 0, 96, 64], "r0c1": [96, 0, 96, 64], "r0c2": [0, 96, 96, 64]}
+
+    sprite = client.get("/api/fixtures/1/grid/sprite")
+    assert sprite.headers["content-type"] == "image/jpeg"
+    assert sprite.headers["etag"] == offsets.headers["etag"]
+    assert client.get("/api/fixtures/1/grid/sprite", headers={"If-None-Match": sprite.headers["etag"]}).status_code == 304
+    assert client.get("/api/fixtures/1/grid/sprite", headers={"X-User": "alice"}).status_code == 404
+
+
+def test_sprite_is_rebuilt_in_the_background_after_a_placement_change(client, db, images, bgg_stub):
+    _with_thumbnails(db, bgg_stub, [1, 2])
+    client.get("/api/fixtures/1/grid/sprite")
+
+    version = client.delete("/api/placements/1/r0c0").json()["version"]
+    grid_sprites.wait()
+    assert grid_sprites._cached(1).version == version
+
+    body = client.get("/api/fixtures/1/grid/sprite.json").json()
+    assert body["version"] == version and list(body["slots"]) == ["r0c1"]
+    assert len(bgg_stub.requests_for("/2.jpg")) == 1  # thumbnails come from the image cache
+
+
+def test_sprite_build_shares_one_deadline_across_its_thumbnails(client, db, images, bgg_stub, mocker):
+    _with_thumbnails(db, bgg_stub, [1, 2, 3])
+    mocker.patch("app.services.grid_sprite._BUILD_TIMEOUT", 5.0)
+    get = mocker.spy(images, "get")
+
+    assert client.get("/api/fixtures/1/grid/sprite").status_code == 200
+    timeouts = [call.kwargs["timeout"] for call in get.call_args_list]
+    assert len(timeouts) == 3
+    assert all(0 <= t <= 5.0 for t in timeouts) and timeouts == sorted(timeouts, reverse=True)
+
+
+def test_sprite_that_is_still_building_answers_503(client, db, images, mocker):
+    release = threading.Event()
+    build = mocker.patch("app.services.grid_sprite.build_sprite", side_effect=lambda *a: release.wait() and None)
+    mocker.patch("app.routes.fixtures._SPRITE_WAIT_SECONDS", 0.05)
+
+    res = client.get("/api/fixtures/1/grid/sprite")
+    assert res.status_code == 503 and res.headers["retry-after"] == "5"
+    release.set()
+    grid_sprites.wait()
+    assert build.call_count == 1
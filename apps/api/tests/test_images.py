@@ -0,0 +1,112 @@
+"""
+Game image cache tests
+
+- Each source image is downloaded once; sizes are resized from that copy
+- Responses carry a content ETag and answer If-None-Match with 304
+- The size cap evicts least recently used files, each counted once
+"""
+
+import io
+
+from PIL import Image
+from sqlalchemy import update
+
+from app.models import Game
+from app.services.image_cache import ImageCache
+from tests.conftest import jpeg_bytes
+
+
+def _with_art(db, bgg_stub, game_id: int = 1) -> None:
+    bgg_stub.script("/thumb.jpg", [(200, jpeg_bytes(150, 150))])
+    bgg_stub.script("/full.jpg", [(200, jpeg_bytes(1200, 900))])
+    db.execute(
+        update(Game)
+        .where(Game.id == game_id)
+        .values(thumbnail_url=f"{bgg_stub.base_url}/thumb.jpg", image_url=f"{bgg_stub.base_url}/full.jpg")
+    )
+    db.commit()
+
+
+def test_image_is_downloaded_once_and_resized(client, db, images, bgg_stub):
+    _with_art(db, bgg_stub)
+
+    res = client.get("/api/games/1/image", params={"size": "thumb"})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "image/jpeg"
+    assert "max-age" in res.headers["cache-control"]
+    assert Image.open(io.BytesIO(res.content)).size == (96, 96)
+
+    # Served from disk; small fits the 150px thumbnail as is
+    assert client.get("/api/games/1/image", params={"size": "thumb"}).content == res.content
+    assert Image.open(io.BytesIO(client.get("/api/games/1/image").content)).size == (150, 150)
+    assert len(bgg_stub.requests_for("/thumb.jpg")) == 1
+
+    large = client.get("/api/games/1/image", params={"size": "large"})
+    assert Image.open(io.BytesIO(large.content)).size == (800, 600)
+    assert len(bgg_stub.requests_for("/full.jpg")) == 1
+
+    again = client.get("/api/games/1/image", params={"size": "thumb"}, headers={"If-None-Match": res.headers["etag"]})
+    assert again.status_code == 304 and again.content == b""
+    assert images.stats.downloads == 2 and images.stats.resizes == 2
+
+
+def test_image_errors(client, db, images, bgg_stub):
+    assert client.get("/api/games/999/image").status_code == 404
+    assert client.get("/api/games/1/image").status_code == 404  # seeded games have no art
+    assert client.get("/api/games/1/image", params={"size": "huge"}).status_code == 400
+
+    db.execute(update(Game).where(Game.id == 1).values(thumbnail_url=f"{bgg_stub.base_url}/gone.jpg"))
+    db.commit()
+    assert client.get("/api/games/1/image").status_code == 502
+
+
+def test_slow_image_answers_503(client, db, images, bgg_stub, mocker):
+    _with_art(db, bgg_stub)
+    mocker.patch.object(images, "get", side_effect=TimeoutError)
+    res = client.get("/api/games/1/image")
+    assert res.status_code == 503 and res.headers["retry-after"] == "5"
+
+
+def test_variants_sharing_a_file_count_it_once(tmp_path, bgg_stub):
+    bgg_stub.script("/a.jpg", [(200, jpeg_bytes(50, 50))])
+    bgg_stub.script("/b.jpg", [(200, jpeg_bytes(50, 50, color=(0, 200, 0)))])
+    one = len(jpeg_bytes(50, 50))
+    cache = ImageCache(tmp_path, max_bytes=int(one * 1.5))
+    try:
+        url = f"{bgg_stub.base_url}/a.jpg"
+        # 50px fits every size, so each variant is the original's file
+        for size in ("original", "thumb", "small", "large"):
+            cache.get(url, size)
+        assert cache.total_bytes() == one and cache.stats.evictions == 0
+        reopened = ImageCache(tmp_path)
+        assert reopened.total_bytes() == one  # and so does a reopened index
+        reopened.close()
+
+        # A second file goes over the cap; the first goes with all its variants
+        cache.get(f"{bgg_stub.base_url}/b.jpg", "original")
+        assert cache.total_bytes() == len(jpeg_bytes(50, 50, color=(0, 200, 0)))
+        assert cache.stats.evictions == 4 and cache.lookup(url, "thumb") is None
+        assert len(list(tmp_path.glob("*/*.jpg"))) == 1
+    finally:
+        cache.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path, bgg_stub):
+    for name in ("a", "b", "c"):
+        bgg_stub.script(f"/{name}.jpg", [(200, jpeg_bytes(50, 50, color=(ord(name), 0, 0)))])
+    one = len(jpeg_bytes(50, 50))
+    cache = ImageCache(tmp_path, max_bytes=int(one * 2.5))
+    try:
+        url = lambda name: f"{bgg_stub.base_url}/{name}.jpg"  # noqa: E731
+        cache.get(url("a"), "original")
+        cache.get(url("b"), "original")
+        cache.get(url("a"), "original")  # a is now more recent than b
+        cache.get(url("c"), "original")
+
+        assert cache.lookup(url("b"), "original") is None
+        assert cache.lookup(url("a"), "original") is not None
+        assert cache.total_bytes() <= cache.max_bytes
+        assert cache.stats.evictions == 1
+        assert len(list(tmp_path.glob("*/*.jpg"))) == 2
+    finally:
+        cache.close()
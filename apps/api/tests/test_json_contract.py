@@ -0,0 +1,56 @@
+#apps/api/tests/test_json_contract.py
+"""
+The hot read endpoints encode Core rows directly (services/fast_json.py);
+their bodies must still be exactly what the schemas.py models produce
+"""
+
+import json
+
+from pydantic import TypeAdapter
+
+from app.models import Fixture, Game, Placement
+from app.schemas import FixtureGridOut, FixtureOut, GameOut, GameWithPlacementOut, GridCell
+
+
+def _pydantic_json(adapter: TypeAdapter, value) -> list | dict:
+    return json.loads(adapter.dump_json(value))
+
+
+def test_list_fixtures_matches_fixture_out(client, db):
+    body = client.get("/api/fixtures").json()
+
+    expected = [FixtureOut.model_validate(f) for f in db.query(Fixture).order_by(Fixture.id)]
+    assert body == _pydantic_json(TypeAdapter(list[FixtureOut]), expected)
+
+
+def test_list_games_matches_game_with_placement_out(client, db):
+    body = client.get("/api/games").json()
+
+    expected = [
+        GameWithPlacementOut(
+            **{k: getattr(game, k) for k in ("id", "bgg_id", "name", "year_published", "thumbnail_url", "image_url")},
+            fixture_id=placement.fixture_id if placement else None,
+            slot=placement.slot if placement else None,
+        )
+        for game, placement in db.query(Game, Placement)
+        .outerjoin(Placement, Placement.game_id == Game.id)
+        .order_by(Game.name, Game.id)
+    ]
+    assert body == _pydantic_json(TypeAdapter(list[GameWithPlacementOut]), expected)
+    # Same keys in the same order, not just equal dicts
+    assert [list(g) for g in body] == [list(GameWithPlacementOut.model_fields)] * len(body)
+
+
+def test_fixture_grid_matches_fixture_grid_out(client, db):
+    fixture = db.query(Fixture).first()
+    body = client.get(f"/api/fixtures/{fixture.id}/grid").json()
+
+    placed = {p.slot: p.game for p in fixture.placements}
+    expected = FixtureGridOut(
+        fixture=FixtureOut.model_validate(fixture),
+        cells=[
+            GridCell(slot=slot, game=GameOut.model_validate(placed[slot]) if slot in placed else None)
+            for slot in (f"r{r}c{c}" for r in range(fixture.rows) for c in range(fixture.cols))
+        ],
+    )
+    assert body == json.loads(expected.model_dump_json())
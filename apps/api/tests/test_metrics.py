@@ -0,0 +1,120 @@
+"""
+Request metrics tests
+
+- Each route gets a latency histogram, statement count, DB time and bytes
+- Server-Timing and the slow-request profiler are opt-in
+- The BGG response cache's hits, misses and size are exported once it is open
+"""
+
+import io
+import re
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.bgg.cache import ResponseCache
+from app.routes import fixtures
+from app.services import metrics
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{name}\{{{re.escape(wanted)}\}} (\S+)$", text, re.MULTILINE)
+    assert match, f"{name}{{{wanted}}} not in:\n{text}"
+    return float(match.group(1))
+
+
+def test_metrics_are_kept_per_route_template(client):
+    for fixture_id in (1, 1, 999):
+        client.get(f"/api/fixtures/{fixture_id}/grid")
+    grid = client.get("/api/fixtures/1/grid").content
+    client.get("/api/nowhere")
+
+    res = client.get("/api/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    text = res.text
+
+    route = {"method": "GET", "route": "/api/fixtures/{fixture_id}/grid"}
+    assert _sample(text, "api_request_duration_seconds_count", **route) == 4
+    assert _sample(text, "api_request_duration_seconds_bucket", **route, le="+Inf") == 4
+    assert _sample(text, "api_requests_total", **route, status="200") == 3
+    assert _sample(text, "api_requests_total", **route, status="404") == 1
+    assert _sample(text, "api_db_statements_total", **route) >= 4
+    assert _sample(text, "api_db_seconds_total", **route) > 0
+    assert _sample(text, "api_response_bytes_total", **route) >= 3 * len(grid)
+    assert _sample(text, "api_requests_total", method="GET", route="unmatched", status="404") == 1
+    assert "/api/nowhere" not in text
+
+
+def test_bgg_cache_is_exported_once_open(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.bgg.cache._shared", None)
+    assert "bgg_cache" not in client.get("/api/metrics").text
+
+    cache = ResponseCache(tmp_path, compression="none")
+    monkeypatch.setattr("app.bgg.cache._shared", cache)
+    url = "https://boardgamegeek.com/xmlapi2/thing"
+    cache.lookup(url, {"id": 1})
+    cache.store(url, {"id": 1}, io.BytesIO(b"a" * 100))
+    cache.open(cache.lookup(url, {"id": 1})).close()
+    try:
+        text = client.get("/api/metrics").text
+    finally:
+        cache.close()
+
+    assert re.search(r"^bgg_cache_hits_total 1$", text, re.MULTILINE)
+    assert re.search(r"^bgg_cache_misses_total 1$", text, re.MULTILINE)
+    assert re.search(r"^bgg_cache_bytes 100$", text, re.MULTILINE)
+    assert "# TYPE bgg_cache_bytes gauge" in text
+
+
+def test_server_timing_is_opt_in(client, monkeypatch):
+    assert "server-timing" not in client.get("/api/fixtures").headers
+    monkeypatch.setenv("API_SERVER_TIMING", "1")
+    header = client.get("/api/fixtures").headers["server-timing"]
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="\d+ statements", total;dur=[\d.]+', header)
+
+
+def test_slow_requests_are_profiled(client, monkeypatch):
+    monkeypatch.setenv("API_PROFILE_SLOW_MS", "40")
+    monkeypatch.setenv("API_PROFILE_INTERVAL_MS", "1")
+    client.get("/api/fixtures")
+    assert client.get("/api/metrics/profiles").json() == []
+
+    encode = fixtures.fixtures_json
+
+    def slow_fixtures_json(rows):
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+        return encode(rows)
+
+    monkeypatch.setattr(fixtures, "fixtures_json", slow_fixtures_json)
+    client.get("/api/fixtures")
+
+    [profile] = client.get("/api/metrics/profiles").json()
+    assert profile["route"] == "/api/fixtures" and profile["duration_ms"] >= 100
+    assert profile["samples"] > 0
+    folded = client.get(f"/api/metrics/profiles/{profile['id']}").text
+    assert "slow_fixtures_json (test_metrics.py:" in folded
+    assert all(re.fullmatch(r".+ \d+", line) for line in folded.splitlines())
+    assert client.get("/api/metrics/profiles/999").status_code == 404
+    # Nothing in flight: the sampler sleeps until the next request
+    assert not metrics.profiler._busy.is_set()
+
+
+def test_failed_statements_are_counted_and_forgotten(engine):
+    stats = metrics.RequestStats()
+    token = metrics._current.set(stats)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(DBAPIError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            conn.rollback()
+            assert conn.info.get("api_query_start") == []
+            conn.execute(text("SELECT 1"))
+    finally:
+        metrics._current.reset(token)
+    assert stats.statements >= 2 and stats.db_seconds > 0
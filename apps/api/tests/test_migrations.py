@@ -0,0 +1,122 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.migrations import ensure_cell_bounds, ensure_cells, upgrade_schema
+from app.models import Base, Placement
+
+
+def _old_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # Roll the database back to the shape an older version created
+        conn.execute(text("DROP TABLE placements"))
+        conn.execute(text("DROP TABLE fixtures"))
+        conn.execute(text("CREATE TABLE fixtures (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, rows INTEGER NOT NULL, cols INTEGER NOT NULL)"))
+        conn.execute(
+            text(
+                "CREATE TABLE placements (id INTEGER PRIMARY KEY,"
+                " fixture_id INTEGER NOT NULL REFERENCES fixtures (id) ON DELETE CASCADE,"
+                " slot VARCHAR NOT NULL,"
+                " game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,"
+                " CONSTRAINT uq_fixture_slot UNIQUE (fixture_id, slot),"
+                " CONSTRAINT uq_game_one_location UNIQUE (game_id))"
+            )
+        )
+        conn.execute(text("CREATE INDEX ix_placements_game_id ON placements (game_id)"))
+        conn.execute(text("DROP INDEX ix_games_name_id"))
+        conn.execute(text("DROP TABLE games_fts"))
+        for trigger in ("games_fts_ai", "games_fts_ad", "games_fts_au"):
+            conn.execute(text(f"DROP TRIGGER {trigger}"))
+    return engine
+
+
+def test_upgrade_schema_adds_missing_columns_and_indexes(tmp_path):
+    engine = _old_database(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO fixtures (name, rows, cols) VALUES ('Old', 1, 1)"))
+        conn.execute(text("INSERT INTO games (bgg_id, name) VALUES (1, 'Wingspan')"))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # idempotent
+
+    inspector = inspect(engine)
+    assert "version" in {c["name"] for c in inspector.get_columns("fixtures")}
+    assert "ix_games_name_id" in {i["name"] for i in inspector.get_indexes("games")}
+    assert "ix_placements_game_id" in {i["name"] for i in inspector.get_indexes("placements")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM fixtures")).scalar() == 0
+        hits = conn.execute(text("SELECT rowid FROM games_fts WHERE games_fts MATCH 'ings'")).all()
+        assert len(hits) == 1
+
+
+def test_upgrade_schema_hands_single_user_data_to_the_default_user(tmp_path):
+    engine = _old_database(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO fixtures (id, name, rows, cols) VALUES (1, 'Old', 1, 2)"))
+        conn.execute(text("INSERT INTO games (id, bgg_id, name) VALUES (1, 101, 'Synced'), (2, 102, 'By hand')"))
+        conn.execute(text("INSERT INTO placements (fixture_id, slot, game_id) VALUES (1, 'r0c0', 1)"))
+        conn.execute(text("INSERT INTO sync_cursors (username) VALUES ('piman34')"))
+        conn.execute(text("INSERT INTO sync_item_hashes (username, bgg_id, content_hash) VALUES ('piman34', 101, 'x')"))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        user_id = conn.execute(text("SELECT id FROM users WHERE username = 'default'")).scalar_one()
+        owned = conn.execute(
+            text(
+                "SELECT c.name, cg.game_id FROM collections c JOIN collection_games cg ON cg.collection_id = c.id"
+                " WHERE c.user_id = :u ORDER BY cg.game_id"
+            ),
+            {"u": user_id},
+        ).all()
+        assert owned == [("piman34", 1), ("local", 2)]
+        assert conn.execute(text("SELECT user_id FROM fixtures")).scalar_one() == user_id
+        assert conn.execute(text('SELECT user_id, "row", col, game_id FROM placements')).one() == (user_id, 0, 0, 1)
+        assert conn.execute(text("SELECT username FROM sync_cursors")).scalar_one() == f"{user_id}:piman34"
+        assert conn.execute(text("SELECT username FROM sync_item_hashes")).scalar_one() == f"{user_id}:piman34"
+
+
+def test_slot_strings_become_integer_cells(engine):
+    # Runs on each test backend; the `client` fixture recreates the tables afterwards
+    serial = "INTEGER PRIMARY KEY" if engine.dialect.name == "sqlite" else "SERIAL PRIMARY KEY"
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE placements"))
+        conn.execute(
+            text(
+                f"CREATE TABLE placements (id {serial},"
+                " user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,"
+                " fixture_id INTEGER NOT NULL REFERENCES fixtures (id) ON DELETE CASCADE,"
+                " slot VARCHAR NOT NULL,"
+                " game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,"
+                " CONSTRAINT uq_fixture_slot UNIQUE (fixture_id, slot),"
+                " CONSTRAINT uq_game_one_location UNIQUE (user_id, game_id))"
+            )
+        )
+        conn.execute(text("INSERT INTO users (id, username) VALUES (1, 'default')"))
+        conn.execute(text("INSERT INTO fixtures (id, user_id, name, rows, cols) VALUES (1, 1, 'Wall', 12, 15)"))
+        conn.execute(text("INSERT INTO games (id, bgg_id, name) VALUES (1, 101, 'A'), (2, 102, 'B')"))
+        conn.execute(
+            text("INSERT INTO placements (user_id, fixture_id, slot, game_id) VALUES (1, 1, 'r0c0', 1), (1, 1, 'r11c14', 2)")
+        )
+
+    ensure_cells(engine)
+    ensure_cells(engine)
+    ensure_cell_bounds(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("placements")}
+    assert "slot" not in columns and {"row", "col"} <= columns
+    with engine.begin() as conn:
+        rows = conn.execute(text('SELECT "row", col, game_id FROM placements ORDER BY game_id')).all()
+        assert rows == [(0, 0, 1), (11, 14, 2)]
+    with engine.connect() as conn:
+        for row, col in ((12, 0), (0, 15), (-1, 0)):
+            try:
+                with conn.begin():
+                    conn.execute(Placement.__table__.insert().values(user_id=1, fixture_id=1, row=row, col=col, game_id=1))
+            except Exception as exc:
+                assert "IntegrityError" in type(exc).__name__
+            else:
+                raise AssertionError(f"cell ({row}, {col}) was accepted")
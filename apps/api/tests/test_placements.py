@@ -74,3 +74,134 @@ def test_assign_game_to_cube(client):
     assert cells["r1c1"]["game"] is not None
     assert cells["r1c1"]["game"]["name"] == "Kingdomino"
     assert cells["r1c1"]["game"]["bgg_id"] == 204583
+
+
+def _grid_slots(client, fixture_id: int) -> dict:
+    grid = client.get(f"/api/fixtures/{fixture_id}/grid").json()
+    return {c["slot"]: c["game"]["name"] for c in grid["cells"] if c["game"]}
+
+
+def test_batch_applies_moves_swaps_and_clears_in_order(client):
+    fixture_id = _find_fixture_id(client, name="Office Cubes (2x5)")
+    ops = [
+        # Swap two occupied slots: must not trip the unique constraints
+        {"op": "swap", "a": {"fixture_id": fixture_id, "slot": "r0c0"}, "b": {"fixture_id": fixture_id, "slot": "r0c1"}},
+        # Kingdomino (r1c0) moves onto Skull's slot, evicting Skull
+        {"op": "move", "game_id": 6, "fixture_id": fixture_id, "slot": "r0c4"},
+        {"op": "clear", "fixture_id": fixture_id, "slot": "r0c3"},
+        # Swap with an empty slot is a move
+        {"op": "swap", "a": {"fixture_id": fixture_id, "slot": "r0c2"}, "b": {"fixture_id": fixture_id, "slot": "r1c4"}},
+    ]
+    res = client.post("/api/placements/batch", json={"ops": ops})
+    assert res.status_code == 200, res.text
+
+    body = res.json()
+    placed = {p["slot"]: p["game_id"] for p in body["placements"]}
+    assert placed == {"r0c0": 2, "r0c1": 1, "r0c4": 6, "r1c4": 3}
+    assert {c["slot"] for c in body["cleared"]} == {"r0c2", "r0c3", "r1c0"}
+
+    assert _grid_slots(client, fixture_id) == {
+        "r0c0": "Harry Potter: Hogwarts Battle",
+        "r0c1": "7 Wonders",
+        "r0c4": "Kingdomino",
+        "r1c4": "Encore!",
+    }
+
+
+def test_batch_is_all_or_nothing(client):
+    fixture_id = _find_fixture_id(client, name="Office Cubes (2x5)")
+    before = _grid_slots(client, fixture_id)
+    ops = [
+        {"op": "clear", "fixture_id": fixture_id, "slot": "r0c0"},
+        {"op": "move", "game_id": 1, "fixture_id": fixture_id, "slot": "r2c0"},
+    ]
+
+    res = client.post("/api/placements/batch", json={"ops": ops})
+    assert res.status_code == 400
+    assert "ops[1]" in res.json()["detail"]
+
+    ops[1] = {"op": "move", "game_id": 999, "fixture_id": fixture_id, "slot": "r1c1"}
+    assert client.post("/api/placements/batch", json={"ops": ops}).status_code == 404
+    assert _grid_slots(client, fixture_id) == before
+
+
+def test_placement_writes_bump_version_and_reject_stale_ones(client):
+    fixture_id = _find_fixture_id(client, name="Office Cubes (2x5)")
+    tag = client.get(f"/api/fixtures/{fixture_id}/grid").headers["etag"]
+
+    first = client.put(
+        "/api/placements",
+        json={"game_id": 6, "fixture_id": fixture_id, "slot": "r1c1"},
+        headers={"If-Match": tag},
+    )
+    assert first.status_code == 200, first.text
+    assert first.headers["etag"] != tag
+
+    # A second editor still holding the old version loses
+    stale = client.put(
+        "/api/placements",
+        json={"game_id": 5, "fixture_id": fixture_id, "slot": "r1c2"},
+        headers={"If-Match": tag},
+    )
+    assert stale.status_code == 409
+    assert stale.headers["etag"] == first.headers["etag"]
+    assert client.delete(
+        f"/api/placements/{fixture_id}/r0c0", params={"expected_version": 0}
+    ).status_code == 409
+
+    batch = client.post(
+        "/api/placements/batch",
+        json={
+            "ops": [{"op": "clear", "fixture_id": fixture_id, "slot": "r1c1"}],
+            "expected_versions": {str(fixture_id): 0},
+        },
+    )
+    assert batch.status_code == 409
+    assert _grid_slots(client, fixture_id)["r1c1"] == "Kingdomino"
+
+
+def test_moving_a_game_bumps_both_fixtures(client):
+    other = client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 2}).json()
+    fixture_id = _find_fixture_id(client, name="Office Cubes (2x5)")
+    before = client.get(f"/api/fixtures/{fixture_id}/grid").json()["fixture"]["version"]
+
+    res = client.put("/api/placements", json={"game_id": 1, "fixture_id": other["id"], "slot": "r0c0"})
+    assert res.status_code == 200
+    assert res.headers["etag"] == '"1"'
+    assert client.get(f"/api/fixtures/{fixture_id}/grid").json()["fixture"]["version"] == before + 1
+
+
+def test_cells_are_integers_the_database_keeps_in_bounds(client, db):
+    import pytest
+    from sqlalchemy import select
+    from sqlalchemy.exc import IntegrityError
+
+    from app.models import Placement
+    from app.services.slots import cells_in
+
+    fixture_id = _find_fixture_id(client, name="Office Cubes (2x5)")
+    block = db.execute(
+        select(Placement.row, Placement.col, Placement.slot).where(cells_in(fixture_id, range(0, 2), range(0, 2)))
+    ).all()
+    assert sorted(block) == [(0, 0, "r0c0"), (0, 1, "r0c1"), (1, 0, "r1c0")]
+    assert len(db.execute(select(Placement.id).where(cells_in(fixture_id, range(1, 2)))).all()) == 1
+
+    # An existing, unplaced game, so nothing but the cell can be refused
+    assert client.delete(f"/api/placements/{fixture_id}/r1c0").status_code == 200
+    game_id = next(g["id"] for g in client.get("/api/games").json() if g["slot"] is None)
+    for row, col, reason in (
+        (2, 0, "placement is outside its fixture"),
+        (0, 5, "placement is outside its fixture"),
+        (-1, 0, "ck_placement_cell_nonnegative"),
+    ):
+        db.add(Placement(user_id=1, fixture_id=fixture_id, row=row, col=col, game_id=game_id))
+        with pytest.raises(IntegrityError, match=reason) as exc:
+            db.commit()
+        db.rollback()
+        if db.get_bind().dialect.name == "postgresql":
+            assert exc.value.orig.sqlstate == "23514"  # check_violation
+
+    db.add(Placement(user_id=1, fixture_id=fixture_id, row=1, col=4, game_id=game_id))
+    db.commit()
+
+    assert client.delete(f"/api/placements/{fixture_id}/bogus").status_code == 400
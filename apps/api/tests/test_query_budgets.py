@@ -0,0 +1,145 @@
+"""
+Query budgets: how many SQL statements the main endpoints may run
+
+Each scenario runs against the seed data and again after growing it to
+thousands of games and a full 50x50 fixture; both must fit the same budget,
+so a per-row query (N+1) fails here long before it shows up as latency.
+Budgets are for a warm process (the X-User lookup is cached) and an empty
+grid cache, and are meant to be tight: raise one only with a reason
+"""
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.bgg.client import BggCollectionItem
+from app.models import Collection, CollectionGame, Fixture, Game, Placement
+from app.services.bgg_sync import UPSERT_CHUNK_SIZE
+from app.services.fixture_grid import grid_cache
+from app.services.sync_jobs import get_job_manager
+from tests.conftest import QueryBudgetExceeded
+
+GAMES = 3_000
+ROWS, COLS = 50, 50
+
+# Statements a placement batch runs, however many ops it holds
+BATCH_STATEMENTS = 6
+
+
+def _grow(db) -> int:
+    """Add GAMES games to the default user's collection and a filled 50x50 fixture"""
+    user_id, collection_id = db.execute(select(Collection.user_id, Collection.id)).one()
+    db.execute(
+        insert(Game),
+        [{"bgg_id": 1_000_000 + i, "name": f"Game {i:05}", "year_published": 2000 + i % 25} for i in range(GAMES)],
+    )
+    game_ids = list(db.scalars(select(Game.id).where(Game.bgg_id >= 1_000_000)))
+    db.execute(insert(CollectionGame), [{"collection_id": collection_id, "game_id": g} for g in game_ids])
+    fixture_id = db.scalar(
+        insert(Fixture).values(user_id=user_id, name="Wall", rows=ROWS, cols=COLS).returning(Fixture.id)
+    )
+    db.execute(
+        insert(Placement),
+        [
+            {"user_id": user_id, "fixture_id": fixture_id, "row": i // COLS, "col": i % COLS, "game_id": g}
+            for i, g in enumerate(game_ids[: ROWS * COLS])
+        ],
+    )
+    db.commit()
+    return fixture_id
+
+
+@pytest.fixture(params=["seed", "grown"])
+def fixture_id(request, client, db):
+    """The fixture to exercise: the seeded 2x5 one, or a filled 50x50 next to 3,000 games"""
+    fixture_id = _grow(db) if request.param == "grown" else 1
+    client.get("/api/fixtures")  # resolve the default user once
+    return fixture_id
+
+
+def _free_slot(db, fixture_id: int) -> str:
+    """An empty slot in the fixture, or the last one cleared to make room"""
+    rows, cols = db.execute(select(Fixture.rows, Fixture.cols).where(Fixture.id == fixture_id)).one()
+    taken = set(db.execute(select(Placement.row, Placement.col).where(Placement.fixture_id == fixture_id)).all())
+    for r in range(rows):
+        for c in range(cols):
+            if (r, c) not in taken:
+                return f"r{r}c{c}"
+    db.execute(Placement.__table__.delete().where(Placement.fixture_id == fixture_id, Placement.row == rows - 1, Placement.col == cols - 1))
+    db.commit()
+    return f"r{rows - 1}c{cols - 1}"
+
+
+def _unplaced_game(db) -> int:
+    game_id = db.scalar(select(Game.id).where(Game.id.not_in(select(Placement.game_id))).order_by(Game.id).limit(1))
+    if game_id is None:
+        game_id = db.scalar(insert(Game).values(bgg_id=999_999, name="Unplaced").returning(Game.id))
+        collection_id = db.scalar(select(Collection.id))
+        db.execute(insert(CollectionGame).values(collection_id=collection_id, game_id=game_id))
+        db.commit()
+    return game_id
+
+
+def test_games_listing(client, fixture_id, query_budget):
+    for params in ({}, {"limit": 50}, {"fields": "id,name,slot"}, {"q": "e"}):
+        with query_budget(1):
+            assert client.get("/api/games", params=params).status_code == 200
+
+
+def test_fixture_list_and_grid(client, fixture_id, query_budget):
+    with query_budget(1):
+        assert client.get("/api/fixtures").status_code == 200
+    grid_cache.clear()
+    with query_budget(2):  # the version (ETag), then every cell in one join
+        res = client.get(f"/api/fixtures/{fixture_id}/grid")
+    assert res.status_code == 200
+    with query_budget(1):
+        assert client.get(f"/api/fixtures/{fixture_id}/grid", headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+
+
+def test_placement_writes(client, db, fixture_id, query_budget):
+    slot = _free_slot(db, fixture_id)
+    game_id = _unplaced_game(db)
+    # fixture, ownership, version bump, unplace the game, clear the slot, insert
+    with query_budget(6):
+        res = client.put("/api/placements", json={"game_id": game_id, "fixture_id": fixture_id, "slot": slot})
+    assert res.status_code == 200, res.text
+    # Swaps pair up the fixture's cells (5 on the seed, 999 on the wall); the
+    # statement count must not follow them
+    rows, cols = db.execute(select(Fixture.rows, Fixture.cols).where(Fixture.id == fixture_id)).one()
+    cells = [f"r{i // cols}c{i % cols}" for i in range(rows * cols)]
+    ops = [
+        {"op": "swap", "a": {"fixture_id": fixture_id, "slot": cells[i]}, "b": {"fixture_id": fixture_id, "slot": cells[-1 - i]}}
+        for i in range(min(len(cells) // 2, 999))
+    ]
+    ops.append({"op": "clear", "fixture_id": fixture_id, "slot": "r0c1"})
+    # shapes, current occupants, version bump, delete, insert, final state
+    with query_budget(BATCH_STATEMENTS) as seen:
+        res = client.post("/api/placements/batch", json={"ops": ops})
+    assert res.status_code == 200, res.text
+    assert {"fixture_id": fixture_id, "slot": "r0c1"} in res.json()["cleared"]
+    assert len(seen) == BATCH_STATEMENTS
+    with query_budget(3):
+        assert client.delete(f"/api/placements/{fixture_id}/{slot}").status_code == 200
+
+
+@pytest.mark.parametrize("size", [3, UPSERT_CHUNK_SIZE])
+def test_sync(client, mocker, query_budget, size):
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    fetch = mocker.patch("app.services.sync_jobs.fetch_collection")
+    fetch.return_value = [
+        BggCollectionItem(bgg_id=500_000 + i, name=f"Synced {i}", year_published=2020, thumbnail_url=None, image_url=None)
+        for i in range(size)
+    ]
+    # The first sync inserts everything, the second finds nothing new
+    for budget in (12, 5):
+        with query_budget(budget):
+            job = client.post("/api/sync/bgg", json={"username": "Piman34", "token": "fake-token"}).json()
+            assert get_job_manager().wait(job["job_id"], timeout=10)
+        assert client.get(f"/api/sync/jobs/{job['job_id']}").json()["status"] == "succeeded"
+
+
+def test_budget_failures_list_the_statements(client, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match=r"(?s)2 statements, budget 1:.*2\. SELECT"):
+        with query_budget(1):
+            client.get("/api/games")
+            client.get("/api/fixtures")
@@ -0,0 +1,198 @@
+"""
+In-process read model tests (API_READ_MODEL=1, SQLite only)
+
+- Hot reads return exactly what the database path returns, and run no query
+- Placement, fixture and sync writes patch the model in place
+- Commits from another process are noticed through PRAGMA data_version
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.bgg.client import BggCollectionItem
+from app.models import Base
+from app.services.game_listing import parse_fields
+from app.services.read_model import ReadModel, current_read_model
+from app.services.sync_jobs import get_job_manager
+from tests.conftest import seed_test_data
+
+
+@contextmanager
+def _statements(engine):
+    seen = []
+
+    def record(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _reads(client) -> list:
+    out = [
+        client.get("/api/games").content,
+        client.get("/api/games", params={"fields": "name,slot"}).content,
+        client.get("/api/fixtures").content,
+    ]
+    cursor = None
+    while True:
+        res = client.get("/api/games", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        out.append(res.content)
+        cursor = res.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    for fixture in client.get("/api/fixtures").json():
+        res = client.get(f"/api/fixtures/{fixture['id']}/grid")
+        out.append((res.headers["etag"], res.content))
+    return out
+
+
+@pytest.fixture()
+def sqlite_only(engine):
+    if engine.dialect.name != "sqlite":
+        pytest.skip("the read model is SQLite-only")
+
+
+def _compare(client, engine, monkeypatch) -> None:
+    """Model reads equal database reads, and run no query once warm"""
+    monkeypatch.delenv("API_READ_MODEL", raising=False)
+    expected = _reads(client)
+    monkeypatch.setenv("API_READ_MODEL", "1")
+    assert _reads(client) == expected
+    with _statements(engine) as seen:
+        assert _reads(client) == expected
+    assert seen == []
+
+
+def test_reads_match_the_database_through_writes(client, engine, monkeypatch, sqlite_only):
+    _compare(client, engine, monkeypatch)
+    model = current_read_model()
+    assert model.stats.catalog_loads == 1
+
+    client.put("/api/placements", json={"game_id": 6, "fixture_id": 1, "slot": "r1c4"})
+    client.post(
+        "/api/placements/batch",
+        json={
+            "ops": [
+                {"op": "swap", "a": {"fixture_id": 1, "slot": "r0c0"}, "b": {"fixture_id": 1, "slot": "r1c4"}},
+                {"op": "clear", "fixture_id": 1, "slot": "r0c1"},
+            ]
+        },
+    )
+    client.delete("/api/placements/1/r0c2")
+    shelf = client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 3}).json()
+    client.put("/api/placements", json={"game_id": 4, "fixture_id": shelf["id"], "slot": "r0c2"})
+    assert model.stats.applied == 5
+
+    _compare(client, engine, monkeypatch)
+    assert model.stats.catalog_loads == 1
+    assert client.get("/api/games", params={"cursor": "bm9wZQ"}).status_code == 400
+
+
+def test_sync_updates_the_model_in_place(client, engine, monkeypatch, mocker, sqlite_only):
+    monkeypatch.setenv("API_READ_MODEL", "1")
+    client.get("/api/games")
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    mocker.patch(
+        "app.services.sync_jobs.fetch_collection",
+        return_value=[
+            BggCollectionItem(bgg_id=68448, name="7 Wonders (2nd ed.)", year_published=2020, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=230802, name="Azul", year_published=2017, thumbnail_url=None, image_url=None),
+        ],
+    )
+    job = client.post("/api/sync/bgg", json={"username": "Piman34", "token": "fake-token"}).json()
+    assert get_job_manager().wait(job["job_id"], timeout=10)
+
+    names = [g["name"] for g in client.get("/api/games").json()]
+    assert "Azul" in names and "7 Wonders (2nd ed.)" in names
+    assert current_read_model().game_by_bgg_id(230802).name == "Azul"
+    assert current_read_model().stats.catalog_loads == 1
+    _compare(client, engine, monkeypatch)
+
+
+def test_commits_from_another_process_are_noticed(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    ours, theirs = create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=ours)
+    with sessionmaker(bind=ours)() as db:
+        seed_test_data(db)
+    model = ReadModel(sessionmaker(bind=ours))
+    everything = parse_fields(None)
+    try:
+        assert model.fixture_version(1, 1) == 0
+        with _statements(ours) as seen:
+            model.grid_json(1, 1)
+            model.games_page(1, everything, limit=50)
+        assert seen == []
+
+        with theirs.begin() as conn:
+            conn.execute(text('UPDATE placements SET "row" = 1, col = 4 WHERE game_id = 1'))
+            conn.execute(text("UPDATE fixtures SET version = version + 1 WHERE id = 1"))
+            conn.execute(text("INSERT INTO fixtures (user_id, name, rows, cols, version) VALUES (1, 'Shelf', 1, 1, 0)"))
+        assert model.fixture_version(1, 1) == 1
+        assert [f[1] for f in model.fixtures_of(1)] == ["Office Cubes (2x5)", "Shelf"]
+        assert model.games_page(1, ("id", "slot"))[0][:2] == (1, "r1c4")
+        assert model.stats.catalog_loads == 1
+
+        with theirs.begin() as conn:
+            conn.execute(text("INSERT INTO games (bgg_id, name) VALUES (230802, 'Azul')"))
+            conn.execute(text("INSERT INTO collection_games (collection_id, game_id) VALUES (1, 7)"))
+            conn.execute(text("INSERT INTO sync_cursors (username, last_synced_at) VALUES ('1:piman34', '2026-01-01')"))
+        assert [row[1] for row in model.games_page(1, ("id", "name"))][:2] == ["7 Wonders", "Azul"]
+        assert model.game_by_bgg_id(230802).id == 7
+        assert model.stats.catalog_loads == 2
+    finally:
+        model.close()
+        ours.dispose()
+        theirs.dispose()
+
+
+def test_own_writes_reload_at_most_their_fixture(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    ours, theirs = create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=ours)
+    with sessionmaker(bind=ours)() as db:
+        seed_test_data(db)
+        db.execute(text("INSERT INTO fixtures (user_id, name, rows, cols, version) VALUES (1, 'Shelf', 1, 3, 0)"))
+        db.commit()
+    model = ReadModel(sessionmaker(bind=ours))
+    try:
+        model.grid_json(1, 1)
+        loaded = model.stats.fixture_loads
+
+        # A write we patch: the next read checks the database, reloads nothing
+        with ours.begin() as conn:
+            conn.execute(text('UPDATE placements SET "row" = 1, col = 4 WHERE game_id = 1'))
+            conn.execute(text("UPDATE fixtures SET version = version + 1 WHERE id = 1"))
+        model.placements_changed(1, 1, [("r0c0", None), ("r1c4", 1)])
+        with _statements(ours) as seen:
+            assert model.fixture_version(1, 1) == 1
+        assert len(seen) == 2 and model.stats.fixture_loads == loaded
+
+        # A write we missed a version of: only that fixture is reloaded
+        with ours.begin() as conn:
+            conn.execute(text('UPDATE placements SET "row" = 1, col = 3 WHERE game_id = 2'))
+            conn.execute(text("UPDATE fixtures SET version = version + 2 WHERE id = 1"))
+        model.placements_changed(1, 3, [("r1c3", 2)])
+        with _statements(ours) as seen:
+            assert (2, "r1c3") in [row[:2] for row in model.games_page(1, ("id", "slot"))]
+        assert model.stats.fixture_loads == loaded + 1
+        assert sum("FROM placements" in s for s in seen) == 1 and all("IN (" in s for s in seen if "FROM placements" in s)
+
+        # Another writer: every fixture is compared, the moved one reloaded
+        with theirs.begin() as conn:
+            conn.execute(text("DELETE FROM placements WHERE game_id = 3"))
+            conn.execute(text("UPDATE fixtures SET version = version + 1 WHERE id = 1"))
+        assert model.fixture_version(1, 1) == 4
+        assert model.stats.fixture_loads == loaded + 2
+        assert model.stats.catalog_loads == 1
+    finally:
+        model.close()
+        ours.dispose()
+        theirs.dispose()
@@ -4,11 +4,32 @@ BGG sync tests
 
 These tests are intentionally layered:
 1. Configuration validation (501 when missing token)
-2. Client wiring validation (501 when client not implemented)
+2. BGG failures (the job fails and reports the client's error)
 3. Contract test for successful sync (mocked BGG client)
+4. Job behavior: progress reporting and merging duplicate requests
 """
 
-from app.bgg.client import BggCollectionItem
+import threading
+
+from app.bgg.cache import ResponseCache
+from app.bgg.client import BggApiError, BggCollectionItem
+from app.bgg.ratelimit import TokenBucket
+from app.services.fixture_events import fixture_events
+from app.services.sync_jobs import get_job_manager
+from tests.bgg_stub import recorded
+
+
+def _run_sync(client, username: str = "Piman34") -> dict:
+    """Helper: start a sync job and wait for it to finish."""
+    response = client.post(
+        "/api/sync/bgg",
+        json={"username": username, "token": "fake-token"},
+    )
+    assert response.status_code == 202, response.text
+
+    job_id = response.json()["job_id"]
+    assert get_job_manager().wait(job_id, timeout=10)
+    return client.get(f"/api/sync/jobs/{job_id}").json()
 
 
 def test_bgg_sync_returns_501_without_token(client):
@@ -21,30 +42,29 @@ def test_bgg_sync_returns_501_without_token(client):
     assert "not configured" in response.json()["detail"].lower()
 
 
-def test_bgg_sync_returns_501_when_client_not_implemented(client, mocker):
+def test_bgg_sync_job_fails_when_bgg_errors(client, mocker):
     mocker.patch(
-        "app.routes.sync.fetch_collection",
-        side_effect=NotImplementedError,
+        "app.services.sync_jobs.fetch_collection",
+        side_effect=BggApiError("BGG returned HTTP 500 for /xmlapi2/collection"),
     )
 
-    response = client.post(
-        "/api/sync/bgg",
-        json={"username": "Piman34", "token": "fake-token"},
-    )
+    job = _run_sync(client)
 
-    assert response.status_code == 501
-    assert "not wired up yet" in response.json()["detail"].lower()
+    assert job["status"] == "failed"
+    assert job["error"] == "BGG returned HTTP 500 for /xmlapi2/collection"
+    assert job["stage"] == "done"
 
 
 def test_bgg_sync_creates_games_from_collection(client, mocker):
     """
     Contract test:
-    - Given a mocked BGG collection
-    - When sync is called
-    - Then games exist in the local DB
+    - Given a mocked BGG collection (and no extra /thing details)
+    - When a sync job runs
+    - Then games exist in the local DB and the job reports its counts
     """
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
     mocker.patch(
-        "app.routes.sync.fetch_collection",
+        "app.services.sync_jobs.fetch_collection",
         return_value=[
             BggCollectionItem(
                 bgg_id=68448,
@@ -56,12 +76,102 @@ def test_bgg_sync_creates_games_from_collection(client, mocker):
         ],
     )
 
-    response = client.post(
-        "/api/sync/bgg",
-        json={"username": "Piman34", "token": "fake-token"},
-    )
+    job = _run_sync(client)
 
-    assert response.status_code == 200
+    assert job["status"] == "succeeded", job
+    assert job["stage"] == "done"
+    assert job["items_fetched"] == job["items_upserted"] == 1
+    assert job["result"]["unchanged"] == 1
 
     games = client.get("/api/games").json()
     assert any(game["name"] == "7 Wonders" for game in games)
+
+
+def test_duplicate_sync_requests_share_one_job(client, mocker):
+    release = threading.Event()
+
+    def slow_fetch(**kwargs):
+        release.wait(5)
+        return []
+
+    fetch = mocker.patch("app.services.sync_jobs.fetch_collection", side_effect=slow_fetch)
+
+    first = client.post("/api/sync/bgg", json={"username": "Piman34", "token": "t"}).json()
+    second = client.post("/api/sync/bgg", json={"username": "piman34", "token": "t"}).json()
+
+    assert second["job_id"] == first["job_id"]
+    assert (first["merged"], second["merged"]) == (False, True)
+
+    running = client.get(f"/api/sync/jobs/{first['job_id']}").json()
+    assert running["status"] in ("queued", "running")
+
+    release.set()
+    assert get_job_manager().wait(first["job_id"], timeout=10)
+    assert fetch.call_count == 1
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/sync/jobs/nope").status_code == 404
+
+
+def test_second_sync_is_incremental(client, mocker):
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    fetch = mocker.patch(
+        "app.services.sync_jobs.fetch_collection",
+        return_value=[BggCollectionItem(1, "Brand New Game", 2024, None, None)],
+    )
+
+    first = _run_sync(client)
+    second = _run_sync(client)
+
+    assert first["result"]["delta"]["mode"] == "full"
+    assert first["result"]["delta"]["added"] == 1
+    assert second["result"]["delta"]["mode"] == "incremental"
+    assert second["result"]["delta"]["unchanged"] == 1
+    assert second["result"]["processed"] == 0
+    assert fetch.call_args_list[0].kwargs["modified_since"] is None
+    assert fetch.call_args_list[1].kwargs["modified_since"] is not None
+
+
+def test_back_to_back_incremental_syncs_are_served_from_the_response_cache(client, bgg_stub, tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path)
+    monkeypatch.setenv("BGG_BASE_URL", bgg_stub.base_url)
+    monkeypatch.setattr("app.bgg.cache._shared", cache)
+    monkeypatch.setattr("app.bgg.ratelimit._shared", TokenBucket(rate=1000, capacity=10))
+    bgg_stub.script("/xmlapi2/collection", [(200, recorded("bgg_collection.xml"))])
+    bgg_stub.script("/xmlapi2/thing", [(200, recorded("bgg_thing.xml"))])
+    try:
+        assert _run_sync(client)["result"]["delta"]["mode"] == "full"
+        first = _run_sync(client)
+        fetched = len(bgg_stub.requests)
+        second = _run_sync(client)
+    finally:
+        cache.close()
+
+    assert first["result"]["delta"]["mode"] == second["result"]["delta"]["mode"] == "incremental"
+    # Both ask for the same modifiedsince, so the second one never reaches BGG
+    assert first["result"]["delta"]["modified_since"] == second["result"]["delta"]["modified_since"]
+    assert len(bgg_stub.requests) == fetched
+
+
+def test_renames_only_invalidate_fixtures_holding_the_game(client, mocker):
+    other = client.post("/api/fixtures", json={"name": "Empty", "rows": 1, "cols": 2}).json()["id"]
+    etags = {fid: client.get(f"/api/fixtures/{fid}/grid").headers["etag"] for fid in (1, other)}
+    publish = mocker.spy(fixture_events, "publish")
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    mocker.patch(
+        "app.services.sync_jobs.fetch_collection",
+        return_value=[
+            BggCollectionItem(bgg_id=92415, name="Skull & Roses", year_published=2011, thumbnail_url=None, image_url=None),
+            BggCollectionItem(bgg_id=68448, name="7 Wonders", year_published=2010, thumbnail_url=None, image_url=None),
+        ],
+    )
+
+    assert _run_sync(client)["result"]["updated"] == 1
+
+    grid = client.get("/api/fixtures/1/grid")
+    assert grid.headers["etag"] != etags[1]
+    assert "Skull & Roses" in grid.text
+    assert client.get(f"/api/fixtures/{other}/grid").headers["etag"] == etags[other]
+    skull = next(g for g in client.get("/api/games").json() if g["bgg_id"] == 92415)
+    publish.assert_called_once_with(1, mocker.ANY, [("r0c4", skull["id"])])
@@ -0,0 +1,132 @@
+#apps/api/tests/test_users.py
+import pytest
+from sqlalchemy import func, select
+
+from app.bgg.client import BggCollectionItem
+from app.models import User
+from app.services.sync_jobs import get_job_manager
+
+ALICE = {"X-User": "Alice"}
+
+
+def test_users_only_see_their_own_games_and_fixtures(client):
+    assert client.get("/api/games", headers=ALICE).json() == []
+    assert client.get("/api/fixtures", headers=ALICE).json() == []
+    assert client.get("/api/fixtures/1/grid", headers=ALICE).status_code == 404
+    assert client.get("/api/fixtures/1/events", headers=ALICE).status_code == 404
+
+    created = client.post("/api/fixtures", json={"name": "Alice's shelf", "rows": 1, "cols": 2}, headers=ALICE).json()
+    assert [f["id"] for f in client.get("/api/fixtures", headers=ALICE).json()] == [created["id"]]
+    assert [f["id"] for f in client.get("/api/fixtures").json()] == [1]
+
+    # Neither someone else's fixture nor a game Alice does not own
+    res = client.put("/api/placements", json={"fixture_id": 1, "slot": "r0c0", "game_id": 1}, headers=ALICE)
+    assert res.status_code == 404
+    res = client.put("/api/placements", json={"fixture_id": created["id"], "slot": "r0c0", "game_id": 1}, headers=ALICE)
+    assert res.status_code == 404
+    res = client.post(
+        "/api/placements/batch",
+        json={"ops": [{"op": "clear", "fixture_id": 1, "slot": "r0c0"}]},
+        headers=ALICE,
+    )
+    assert res.status_code == 404
+    assert client.delete("/api/placements/1/r0c0", headers=ALICE).status_code == 404
+
+
+def test_sync_fills_the_requesting_users_collection(client, mocker):
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    mocker.patch(
+        "app.services.sync_jobs.fetch_collection",
+        return_value=[
+            BggCollectionItem(68448, "7 Wonders", 2010, None, None),
+            BggCollectionItem(1, "Brand New Game", 2024, None, None),
+        ],
+    )
+
+    res = client.post("/api/sync/bgg", json={"username": "alice_bgg", "token": "t"}, headers=ALICE)
+    assert get_job_manager().wait(res.json()["job_id"], timeout=10)
+
+    # 7 Wonders is shared, not copied; each user places it independently
+    alice_games = client.get("/api/games", headers=ALICE).json()
+    assert [(g["name"], g["slot"]) for g in alice_games] == [("7 Wonders", None), ("Brand New Game", None)]
+    assert alice_games[0]["id"] == 1
+    assert len(client.get("/api/games").json()) == 6
+
+    shelf = client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 1}, headers=ALICE).json()
+    res = client.put("/api/placements", json={"fixture_id": shelf["id"], "slot": "r0c0", "game_id": 1}, headers=ALICE)
+    assert res.status_code == 200
+    assert client.get("/api/games", params={"q": "wonders"}).json()[0]["slot"] == "r0c0"
+    assert client.get("/api/fixtures/1/grid").json()["cells"][0]["game"]["id"] == 1
+
+
+def test_only_creating_requests_create_users(client, db):
+    def users() -> int:
+        return db.scalar(select(func.count()).select_from(User))
+
+    for n in range(3):
+        headers = {"X-User": f"stranger{n}"}
+        assert client.get("/api/games", headers=headers).json() == []
+        assert client.get("/api/fixtures", headers=headers).json() == []
+        assert client.get("/api/fixtures/1/grid", headers=headers).status_code == 404
+        assert client.delete("/api/placements/1/r0c0", headers=headers).status_code == 404
+    assert users() == 1
+
+    client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 1}, headers=ALICE)
+    assert users() == 2
+    assert len(client.get("/api/fixtures", headers=ALICE).json()) == 1
+
+
+def test_users_only_see_their_own_sync_jobs(client, mocker):
+    mocker.patch("app.services.sync_jobs.fetch_thing_details", return_value={})
+    mocker.patch("app.services.sync_jobs.fetch_collection", return_value=[])
+    job_id = client.post("/api/sync/bgg", json={"username": "alice_bgg", "token": "t"}, headers=ALICE).json()["job_id"]
+    assert get_job_manager().wait(job_id, timeout=10)
+
+    assert client.get(f"/api/sync/jobs/{job_id}", headers=ALICE).json()["status"] == "succeeded"
+    client.post("/api/fixtures", json={"name": "Shelf", "rows": 1, "cols": 1}, headers={"X-User": "bob"})
+    for other in ({"X-User": "bob"}, {"X-User": "nobody"}, {}):
+        res = client.get(f"/api/sync/jobs/{job_id}", headers=other)
+        assert res.status_code == 404
+        assert "alice_bgg" not in res.text
+
+
+def test_owned_games_follow_collections_and_renames(client, db):
+    from sqlalchemy import delete, insert, update
+
+    from app.models import Collection, CollectionGame, Game, OwnedGame
+
+    def owned(user_id):
+        return db.execute(select(OwnedGame.game_id, OwnedGame.name).where(OwnedGame.user_id == user_id).order_by(OwnedGame.game_id)).all()
+
+    seeded = [(g.id, g.name) for g in db.scalars(select(Game).order_by(Game.id))]
+    assert owned(1) == seeded
+
+    # A game held by two collections stays owned until both let go
+    second = db.scalar(insert(Collection).values(user_id=1, name="piman34").returning(Collection.id))
+    db.execute(insert(CollectionGame).values(collection_id=second, game_id=1))
+    db.execute(delete(CollectionGame).where(CollectionGame.collection_id == 1, CollectionGame.game_id == 1))
+    db.commit()
+    assert owned(1) == seeded
+    db.execute(delete(CollectionGame).where(CollectionGame.collection_id == second))
+    db.commit()
+    assert owned(1) == seeded[1:]
+
+    db.execute(update(Game).where(Game.id == 2).values(name="Aardvark"))
+    db.commit()
+    assert owned(1)[0] == (2, "Aardvark")
+    assert client.get("/api/games").json()[0]["name"] == "Aardvark"
+
+
+def test_listing_pages_walk_the_owned_games_index(client, db):
+    from app.services.game_listing import listing_query, parse_fields
+
+    if db.get_bind().dialect.name != "sqlite":
+        pytest.skip("reads SQLite's EXPLAIN QUERY PLAN")
+    for after in (None, ["Encore!", 3]):
+        stmt = listing_query(parse_fields(None), user_id=1, limit=50, after=after)
+        compiled = stmt.compile(db.get_bind())
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+        steps = [row[-1] for row in plan]
+        assert "ix_owned_games_user_id_name" in steps[0]
+        assert not any("TEMP B-TREE" in step for step in steps), steps